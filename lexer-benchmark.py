@@ -0,0 +1,58 @@
+# This script measures the throughput of the lexer over the .som files
+# in the given directories, by default the core-lib sources.
+#
+# Run it from the repository root, for instance with:
+#  PYTHONPATH=src python lexer-benchmark.py
+#  PYTHONPATH=src python lexer-benchmark.py --iterations 50 core-lib/Smalltalk
+#
+import argparse
+import os
+import time
+
+from rlib.string_stream import StringStream
+from som.compiler.lexer import Lexer
+from som.compiler.symbol import Symbol
+
+
+def find_sources(directories):
+    sources = []
+    for directory in directories:
+        for root, _, file_names in os.walk(directory):
+            for file_name in sorted(file_names):
+                if file_name.endswith(".som"):
+                    with open(os.path.join(root, file_name)) as som_file:
+                        sources.append(som_file.read())
+    return sources
+
+
+def lex_all(sources):
+    num_tokens = 0
+    for source in sources:
+        lexer = Lexer(StringStream(source))
+        while lexer.get_sym() != Symbol.NONE:
+            num_tokens += 1
+    return num_tokens
+
+
+parser = argparse.ArgumentParser(description="Lexer throughput benchmark")
+parser.add_argument("--iterations", type=int, default=20)
+parser.add_argument("directories", nargs="*", default=["core-lib"])
+args = parser.parse_args()
+
+sources = find_sources(args.directories)
+if not sources:
+    raise SystemExit("No .som files found in " + ", ".join(args.directories))
+
+num_chars = sum(len(source) for source in sources)
+num_tokens = lex_all(sources)  # warmup
+
+start = time.time()
+for _ in range(args.iterations):
+    lex_all(sources)
+elapsed = (time.time() - start) / args.iterations
+
+print("files:       %d" % len(sources))
+print("characters:  %d" % num_chars)
+print("tokens:      %d" % num_tokens)
+print("time:        %.2f ms per iteration" % (elapsed * 1000))
+print("throughput:  %.2f MB/s" % (num_chars / elapsed / 1e6))
@@ -0,0 +1,27 @@
+try:
+    from rpython.rlib.listsort import make_timsort_class  # pylint: disable=W
+except ImportError:
+    "NOT_RPYTHON"
+    from functools import cmp_to_key
+
+    def make_timsort_class(**_kwargs):
+        class TimSort(object):
+            def __init__(self, lst, listlength=None):
+                self.list = lst
+                self.listlength = listlength
+
+            @staticmethod
+            def lt(a, b):
+                return a < b
+
+            def _compare(self, a, b):
+                if self.lt(a, b):
+                    return -1
+                if self.lt(b, a):
+                    return 1
+                return 0
+
+            def sort(self):
+                self.list.sort(key=cmp_to_key(self._compare))
+
+        return TimSort
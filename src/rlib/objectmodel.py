@@ -9,6 +9,8 @@ try:
     from rpython.rlib.objectmodel import we_are_translated  # pylint: disable=W
     from rpython.rlib.objectmodel import compute_identity_hash  # pylint: disable=W
     from rpython.rlib.objectmodel import compute_hash  # pylint: disable=unused-import
+    from rpython.rlib.objectmodel import specialize  # pylint: disable=unused-import
+    from rpython.rlib.objectmodel import r_dict  # pylint: disable=unused-import
     from rpython.rlib.longlong2float import longlong2float  # pylint: disable=W
     from rpython.rlib.longlong2float import float2longlong  # pylint: disable=W
 except ImportError:
@@ -34,6 +36,75 @@ except ImportError:
             return 0
         return compute_identity_hash(x)
 
+    class _Specialize(object):
+        @staticmethod
+        def argtype(*_args):
+            def decorator(func):
+                return func
+
+            return decorator
+
+    specialize = _Specialize()
+
+    class _RDictKey(object):
+        def __init__(self, r_dict_obj, key):
+            self.r_dict = r_dict_obj
+            self.key = key
+            self.hash = r_dict_obj.key_hash(key)
+
+        def __hash__(self):
+            return self.hash
+
+        def __eq__(self, other):
+            return self.r_dict.key_eq(self.key, other.key)
+
+    class r_dict(object):  # pylint: disable=invalid-name
+        """A dictionary with custom functions for equality and hashing"""
+
+        def __init__(self, key_eq, key_hash, force_non_null=False):
+            self.key_eq = key_eq
+            self.key_hash = key_hash
+            self._dict = {}
+
+        def __getitem__(self, key):
+            return self._dict[_RDictKey(self, key)][1]
+
+        def __setitem__(self, key, value):
+            self._dict[_RDictKey(self, key)] = (key, value)
+
+        def __delitem__(self, key):
+            del self._dict[_RDictKey(self, key)]
+
+        def __contains__(self, key):
+            return _RDictKey(self, key) in self._dict
+
+        def __len__(self):
+            return len(self._dict)
+
+        def get(self, key, default=None):
+            entry = self._dict.get(_RDictKey(self, key), None)
+            if entry is None:
+                return default
+            return entry[1]
+
+        def pop(self, key, default=None):
+            entry = self._dict.pop(_RDictKey(self, key), None)
+            if entry is None:
+                return default
+            return entry[1]
+
+        def clear(self):
+            self._dict.clear()
+
+        def keys(self):
+            return [k for k, _ in self._dict.values()]
+
+        def values(self):
+            return [v for _, v in self._dict.values()]
+
+        def items(self):
+            return list(self._dict.values())
+
     def longlong2float(value):
         return value
 
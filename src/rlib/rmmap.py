@@ -0,0 +1,46 @@
+try:
+    from rpython.rlib.rmmap import mmap, ACCESS_READ  # pylint: disable=W
+    from rpython.rlib.rmmap import RValueError as MapError  # pylint: disable=W
+except ImportError:
+    "NOT_RPYTHON"
+    import sys
+    import mmap as _py_mmap
+
+    ACCESS_READ = _py_mmap.ACCESS_READ
+
+    class MapError(Exception):
+        pass
+
+    class _MMap(object):
+        """Mimics the subset of RPython's rmmap.MMap that we rely on.
+        Bytes are exposed as one-character strings, as in RPython."""
+
+        def __init__(self, py_map, size):
+            self._map = py_map
+            self.size = size
+
+        def getitem(self, index):
+            return self.getslice(index, 1)
+
+        def getslice(self, start, length):
+            data = self._map[start : start + length]
+            if sys.version_info.major > 2:
+                return data.decode("latin-1")
+            return data
+
+        def find(self, tofind, start, end, reverse=False):
+            data = tofind
+            if sys.version_info.major > 2:
+                data = tofind.encode("latin-1")
+            if reverse:
+                return self._map.rfind(data, start, end)
+            return self._map.find(data, start, end)
+
+        def close(self):
+            self._map.close()
+
+    def mmap(fileno, length, access=ACCESS_READ):
+        try:
+            return _MMap(_py_mmap.mmap(fileno, length, access=access), length)
+        except ValueError as e:
+            raise MapError(str(e))
@@ -0,0 +1,30 @@
+try:
+    from rpython.rlib.rzipfile import RZipFile as _RZipFile  # pylint: disable=W
+    from rpython.rlib.rzipfile import BadZipfile  # pylint: disable=W
+
+    class RZipFile(_RZipFile):
+        def close(self):
+            # RPython's RZipFile opens the file for each read,
+            # and keeps nothing open in between
+            pass
+
+except ImportError:
+    "NOT_RPYTHON"
+    import zipfile
+
+    from rlib.string_stream import decode_str
+
+    BadZipfile = zipfile.BadZipfile
+
+    class RZipFile(object):
+        """Mimics the subset of RPython's rzipfile.RZipFile that we rely on."""
+
+        def __init__(self, zipname, mode="r"):
+            self._zip = zipfile.ZipFile(zipname, mode)
+            self.NameToInfo = self._zip.NameToInfo  # pylint: disable=invalid-name
+
+        def read(self, filename):
+            return decode_str(self._zip.read(filename))
+
+        def close(self):
+            self._zip.close()
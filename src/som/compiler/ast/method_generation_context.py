@@ -4,7 +4,10 @@ from som.compiler.method_generation_context import MethodGenerationContextBase
 
 from som.interpreter.ast.nodes.field_node import create_write_node, create_read_node
 from som.interpreter.ast.nodes.global_read_node import create_global_node
-from som.interpreter.ast.nodes.return_non_local_node import CatchNonLocalReturnNode
+from som.interpreter.ast.nodes.return_non_local_node import (
+    CatchNonLocalReturnNode,
+    CatchLocalReturnNode,
+)
 
 from som.vmobjects.primitive import empty_primitive
 from som.vmobjects.method_ast import AstMethod
@@ -27,6 +30,8 @@ class MethodGenerationContext(MethodGenerationContextBase):
             method_body = CatchNonLocalReturnNode(
                 method_body, method_body.source_section
             )
+        elif self.has_inlined_non_local_returns:
+            method_body = CatchLocalReturnNode(method_body, method_body.source_section)
 
         trivial_method = method_body.create_trivial_method(self.signature)
         if trivial_method is not None:
@@ -1,4 +1,5 @@
 from som.compiler.ast.method_generation_context import MethodGenerationContext
+from som.compiler.constant_folding import fold_unary, fold_binary
 from som.compiler.parse_error import ParseError
 from som.compiler.parser import ParserBase
 from som.compiler.symbol import Symbol
@@ -162,7 +163,9 @@ class Parser(ParserBase):
             mgenc.add_embedded_block_method(block_method)
 
             if bgenc.requires_context():
-                result = BlockNodeWithContext(block_method, self.universe)
+                result = BlockNodeWithContext(
+                    block_method, self.universe, mgenc.get_number_of_arguments()
+                )
             else:
                 result = BlockNode(block_method, self.universe)
             return self._assign_source(result, coordinate)
@@ -192,6 +195,15 @@ class Parser(ParserBase):
         coord = self._lexer.get_source_coordinate()
         selector = self._unary_selector()
 
+        if not is_super_send:
+            rcvr_val = _literal_value(receiver)
+            if rcvr_val is not None:
+                folded = fold_unary(
+                    self.universe, rcvr_val, selector.get_embedded_string()
+                )
+                if folded is not None:
+                    return self._assign_source(LiteralNode(folded), coord)
+
         if is_super_send:
             msg = UnarySuper(selector, receiver, mgenc.holder.get_super_class())
         else:
@@ -223,6 +235,16 @@ class Parser(ParserBase):
             return BinarySuper(
                 selector, receiver, arg_expr, mgenc.holder.get_super_class(), source
             )
+
+        rcvr_val = _literal_value(receiver)
+        arg_val = _literal_value(arg_expr)
+        if rcvr_val is not None and arg_val is not None:
+            folded = fold_binary(
+                self.universe, rcvr_val, selector.get_embedded_string(), arg_val
+            )
+            if folded is not None:
+                return LiteralNode(folded, source)
+
         if selector.get_embedded_string() == "+" and isinstance(arg_expr, LiteralNode):
             lit_val = arg_expr.execute(None)
             from som.vmobjects.integer import Integer
@@ -554,3 +576,11 @@ class Parser(ParserBase):
             "Neither a variable nor a field found in current"
             " scope that is named " + variable_name + "."
         )
+
+
+def _literal_value(node):
+    """The value of a literal, or None if the node is no literal.
+    Blocks are literals, too, but create a new object on each execution."""
+    if isinstance(node, LiteralNode) and not isinstance(node, BlockNode):
+        return node.execute(None)
+    return None
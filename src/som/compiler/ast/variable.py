@@ -8,6 +8,9 @@ from som.interpreter.ast.nodes.variable_node import (
     NonLocalVariableWriteNode,
     LocalInnerVarWriteNode,
     LocalFrameVarWriteNode,
+    LocalFrameSlotReadNode,
+    FrameSlotType,
+    create_local_frame_write_node,
 )
 from som.interpreter.bc.bytecodes import Bytecodes
 
@@ -20,6 +23,8 @@ class _Variable(object):
         self._name = name
         self._is_accessed = False
         self._is_accessed_out_of_context = False
+        self._is_written = False
+        self._is_copied_into_inner = False
         self.access_idx = -1
         self.idx = idx
         assert idx >= 0
@@ -39,12 +44,29 @@ class _Variable(object):
         if context_level > 0:
             self._is_accessed_out_of_context = True
 
+    def mark_written(self):
+        self._is_written = True
+
+    def is_read_only(self):
+        return not self._is_written
+
+    def mark_copied_into_inner(self):
+        """The variable stays in the frame, and inner scopes read a copy."""
+        assert self.is_read_only()
+        self._is_copied_into_inner = True
+
+    def _is_in_inner(self, context_level):
+        if context_level > 0:
+            return True
+        return self._is_accessed_out_of_context and not self._is_copied_into_inner
+
     def get_read_node(self, context_level):
         self.mark_accessed(context_level)
         return UninitializedReadNode(self, context_level, None)
 
     def get_write_node(self, context_level, value_expr):
         self.mark_accessed(context_level)
+        self.mark_written()
         return UninitializedWriteNode(self, context_level, value_expr, None)
 
     def get_initialized_read_node(self, context_level, source_section):
@@ -53,7 +75,7 @@ class _Variable(object):
             return NonLocalVariableReadNode(
                 context_level, self.access_idx, source_section
             )
-        if self.is_accessed_out_of_context():
+        if self._is_in_inner(context_level):
             return LocalInnerVarReadNode(self.access_idx, source_section)
         return LocalFrameVarReadNode(self.access_idx, source_section)
 
@@ -63,12 +85,12 @@ class _Variable(object):
             return NonLocalVariableWriteNode(
                 context_level, self.access_idx, value_expr, source_section
             )
-        if self.is_accessed_out_of_context():
+        if self._is_in_inner(context_level):
             return LocalInnerVarWriteNode(self.access_idx, value_expr, source_section)
         return LocalFrameVarWriteNode(self.access_idx, value_expr, source_section)
 
     def get_push_bytecode(self, ctx_level):
-        if self.is_accessed_out_of_context():
+        if self._is_in_inner(ctx_level):
             if ctx_level == 0:
                 if self.access_idx == FRAME_AND_INNER_RCVR_IDX + 0:
                     return Bytecodes.push_inner_0
@@ -88,7 +110,7 @@ class _Variable(object):
         return Bytecodes.push_frame
 
     def get_pop_bytecode(self, ctx_level):
-        if self.is_accessed_out_of_context():
+        if self._is_in_inner(ctx_level):
             if ctx_level == 0:
                 if self.access_idx == FRAME_AND_INNER_RCVR_IDX + 0:
                     return Bytecodes.pop_inner_0
@@ -154,6 +176,28 @@ class Argument(_Variable):
 
 
 class Local(_Variable):
+    _immutable_fields_ = ["slot_type"]
+
+    def __init__(self, name, idx, source):
+        _Variable.__init__(self, name, idx, source)
+        self.slot_type = FrameSlotType()
+
+    def get_initialized_read_node(self, context_level, source_section):
+        if context_level == 0 and not self.is_accessed_out_of_context():
+            assert self.access_idx >= 0
+            return LocalFrameSlotReadNode(self.access_idx, source_section)
+        return _Variable.get_initialized_read_node(self, context_level, source_section)
+
+    def get_initialized_write_node(self, context_level, value_expr, source_section):
+        if context_level == 0 and not self.is_accessed_out_of_context():
+            assert self.access_idx >= 0
+            return create_local_frame_write_node(
+                self.slot_type, self.access_idx, value_expr, source_section
+            )
+        return _Variable.get_initialized_write_node(
+            self, context_level, value_expr, source_section
+        )
+
     def copy_for_inlining(self, idx):
         return Local(self._name, idx, self.source)
 
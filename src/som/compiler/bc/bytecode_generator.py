@@ -37,6 +37,7 @@ def emit_return_self(mgenc):
 
 
 def emit_return_local(mgenc):
+    mgenc.optimize_tail_send()
     if not mgenc.optimize_return_field():
         emit1(mgenc, BC.return_local, 0)
 
@@ -64,6 +65,10 @@ def emit_dup(mgenc):
     emit1(mgenc, BC.dup, 1)
 
 
+def emit_dup_second(mgenc):
+    emit1(mgenc, BC.dup_second, 1)
+
+
 def emit_push_block(mgenc, block_method, with_ctx):
     idx = mgenc.add_literal_if_absent(block_method)
     emit2(mgenc, BC.push_block if with_ctx else BC.push_block_no_ctx, idx, 1)
@@ -189,8 +194,9 @@ def emit_push_constant(mgenc, lit):
     emit2(mgenc, BC.push_constant, idx, 1)
 
 
-def emit_push_constant_index(mgenc, lit_index):
-    emit2(mgenc, BC.push_constant, lit_index, 1)
+def emit_push_literal_array(mgenc, array):
+    idx = mgenc.add_literal_if_absent(array)
+    emit2(mgenc, BC.push_literal_array, idx, 1)
 
 
 def emit_jump_on_with_dummy_offset(mgenc, condition, needs_pop):
@@ -227,6 +233,20 @@ def emit_jump_with_dummy_offset(mgenc):
     return idx
 
 
+def emit_jump_if_greater_with_dummy_offset(mgenc):
+    emit1(mgenc, BC.jump_if_greater, 0)
+    idx = mgenc.add_bytecode_argument_and_get_index(0)
+    mgenc.add_bytecode_argument(0)
+    return idx
+
+
+def emit_jump_if_less_with_dummy_offset(mgenc):
+    emit1(mgenc, BC.jump_if_less, 0)
+    idx = mgenc.add_bytecode_argument_and_get_index(0)
+    mgenc.add_bytecode_argument(0)
+    return idx
+
+
 def emit_jump_backward_with_offset(mgenc, offset):
     emit3(
         mgenc,
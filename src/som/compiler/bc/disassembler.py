@@ -126,7 +126,9 @@ def dump_bytecode(m, b, indent=""):
     elif bytecode == Bytecodes.push_block:
         error_print("block: (index: " + str(m.get_bytecode(b + 1)) + ") ")
         dump_method(m.get_constant(b), indent + "\t")
-    elif bytecode == Bytecodes.push_constant:
+    elif (
+        bytecode == Bytecodes.push_constant or bytecode == Bytecodes.push_literal_array
+    ):
         constant = m.get_constant(b)
         try:
             constant_class = constant.get_class(current_universe)
@@ -159,6 +161,7 @@ def dump_bytecode(m, b, indent=""):
         Bytecodes.send_3,
         Bytecodes.send_n,
         Bytecodes.super_send,
+        Bytecodes.tail_send,
         Bytecodes.q_super_send_1,
         Bytecodes.q_super_send_2,
         Bytecodes.q_super_send_3,
@@ -186,7 +189,10 @@ def dump_bytecode(m, b, indent=""):
         )
     elif bytecode == Bytecodes.return_non_local:
         error_println("context: " + str(m.get_bytecode(b + 1)))
-    elif is_one_of(bytecode, JUMP_BYTECODES):
+    elif (
+        is_one_of(bytecode, JUMP_BYTECODES)
+        or bytecode == Bytecodes.q_inlined_send_guard
+    ):
         offset = compute_offset(m.get_bytecode(b + 1), m.get_bytecode(b + 2))
         if bytecode == Bytecodes.jump_backward or bytecode == Bytecodes.jump2_backward:
             target = b - offset
@@ -2,14 +2,22 @@ from rlib.debug import make_sure_not_resized
 from som.compiler.bc.bytecode_generator import (
     emit_jump_on_with_dummy_offset,
     emit_jump_with_dummy_offset,
+    emit_jump_if_greater_with_dummy_offset,
+    emit_jump_if_less_with_dummy_offset,
+    emit_dup,
+    emit_dup_second,
+    emit_inc,
+    emit_dec,
     emit_pop,
     emit_push_constant,
+    emit_send,
     emit_jump_backward_with_offset,
     emit_inc_field_push,
     emit_return_field,
     JumpCondition,
 )
 
+from som.compiler.constant_folding import fold_unary, fold_binary
 from som.compiler.method_generation_context import MethodGenerationContextBase
 from som.compiler.parse_error import ParseError
 from som.interpreter.bc.bytecodes import (
@@ -28,8 +36,8 @@ from som.interpreter.bc.bytecodes import (
     RETURN_FIELD_BYTECODES,
 )
 from som.vm.globals import trueObject, falseObject
-from som.vm.symbols import sym_nil, sym_false, sym_true
-from som.vmobjects.integer import int_0, int_1
+from som.vm.symbols import sym_nil, sym_false, sym_true, sym_plus
+from som.vmobjects.integer import Integer, int_0, int_1
 from som.vmobjects.method_trivial import (
     LiteralReturn,
     GlobalRead,
@@ -45,6 +53,34 @@ from som.vmobjects.method_bc import (
 
 _NUM_LAST_BYTECODES = 4
 
+_PUSH_CONSTANT_N_BYTECODES = [
+    Bytecodes.push_constant_0,
+    Bytecodes.push_constant_1,
+    Bytecodes.push_constant_2,
+]
+
+_SEND_BYTECODES = [
+    Bytecodes.send_1,
+    Bytecodes.send_2,
+    Bytecodes.send_3,
+    Bytecodes.send_n,
+]
+
+# Bytecodes with a literal index as first argument
+_LITERAL_BYTECODES = [
+    Bytecodes.push_block,
+    Bytecodes.push_block_no_ctx,
+    Bytecodes.push_constant,
+    Bytecodes.push_literal_array,
+    Bytecodes.push_global,
+    Bytecodes.send_1,
+    Bytecodes.send_2,
+    Bytecodes.send_3,
+    Bytecodes.send_n,
+    Bytecodes.super_send,
+    Bytecodes.tail_send,
+]
+
 
 class MethodGenerationContext(MethodGenerationContextBase):
     def __init__(self, universe, holder, outer):
@@ -460,6 +496,28 @@ class MethodGenerationContext(MethodGenerationContextBase):
         emit_return_field(self, idx)
         return True
 
+    def optimize_tail_send(self):
+        """
+        Turn a send of the method's own selector directly before the return
+        into a TAIL_SEND. When the send reaches this method again, the
+        interpreter reuses the current frame instead of a recursive call.
+        The bytecode keeps its length, so jump targets remain valid.
+        """
+        if self.is_block_method:
+            return
+
+        bytecode = self._last_bytecode_is_one_of(0, _SEND_BYTECODES)
+        if bytecode == Bytecodes.invalid:
+            return
+
+        bc_offset = len(self._bytecode) - bytecode_length(bytecode)
+        selector = self._literals[self._bytecode[bc_offset + 1]]
+        if selector is not self.signature:
+            return
+
+        self._bytecode[bc_offset] = Bytecodes.tail_send
+        self._last_4_bytecodes[3] = Bytecodes.tail_send
+
     def _get_index_and_ctx_of_last(self, bytecode, bc_offset):
         if bytecode == Bytecodes.push_field_0:
             return 0, 0
@@ -754,6 +812,216 @@ class MethodGenerationContext(MethodGenerationContextBase):
 
         return True
 
+    def _literal_block_with_arguments(self, num_args):
+        if self._last_bytecode_is_one_of(0, PUSH_BLOCK_BYTECODES) == Bytecodes.invalid:
+            return None
+
+        block_method = self._literals[self._bytecode[-1]]
+        if (
+            not isinstance(block_method, BcMethod)
+            or block_method.get_number_of_signature_arguments() != num_args + 1
+        ):
+            return None
+
+        # each iteration needs its own variable when it is captured by a closure
+        if num_args == 1 and block_method.is_argument_captured(1):
+            return None
+        return block_method
+
+    def is_single_push_constant_since(self, bytecode_idx):
+        push_candidate = self._last_bytecode_is_one_of(0, PUSH_CONST_BYTECODES)
+        if push_candidate == Bytecodes.invalid:
+            return False
+        return bytecode_idx + bytecode_length(push_candidate) == len(self._bytecode)
+
+    def _literal_index_of_last_bytecode(self, idx_from_end):
+        """The literal index of a push_constant*, or -1 for other bytecodes."""
+        push_candidate = self._last_bytecode_is_one_of(
+            idx_from_end, PUSH_CONST_BYTECODES
+        )
+        if push_candidate == Bytecodes.push_constant:
+            offset = self._get_offset_of_last_bytecode(idx_from_end)
+            return self._bytecode[offset + 1]
+        if is_one_of(push_candidate, _PUSH_CONSTANT_N_BYTECODES):
+            return push_candidate - Bytecodes.push_constant_0
+        return -1
+
+    def _constant_of_last_bytecode(self, idx_from_end):
+        push_candidate = self._last_bytecode_is_one_of(
+            idx_from_end, PUSH_CONST_BYTECODES
+        )
+        if push_candidate == Bytecodes.invalid:
+            return None
+
+        if push_candidate == Bytecodes.push_0:
+            return int_0
+        if push_candidate == Bytecodes.push_1:
+            return int_1
+        if push_candidate == Bytecodes.push_nil:
+            return None
+        return self._literals[self._literal_index_of_last_bytecode(idx_from_end)]
+
+    def _literal_integer_of_second_last_bytecode(self):
+        literal = self._constant_of_last_bytecode(1)
+        if isinstance(literal, Integer):
+            return literal
+        return None
+
+    def fold_unary_send(self, selector):
+        rcvr = self._constant_of_last_bytecode(0)
+        if rcvr is None:
+            return False
+
+        result = fold_unary(self.universe, rcvr, selector.get_embedded_string())
+        if result is None:
+            return False
+
+        self._replace_constants_with(1, 1, result)
+        return True
+
+    def fold_binary_send(self, selector):
+        rcvr = self._constant_of_last_bytecode(1)
+        arg = self._constant_of_last_bytecode(0)
+        if rcvr is None or arg is None:
+            return False
+
+        result = fold_binary(self.universe, rcvr, selector.get_embedded_string(), arg)
+        if result is None:
+            return False
+
+        self._replace_constants_with(2, 2, result)
+        return True
+
+    def fold_inc_or_dec(self):
+        bytecode = self._last_bytecode_is_one_of(0, [Bytecodes.inc, Bytecodes.dec])
+        rcvr = self._constant_of_last_bytecode(1)
+        if bytecode == Bytecodes.invalid or rcvr is None:
+            return False
+
+        selector = "+" if bytecode == Bytecodes.inc else "-"
+        result = fold_binary(self.universe, rcvr, selector, int_1)
+        if result is None:
+            return False
+
+        self._replace_constants_with(2, 1, result)
+        return True
+
+    def _replace_constants_with(self, num_bytecodes, num_pushes, result):
+        literal_indices = [
+            self._literal_index_of_last_bytecode(i) for i in range(num_bytecodes)
+        ]
+        self._remove_last_bytecodes(num_bytecodes)
+        self._current_stack_depth -= num_pushes
+        self._reset_last_bytecode_buffer()
+
+        # drop literals, which were only used by the removed bytecodes
+        last = len(self._literals) - 1
+        while last >= 0 and last in literal_indices and not self._is_literal_used(last):
+            self._literals.pop()
+            last -= 1
+
+        emit_push_constant(self, result)
+
+    def _is_literal_used(self, literal_idx):
+        i = 0
+        while i < len(self._bytecode):
+            bytecode = self._bytecode[i]
+            if is_one_of(bytecode, _LITERAL_BYTECODES):
+                if self._bytecode[i + 1] == literal_idx:
+                    return True
+            elif is_one_of(bytecode, _PUSH_CONSTANT_N_BYTECODES):
+                if bytecode - Bytecodes.push_constant_0 == literal_idx:
+                    return True
+            i += bytecode_length(bytecode)
+        return False
+
+    def inline_to_do(self, parser, is_down_to):
+        # HACK: We do assume that the receiver on the stack is a number,
+        # HACK: similar to the inlining of #ifTrue: for booleans.
+        # HACK: jump_if_greater/jump_if_less only have a fast path for Integers,
+        # HACK: other receivers and limits get the test sent to them.
+        to_be_inlined = self._literal_block_with_arguments(1)
+        if to_be_inlined is None:
+            return False
+
+        self._remove_last_bytecodes(1)  # remove push_block*
+
+        # the counter starts with the receiver
+        emit_dup_second(self)
+        self._inline_counting_loop(parser, to_be_inlined, is_down_to, None)
+        return True
+
+    def inline_to_by_do(self, parser):
+        to_be_inlined = self._literal_block_with_arguments(1)
+        if to_be_inlined is None:
+            return False
+
+        # we only inline literal steps, to avoid having to keep the step around
+        step = self._literal_integer_of_second_last_bytecode()
+        if step is None:
+            return False
+
+        self._remove_last_bytecodes(2)  # remove push of the step and push_block*
+
+        emit_dup_second(self)
+        self._inline_counting_loop(parser, to_be_inlined, False, step)
+        return True
+
+    def inline_times_repeat(self, parser):
+        to_be_inlined = self._literal_block_with_arguments(0)
+        if to_be_inlined is None:
+            return False
+
+        self._remove_last_bytecodes(1)  # remove push_block*
+
+        # the receiver is the limit, and we count from 1
+        emit_dup(self)
+        emit_push_constant(self, int_1)
+        self._inline_counting_loop(parser, to_be_inlined, False, None)
+        return True
+
+    def _inline_counting_loop(self, parser, to_be_inlined, is_down_to, step):
+        """Emits the loop for a stack with the receiver, the limit,
+        and the counter on top. The receiver remains as the result."""
+        # the loop begin is a jump target, and can't be optimized
+        self._reset_last_bytecode_buffer()
+        loop_begin_idx = self.offset_of_next_instruction()
+
+        if is_down_to:
+            jump_offset_idx_to_end = emit_jump_if_less_with_dummy_offset(self)
+        else:
+            jump_offset_idx_to_end = emit_jump_if_greater_with_dummy_offset(self)
+
+        self._is_currently_inlining_a_block = True
+        if to_be_inlined.get_number_of_signature_arguments() == 2:
+            emit_dup(self)
+            to_be_inlined.inline_with_argument_from_stack(self)
+        else:
+            to_be_inlined.inline(self)
+
+        emit_pop(self)
+
+        if step is None or step.get_embedded_integer() == 1:
+            if is_down_to:
+                emit_dec(self)
+            else:
+                emit_inc(self)
+        else:
+            emit_push_constant(self, step)
+            emit_send(self, sym_plus)
+
+        self.emit_backwards_jump_offset_to_target(loop_begin_idx, parser)
+        self.patch_jump_offset_to_point_to_next_instruction(
+            jump_offset_idx_to_end, parser
+        )
+        self._is_currently_inlining_a_block = False
+
+        # drop the counter and the limit
+        self._reset_last_bytecode_buffer()
+        emit_pop(self)
+        emit_pop(self)
+        self._reset_last_bytecode_buffer()
+
     def _complete_jumps_and_emit_returning_nil(
         self, parser, loop_begin_idx, jump_offset_idx_to_skip_loop_body
     ):
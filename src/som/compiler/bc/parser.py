@@ -16,7 +16,7 @@ from som.compiler.bc.bytecode_generator import (
     emit_push_argument,
     emit_pop_argument,
     emit_push_constant,
-    emit_push_constant_index,
+    emit_push_literal_array,
     emit_return_non_local,
 )
 from som.compiler.bc.method_generation_context import (
@@ -27,13 +27,13 @@ from som.compiler.parser import ParserBase
 from som.compiler.symbol import Symbol
 from som.vm.symbols import (
     sym_array,
-    sym_array_size_placeholder,
     sym_new_msg,
     sym_at_put_msg,
     symbol_for,
     sym_minus,
     sym_plus,
 )
+from som.vmobjects.array import Array
 from som.vmobjects.integer import Integer
 from som.vmobjects.string import String
 
@@ -143,7 +143,7 @@ class Parser(ParserBase):
         return variable
 
     def _evaluation(self, mgenc):
-        self._primary(mgenc)
+        is_literal = self._primary(mgenc)
 
         if (
             self._sym_is_identifier()
@@ -151,11 +151,13 @@ class Parser(ParserBase):
             or self._sym == Symbol.OperatorSequence
             or self._sym_in(self._binary_op_syms)
         ):
-            self._messages(mgenc)
+            self._messages(mgenc, is_literal)
 
         self._super_send = False
 
     def _primary(self, mgenc):
+        """Returns True, if the primary is a literal,
+        which is pushed by the last bytecode."""
         if self._sym_is_identifier():
             var_name = self._variable()
             if var_name == "super":
@@ -163,28 +165,35 @@ class Parser(ParserBase):
                 # sends to super push self as the receiver
                 var_name = "self"
             self._gen_push_variable(mgenc, var_name)
+            return False
 
-        elif self._sym == Symbol.NewTerm:
+        if self._sym == Symbol.NewTerm:
+            start = mgenc.get_number_of_bytecodes()
             self._nested_term(mgenc)
-        elif self._sym == Symbol.NewBlock:
+            return mgenc.is_single_push_constant_since(start)
+
+        if self._sym == Symbol.NewBlock:
             bgenc = MethodGenerationContext(self.universe, mgenc.holder, mgenc)
             self.nested_block(bgenc)
 
             block_method = bgenc.assemble(None)
             emit_push_block(mgenc, block_method, bgenc.requires_context())
-        else:
-            self._literal(mgenc)
+            return False
 
-    def _messages(self, mgenc):
+        start = mgenc.get_number_of_bytecodes()
+        self._literal(mgenc)
+        return mgenc.is_single_push_constant_since(start)
+
+    def _messages(self, mgenc, is_literal):
         if self._sym_is_identifier():
             while self._sym_is_identifier():
                 # only the first message in a sequence can be a super send
-                self._unary_message(mgenc)
+                is_literal = self._unary_message(mgenc, is_literal)
 
             while self._sym == Symbol.OperatorSequence or self._sym_in(
                 self._binary_op_syms
             ):
-                self._binary_message(mgenc)
+                is_literal = self._binary_message(mgenc, is_literal)
 
             if self._sym == Symbol.Keyword:
                 self._keyword_message(mgenc)
@@ -194,7 +203,7 @@ class Parser(ParserBase):
                 self._binary_op_syms
             ):
                 # only the first message in a sequence can be a super send
-                self._binary_message(mgenc)
+                is_literal = self._binary_message(mgenc, is_literal)
 
             if self._sym == Symbol.Keyword:
                 self._keyword_message(mgenc)
@@ -202,7 +211,8 @@ class Parser(ParserBase):
         else:
             self._keyword_message(mgenc)
 
-    def _unary_message(self, mgenc):
+    def _unary_message(self, mgenc, is_literal):
+        """Returns True, if the result is a literal, because it was folded."""
         is_super_send = self._super_send
         self._super_send = False
 
@@ -210,8 +220,11 @@ class Parser(ParserBase):
 
         if is_super_send:
             emit_super_send(mgenc, msg)
+        elif is_literal and mgenc.fold_unary_send(msg):
+            return True
         else:
             emit_send(mgenc, msg)
+        return False
 
     def _try_inc_or_dec_bytecodes(self, msg, is_super_send, mgenc):
         is_inc_or_dec = msg is sym_plus or msg is sym_minus
@@ -225,16 +238,17 @@ class Parser(ParserBase):
                 return True
         return False
 
-    def _binary_message(self, mgenc):
+    def _binary_message(self, mgenc, is_literal):
+        """Returns True, if the result is a literal, because it was folded."""
         is_super_send = self._super_send
         self._super_send = False
 
         msg = self._binary_selector()
 
         if self._try_inc_or_dec_bytecodes(msg, is_super_send, mgenc):
-            return
+            return is_literal and mgenc.fold_inc_or_dec()
 
-        self._binary_operand(mgenc)
+        is_literal_operand = self._binary_operand(mgenc)
 
         if not is_super_send and (
             msg.get_embedded_string() == "||"
@@ -242,18 +256,23 @@ class Parser(ParserBase):
             or msg.get_embedded_string() == "&&"
             and mgenc.inline_andor(self, False)
         ):
-            return
+            return False
 
         if is_super_send:
             emit_super_send(mgenc, msg)
+        elif is_literal and is_literal_operand and mgenc.fold_binary_send(msg):
+            return True
         else:
             emit_send(mgenc, msg)
+        return False
 
     def _binary_operand(self, mgenc):
-        self._primary(mgenc)
+        is_literal = self._primary(mgenc)
 
         while self._sym_is_identifier():
-            self._unary_message(mgenc)
+            is_literal = self._unary_message(mgenc, is_literal)
+
+        return is_literal
 
     def _keyword_message(self, mgenc):
         is_super_send = self._super_send
@@ -292,6 +311,7 @@ class Parser(ParserBase):
                 or (keyword == "whileFalse:" and mgenc.inline_while(self, False))
                 or (keyword == "or:" and mgenc.inline_andor(self, True))
                 or (keyword == "and:" and mgenc.inline_andor(self, False))
+                or (keyword == "timesRepeat:" and mgenc.inline_times_repeat(self))
             ):
                 return
 
@@ -312,9 +332,14 @@ class Parser(ParserBase):
                     keyword == "ifNotNil:ifNil:"
                     and mgenc.inline_then_else_branches(self, JumpCondition.on_nil)
                 )
+                or (keyword == "to:do:" and mgenc.inline_to_do(self, False))
+                or (keyword == "downTo:do:" and mgenc.inline_to_do(self, True))
             ):
                 return
 
+            if num_args == 3 and keyword == "to:by:do:" and mgenc.inline_to_by_do(self):
+                return
+
         msg = symbol_for(keyword)
 
         if is_super_send:
@@ -323,16 +348,16 @@ class Parser(ParserBase):
             emit_send(mgenc, msg)
 
     def _formula(self, mgenc):
-        self._binary_operand(mgenc)
+        is_literal = self._binary_operand(mgenc)
 
         # only the first message in a sequence can be a super send
         if self._sym == Symbol.OperatorSequence or self._sym_in(self._binary_op_syms):
-            self._binary_message(mgenc)
+            is_literal = self._binary_message(mgenc, is_literal)
 
         while self._sym == Symbol.OperatorSequence or self._sym_in(
             self._binary_op_syms
         ):
-            self._binary_message(mgenc)
+            is_literal = self._binary_message(mgenc, is_literal)
 
         self._super_send = False
 
@@ -374,30 +399,56 @@ class Parser(ParserBase):
         emit_push_constant(mgenc, string)
 
     def _literal_array(self, mgenc):
+        self._emit_literal_array(mgenc, self._literal_array_values())
+
+    def _literal_array_values(self):
         self._expect(Symbol.Pound)
         self._expect(Symbol.NewTerm)
 
-        array_size_literal_idx = mgenc.add_literal(sym_array_size_placeholder)
+        values = []
+        while self._sym != Symbol.EndTerm:
+            values.append(self._literal_value())
 
-        # create empty array
-        emit_push_global(mgenc, sym_array)
-        emit_push_constant_index(mgenc, array_size_literal_idx)
-        emit_send(mgenc, sym_new_msg)
+        self._expect(Symbol.EndTerm)
+        return values[:]
 
-        i = 1
+    def _literal_value(self):
+        if self._sym == Symbol.Pound:
+            self._peek_for_next_symbol_from_lexer_if_necessary()
 
-        while self._sym != Symbol.EndTerm:
-            push_idx = Integer(i)
-            emit_push_constant(mgenc, push_idx)
+            if self._next_sym == Symbol.NewTerm:
+                return Array.from_values(self._literal_array_values())
 
-            self._literal(mgenc)
-            emit_send(mgenc, sym_at_put_msg)
-            i += 1
+            self._expect(Symbol.Pound)
+            if self._sym == Symbol.STString:
+                return symbol_for(self._string())
+            return self._selector()
+        if self._sym == Symbol.STString:
+            return String(self._string())
+        if self._sym == Symbol.Minus:
+            return self._negative_decimal()
+        return self._literal_decimal(False)
+
+    def _emit_literal_array(self, mgenc, values):
+        if not _contains_array(values):
+            # the array is created only once, and each execution gets
+            # a copy-on-write copy of it
+            emit_push_literal_array(mgenc, Array.from_values(values))
+            return
 
-        mgenc.update_literal(
-            sym_array_size_placeholder, array_size_literal_idx, Integer(i - 1)
-        )
-        self._expect(Symbol.EndTerm)
+        # nested arrays are mutable, too, and need to be fresh copies,
+        # so, we create the outer array when executing the code
+        emit_push_global(mgenc, sym_array)
+        emit_push_constant(mgenc, Integer(len(values)))
+        emit_send(mgenc, sym_new_msg)
+
+        for i, value in enumerate(values):
+            emit_push_constant(mgenc, Integer(i + 1))
+            if isinstance(value, Array):
+                self._emit_literal_array(mgenc, value.as_argument_array())
+            else:
+                emit_push_constant(mgenc, value)
+            emit_send(mgenc, sym_at_put_msg)
 
     def nested_block(self, mgenc):
         self._nested_block_signature(mgenc)
@@ -455,6 +506,14 @@ class Parser(ParserBase):
             else:
                 emit_pop_local(mgenc, result.var.idx, result.context)
             result.mark_accessed()
+            result.var.mark_written()
         else:
             emit_pop_field(mgenc, symbol_for(var))
             mgenc.mark_self_as_accessed_from_outer_context()
+
+
+def _contains_array(values):
+    for value in values:
+        if isinstance(value, Array):
+            return True
+    return False
@@ -0,0 +1,119 @@
+from som.vm.globals import trueObject, falseObject
+from som.vm.symbols import symbol_for
+from som.vmobjects.biginteger import BigInteger
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+from som.vmobjects.primitive import UnaryPrimitive, BinaryPrimitive
+from som.vmobjects.string import String
+from som.vmobjects.symbol import Symbol
+
+# Sends with literal operands are evaluated by the parsers at compile time,
+# if the selector is one of these, and the receiver's class still implements
+# it with a primitive. Classes can replace primitives with their own
+# methods, in which case nothing is folded.
+
+_NUMBER_UNARY = ["abs", "negated"]
+
+_NUMBER_BINARY = [
+    "+",
+    "-",
+    "*",
+    "/",
+    "//",
+    "%",
+    "<",
+    ">",
+    "<=",
+    ">=",
+    "=",
+    "<>",
+    "~=",
+]
+
+_DIVISIONS = ["/", "//", "%"]
+
+_STRING_UNARY = ["length"]
+
+_STRING_BINARY = ["="]
+
+
+def _is_number(obj):
+    return (
+        isinstance(obj, Integer)
+        or isinstance(obj, BigInteger)
+        or isinstance(obj, Double)
+    )
+
+
+def _is_string(obj):
+    return isinstance(obj, String) and not isinstance(obj, Symbol)
+
+
+def _is_zero(obj):
+    if isinstance(obj, Integer):
+        return obj.get_embedded_integer() == 0
+    if isinstance(obj, Double):
+        return obj.get_embedded_double() == 0.0
+    return False
+
+
+def _is_literal_result(obj):
+    return _is_number(obj) or obj is trueObject or obj is falseObject
+
+
+def _primitive(universe, rcvr, selector):
+    clazz = rcvr.get_class(universe)
+    if clazz is None:
+        # the class is not yet loaded
+        return None
+    invokable = clazz.lookup_invokable(symbol_for(selector))
+    if invokable is None or not invokable.is_primitive() or invokable.is_empty():
+        return None
+    return invokable
+
+
+def fold_unary(universe, rcvr, selector):
+    """Returns the result of sending the unary selector to the literal,
+    or None if the send cannot be evaluated at compile time."""
+    if _is_number(rcvr):
+        if selector not in _NUMBER_UNARY:
+            return None
+    elif _is_string(rcvr):
+        if selector not in _STRING_UNARY:
+            return None
+    else:
+        return None
+
+    prim = _primitive(universe, rcvr, selector)
+    if not isinstance(prim, UnaryPrimitive):
+        return None
+
+    result = prim.invoke_1(rcvr)
+    if _is_literal_result(result):
+        return result
+    return None
+
+
+def fold_binary(universe, rcvr, selector, arg):
+    """Returns the result of sending the binary selector to the literals,
+    or None if the send cannot be evaluated at compile time."""
+    if _is_number(rcvr) and _is_number(arg):
+        if selector not in _NUMBER_BINARY:
+            return None
+        if selector in _DIVISIONS and _is_zero(arg):
+            # the error needs to happen at run time
+            return None
+    elif _is_string(rcvr) and _is_string(arg):
+        if selector not in _STRING_BINARY:
+            return None
+    else:
+        return None
+
+    prim = _primitive(universe, rcvr, selector)
+    if not isinstance(prim, BinaryPrimitive):
+        return None
+
+    result = prim.invoke_2(rcvr, arg)
+    if _is_literal_result(result):
+        return result
+    return None
@@ -1,15 +1,27 @@
+from rlib.streamio import readall_from_stream
 from rtruffle.source_section import SourceCoordinate
 from som.compiler.symbol import Symbol
 
 
 class Lexer(object):
+    """Lexes the whole source, which is read into a buffer up front.
+
+    Token text is sliced from the buffer once the end of a token is known,
+    instead of being built up character by character. _bufp is the offset
+    into the whole source, and _line_start the offset of the current line.
+    """
+
     _SEPARATOR = "----"
     _PRIMITIVE = "primitive"
 
     def __init__(self, input_file):
-        self.line_number = 0
-        self._chars_read = 0  # all characters read, excluding the current line
-        self._infile = input_file
+        try:
+            self._buf = readall_from_stream(input_file)
+        except (IOError, OSError) as ioe:
+            raise ValueError("Error reading from input: " + str(ioe))
+        self._bufp = 0
+        self._line_start = 0
+        self.line_number = 1 if self._buf else 0
         self._sym = Symbol.NONE
         self._symc = "\0"
         self.text = ""
@@ -17,23 +29,18 @@ class Lexer(object):
         self._next_sym = Symbol.NONE
         self._next_symc = "\0"
         self._next_text = ""
-        self._buf = ""
-        self._bufp = 0
 
     def get_source_coordinate(self):
-        return SourceCoordinate(
-            self.line_number, self._bufp + 1, self._chars_read + self._bufp
-        )
+        return SourceCoordinate(self.line_number, self.get_current_column(), self._bufp)
 
     def _lex_number(self):
         self._sym = Symbol.Integer
         self._symc = "\0"
-        self.text = ""
+        start = self._bufp
 
         saw_decimal_mark = False
 
         while self._current_char().isdigit():
-            self.text += self._current_char()
             self._bufp += 1
 
             if (
@@ -43,17 +50,18 @@ class Lexer(object):
             ):
                 self._sym = Symbol.Double
                 saw_decimal_mark = True
-                self.text += self._current_char()
                 self._bufp += 1
 
+        self.text = self._slice_from(start)
+
     def _lex_operator(self):
         if self._is_operator(self._bufchar(self._bufp + 1)):
             self._sym = Symbol.OperatorSequence
             self._symc = "\0"
-            self.text = ""
+            start = self._bufp
             while self._is_operator(self._current_char()):
-                self.text += self._current_char()
                 self._bufp += 1
+            self.text = self._slice_from(start)
         elif self._current_char() == "~":
             self._match(Symbol.Not)
         elif self._current_char() == "&":
@@ -83,51 +91,60 @@ class Lexer(object):
         elif self._current_char() == "-":
             self._match(Symbol.Minus)
 
-    def _lex_escape_char(self):
+    def _lex_escape_char(self, parts):
         if self._end_of_buffer():
             raise Exception("Invalid escape sequence")
 
         if self._current_char() == "t":
-            self.text += "\t"
+            parts.append("\t")
         elif self._current_char() == "b":
-            self.text += "\b"
+            parts.append("\b")
         elif self._current_char() == "n":
-            self.text += "\n"
+            parts.append("\n")
         elif self._current_char() == "r":
-            self.text += "\r"
+            parts.append("\r")
         elif self._current_char() == "f":
-            self.text += "\f"
+            parts.append("\f")
         elif self._current_char() == "0":
-            self.text += "\0"
+            parts.append("\0")
         elif self._current_char() == "'":
-            self.text += "'"
+            parts.append("'")
         elif self._current_char() == "\\":
-            self.text += "\\"
+            parts.append("\\")
+        elif self._current_char() == "\n":
+            self._new_line(self._bufp)
 
         self._bufp += 1
 
-    def _lex_string_char(self):
-        if self._current_char() == "\\":
-            self._bufp += 1
-            self._lex_escape_char()
-        else:
-            self.text += self._current_char()
-            self._bufp += 1
-
-        while self._end_of_buffer():
-            if self._fill_buffer() == -1:
-                return
-
     def _lex_string(self):
         self._sym = Symbol.STString
         self._symc = "\0"
         self._bufp += 1
-        self.text = ""
 
-        while self._current_char() != "'":
-            self._lex_string_char()
+        # the characters between escape sequences are sliced as a whole,
+        # and only strings with escape sequences are joined from parts
+        parts = None
+        start = self._bufp
 
-        self._bufp += 1
+        while True:
+            self._scan_until("'", "\\")
+            if self._current_char() != "\\":
+                break
+            if parts is None:
+                parts = []
+            parts.append(self._slice_from(start))
+            self._bufp += 1
+            self._lex_escape_char(parts)
+            start = self._bufp
+
+        if parts is None:
+            self.text = self._slice_from(start)
+        else:
+            parts.append(self._slice_from(start))
+            self.text = "".join(parts)
+
+        if not self._end_of_buffer():
+            self._bufp += 1
 
     def get_sym(self):
         if self.peek_done:
@@ -182,11 +199,11 @@ class Lexer(object):
         elif self._current_char() == ".":
             self._match(Symbol.Period)
         elif self._current_char() == "-":
-            if self._buf[self._bufp :].startswith(self._SEPARATOR):
-                self.text = ""
+            if self._next_chars_are(self._SEPARATOR):
+                start = self._bufp
                 while self._current_char() == "-":
-                    self.text += self._current_char()
                     self._bufp += 1
+                self.text = self._slice_from(start)
                 self._sym = Symbol.Separator
             else:
                 self._lex_operator()
@@ -201,20 +218,17 @@ class Lexer(object):
             self.text = self._PRIMITIVE
         elif self._current_char().isalpha():
             self._symc = "\0"
-            self.text = ""
-            while self._current_char().isalnum() or self._current_char() == "_":
-                self.text += self._current_char()
-                self._bufp += 1
+            start = self._bufp
+            self._skip_identifier_chars()
             self._sym = Symbol.Identifier
             if self._current_char() == ":":
                 self._sym = Symbol.Keyword
                 self._bufp += 1
-                self.text += ":"
                 if self._current_char().isalpha():
                     self._sym = Symbol.KeywordSequence
                     while self._current_char().isalpha() or self._current_char() == ":":
-                        self.text += self._current_char()
                         self._bufp += 1
+            self.text = self._slice_from(start)
         elif self._current_char().isdigit():
             self._lex_number()
         else:
@@ -224,8 +238,19 @@ class Lexer(object):
 
         return self._sym
 
+    def _skip_identifier_chars(self):
+        buf = self._buf
+        i = self._bufp
+        while i < len(buf) and (buf[i].isalnum() or buf[i] == "_"):
+            i += 1
+        self._bufp = i
+
+    def _next_chars_are(self, text):
+        end = self._bufp + len(text)
+        return self._buf[self._bufp : end] == text
+
     def _next_word_in_buffer_is(self, text):
-        if not self._buf[self._bufp :].startswith(text):
+        if not self._next_chars_are(text):
             return False
         char_after_text = self._bufchar(self._bufp + len(text))
         return not char_after_text.isalnum()
@@ -252,50 +277,59 @@ class Lexer(object):
         return self._next_sym
 
     def get_raw_buffer(self):
-        return self._buf
+        """Returns the current line, for error messages."""
+        end = self._buf.find("\n", self._line_start)
+        if end == -1:
+            end = len(self._buf)
+        else:
+            end += 1
+        return self._buf[self._line_start : end]
 
     def get_current_column(self):
-        return self._bufp + 1
+        return self._bufp - self._line_start + 1
 
     # All characters read and processed, including current line
     def get_number_of_characters_read(self):
-        return self._chars_read + self._bufp
-
-    def _fill_buffer(self):
-        try:
-            self._chars_read += len(self._buf)
-            self._buf = self._infile.readline()
-            if self._buf == "":
-                return -1
-            self.line_number += 1
-            self._bufp = 0
-            return len(self._buf)
-        except IOError as ioe:
-            raise ValueError("Error reading from input: " + str(ioe))
+        return self._bufp
 
     def _has_more_input(self):
-        while self._end_of_buffer():
-            if self._fill_buffer() == -1:
-                return False
-        return True
+        return not self._end_of_buffer()
+
+    def _new_line(self, newline_idx):
+        # a newline starts the next line, unless it is the last character
+        if newline_idx + 1 < len(self._buf):
+            self.line_number += 1
+            self._line_start = newline_idx + 1
+
+    def _scan_until(self, end_char, escape_char):
+        """Advances to the next end_char or escape_char, or to the end of
+        the buffer, and keeps track of the lines on the way."""
+        buf = self._buf
+        i = self._bufp
+        while i < len(buf):
+            c = buf[i]
+            if c == end_char or c == escape_char:
+                break
+            if c == "\n":
+                self._new_line(i)
+            i += 1
+        self._bufp = i
 
     def _skip_white_space(self):
-        while self._current_char().isspace():
-            self._bufp += 1
-            while self._end_of_buffer():
-                if self._fill_buffer() == -1:
-                    return
+        buf = self._buf
+        i = self._bufp
+        while i < len(buf) and buf[i].isspace():
+            if buf[i] == "\n":
+                self._new_line(i)
+            i += 1
+        self._bufp = i
 
     def _skip_comment(self):
         if self._current_char() == '"':
-            while True:
-                self._bufp += 1
-                while self._end_of_buffer():
-                    if self._fill_buffer() == -1:
-                        return
-                if self._current_char() == '"':
-                    break
             self._bufp += 1
+            self._scan_until('"', '"')
+            if not self._end_of_buffer():
+                self._bufp += 1
 
     def _current_char(self):
         return self._bufchar(self._bufp)
@@ -330,3 +364,7 @@ class Lexer(object):
 
     def _bufchar(self, idx):
         return "\0" if idx >= len(self._buf) else self._buf[idx]
+
+    def _slice_from(self, start):
+        assert start >= 0
+        return self._buf[start : self._bufp]
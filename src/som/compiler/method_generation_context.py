@@ -25,6 +25,10 @@ class MethodGenerationContextBase(object):
         self.needs_to_catch_non_local_returns = False
         self._accesses_variables_of_outer_context = False
 
+        # the non-local returns to this method, that were not inlined into it
+        self.num_non_local_returns = 0
+        self.has_inlined_non_local_returns = False
+
         self.universe = universe
 
         self.lexical_scope = None
@@ -134,6 +138,21 @@ class MethodGenerationContextBase(object):
 
         assert ctx is not None
         ctx.needs_to_catch_non_local_returns = True
+        ctx.num_non_local_returns += 1
+
+    def make_non_local_return_local(self):
+        """The block with a non-local return was inlined into the method,
+        which now returns directly. If this was the last one, the method does
+        not need to catch non-local returns anymore."""
+        ctx = self
+        while ctx.outer_genc is not None:
+            ctx = ctx.outer_genc
+
+        assert ctx.num_non_local_returns > 0
+        ctx.num_non_local_returns -= 1
+        ctx.has_inlined_non_local_returns = True
+        if ctx.num_non_local_returns == 0:
+            ctx.needs_to_catch_non_local_returns = False
 
     def requires_context(self):
         return self.throws_non_local_return or self._accesses_variables_of_outer_context
@@ -163,7 +182,44 @@ class MethodGenerationContextBase(object):
 
         return inner_access
 
+    def _has_only_read_only_captures(self):
+        """Inner scopes can work on a copy of receiver and arguments, if they
+        do not assign to them, do not access locals, and if there are no
+        non-local returns, which need the Inner as on-stack marker."""
+        if self.throws_non_local_return or self.needs_to_catch_non_local_returns:
+            return False
+
+        for local in self._locals.values():
+            if local.is_accessed_out_of_context():
+                return False
+
+        for arg in self._arguments.values():
+            if arg.is_accessed_out_of_context() and not arg.is_read_only():
+                return False
+        return True
+
+    def _prepare_frame_with_inner_on_demand(self):
+        """The frame is created without Inner, which is created only when a
+        block with context is created, see get_or_create_inner_as_context()."""
+        arg_list = list(self._arguments.values())
+        i = FRAME_AND_INNER_RCVR_IDX
+        for arg in arg_list:
+            arg.set_access_index(i)
+            if arg.is_accessed_out_of_context():
+                arg.mark_copied_into_inner()
+            i += 1
+
+        for local in self._locals.values():
+            local.set_access_index(i)
+            i += 1
+
+        arg_inner_access = [False] * (len(arg_list) - 1)
+        return arg_inner_access, i, 0
+
     def prepare_frame(self):
+        if self._has_only_read_only_captures():
+            return self._prepare_frame_with_inner_on_demand()
+
         arg_list = list(self._arguments.values())
         args = []
         args_inner = []
@@ -212,9 +268,13 @@ class MethodGenerationContextBase(object):
         self.signature = symbol_for(block_sig)
 
     def merge_into_scope(self, scope_to_be_inlined):
-        assert len(scope_to_be_inlined.arguments) == 1
+        # the arguments of inlined loop bodies become locals, too
+        # $blockSelf is the first argument, and is not needed
+        arguments = scope_to_be_inlined.arguments
         local_vars = scope_to_be_inlined.locals
-        if local_vars:
+        if len(arguments) > 1:
+            self.inline_locals(arguments[1:] + local_vars)
+        elif local_vars:
             self.inline_locals(local_vars)
 
 
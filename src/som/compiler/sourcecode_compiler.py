@@ -24,6 +24,19 @@ def compile_class_from_file(path, filename, system_class, universe):
     except OSError:
         raise IOError()
 
+    _check_class_name(result, filename, universe)
+    return result
+
+
+def compile_class_from_archive(source, path, filename, system_class, universe):
+    """Compiles the source of a class read from an archive on the class path."""
+    parser = Parser(StringStream(source), path + os.sep + filename + ".som", universe)
+    result = _compile(parser, system_class, universe)
+    _check_class_name(result, filename, universe)
+    return result
+
+
+def _check_class_name(result, filename, universe):
     cname = result.get_name()
     cname_str = cname.get_embedded_string()
 
@@ -35,8 +48,6 @@ def compile_class_from_file(path, filename, system_class, universe):
         )
         universe.exit(1)
 
-    return result
-
 
 def compile_class_from_string(stream, system_class, universe):
     parser = Parser(StringStream(stream), "$str", universe)
@@ -2,6 +2,9 @@ from rlib import jit
 from rlib.debug import make_sure_not_resized
 from rlib.erased import new_erasing_pair
 from som.vm.globals import nilObject, trueObject, falseObject
+from som.vmobjects.abstract_object import AbstractObject
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
 
 # Frame Design Notes
 #
@@ -58,6 +61,18 @@ from som.vm.globals import nilObject, trueObject, falseObject
 #  | ...             |
 #  | LocalForInner n |
 #  +-----------------+
+#
+# In the AST interpreter, a local in the Frame may hold an unboxed long or double.
+# It is then stored in a LongSlot or DoubleSlot, which is allocated on the first
+# write of the activation and updated in place afterwards. The slot caches the boxed
+# value, so that reading it repeatedly does not allocate either.
+# Receiver and arguments are always stored boxed.
+#
+# Arguments that are never assigned to are read-only. If inner scopes access only
+# such arguments and the receiver, and there are no non-local returns, the Frame
+# keeps all arguments and is created without Inner. The Inner is then only
+# allocated when the first block with context is created, as a copy of receiver
+# and arguments. This keeps the indexes the same in Frame and Inner.
 
 _FRAME_INNER_IDX = 0
 
@@ -165,7 +180,7 @@ def create_frame_args(receiver, arguments, arg_inner_access, size_frame, size_in
         inner[FRAME_AND_INNER_RCVR_IDX] = receiver
         _set_arguments_with_inner(frame, inner, arguments, arg_inner_access)
     else:
-        frame[0] = _erase_obj(None)
+        frame[0] = _erase_list(None)
         frame[FRAME_AND_INNER_RCVR_IDX] = _erase_obj(receiver)
         _set_arguments_without_inner(frame, arguments, arg_inner_access)
 
@@ -220,6 +235,57 @@ def write_frame(frame, idx, value):
     frame[idx] = _erase_obj(value)
 
 
+class LongSlot(AbstractObject):
+    def __init__(self, value, boxed):
+        AbstractObject.__init__(self)
+        self.value = value
+        self.boxed = boxed
+
+    def get_boxed(self):
+        if self.boxed is None:
+            self.boxed = Integer(self.value)
+        return self.boxed
+
+
+class DoubleSlot(AbstractObject):
+    def __init__(self, value, boxed):
+        AbstractObject.__init__(self)
+        self.value = value
+        self.boxed = boxed
+
+    def get_boxed(self):
+        if self.boxed is None:
+            self.boxed = Double(self.value)
+        return self.boxed
+
+
+def read_frame_boxed(frame, idx):
+    value = _unerase_obj(frame[idx])
+    if isinstance(value, LongSlot) or isinstance(value, DoubleSlot):
+        return value.get_boxed()
+    return value
+
+
+def write_frame_long(frame, idx, value, boxed):
+    """boxed is the value as Integer, or None if it was not needed"""
+    slot = _unerase_obj(frame[idx])
+    if isinstance(slot, LongSlot):
+        slot.value = value
+        slot.boxed = boxed
+    else:
+        frame[idx] = _erase_obj(LongSlot(value, boxed))
+
+
+def write_frame_double(frame, idx, value, boxed):
+    """boxed is the value as Double, or None if it was not needed"""
+    slot = _unerase_obj(frame[idx])
+    if isinstance(slot, DoubleSlot):
+        slot.value = value
+        slot.boxed = boxed
+    else:
+        frame[idx] = _erase_obj(DoubleSlot(value, boxed))
+
+
 def read_inner(frame, idx):
     inner = _unerase_list(frame[_FRAME_INNER_IDX])
     return inner[idx]
@@ -232,3 +298,26 @@ def write_inner(frame, idx, value):
 
 def get_inner_as_context(frame):
     return _unerase_list(frame[_FRAME_INNER_IDX])
+
+
+def get_or_create_inner_as_context(frame, num_args):
+    """num_args includes the receiver. Used when creating blocks,
+    for frames that were created without Inner."""
+    inner = _unerase_list(frame[_FRAME_INNER_IDX])
+    if inner is None:
+        inner = _copy_receiver_and_arguments(frame, num_args)
+        frame[_FRAME_INNER_IDX] = _erase_list(inner)
+    return inner
+
+
+@jit.unroll_safe
+def _copy_receiver_and_arguments(frame, num_args):
+    inner = [nilObject] * (FRAME_AND_INNER_RCVR_IDX + num_args)
+    make_sure_not_resized(inner)
+    inner[_INNER_ON_STACK_IDX] = trueObject
+
+    i = FRAME_AND_INNER_RCVR_IDX
+    while i < FRAME_AND_INNER_RCVR_IDX + num_args:
+        inner[i] = _unerase_obj(frame[i])
+        i += 1
+    return inner
@@ -1,4 +1,4 @@
-from som.interpreter.ast.frame import get_inner_as_context
+from som.interpreter.ast.frame import get_or_create_inner_as_context
 from som.vmobjects.block_ast import AstBlock
 from som.interpreter.ast.nodes.literal_node import LiteralNode
 
@@ -21,13 +21,20 @@ class BlockNode(LiteralNode):
 
 
 class BlockNodeWithContext(BlockNode):
-    def __init__(self, value, universe, source_section=None):
+    _immutable_fields_ = ["_outer_num_args"]
+
+    def __init__(self, value, universe, outer_num_args, source_section=None):
         BlockNode.__init__(self, value, universe, source_section)
+        # number of arguments of the enclosing method or block, incl. receiver
+        self._outer_num_args = outer_num_args
 
     def execute(self, frame):
-        return AstBlock(self._value, get_inner_as_context(frame))
+        return AstBlock(
+            self._value, get_or_create_inner_as_context(frame, self._outer_num_args)
+        )
 
     def handle_inlining(self, mgenc):
+        self._outer_num_args = mgenc.get_number_of_arguments()
         self._value.adapt_after_outer_inlined(1, mgenc)
 
     def handle_outer_inlined(self, removed_ctx_level, mgenc_with_inlined):
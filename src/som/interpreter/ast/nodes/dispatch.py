@@ -3,7 +3,6 @@ from som.vm.symbols import symbol_for
 
 from som.vmobjects.array import Array
 
-
 INLINE_CACHE_SIZE = 6
 
 
@@ -83,6 +82,9 @@ class CachedDispatchNode(_AbstractDispatchNode):
         _AbstractDispatchNode.__init__(self, rcvr_class, next_entry)
         self._cached_method = method
 
+    def get_method(self):
+        return self._cached_method
+
     def dispatch_1(self, rcvr):
         return self._cached_method.invoke_1(rcvr)
 
@@ -99,6 +101,16 @@ class CachedDispatchNode(_AbstractDispatchNode):
         return self._cached_method.invoke_n(stack, stack_ptr)
 
 
+class InlinedSendGuard(_AbstractDispatchNode):
+    """Guards a send, of which the bytecode interpreter inlined the method."""
+
+    _immutable_fields_ = ["number_of_arguments"]
+
+    def __init__(self, layout, number_of_arguments):
+        _AbstractDispatchNode.__init__(self, layout, None)
+        self.number_of_arguments = number_of_arguments
+
+
 class CachedDnuNode(_AbstractDispatchNode):
     _immutable_fields_ = ["_selector", "_cached_method"]
 
@@ -1,10 +1,43 @@
 from rtruffle.node import Node
 
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+
+
+class UnexpectedResultException(Exception):
+    """Raised by the typed execute methods if the result has not the
+    expected type. The result is already evaluated, and must not be
+    evaluated again."""
+
+    def __init__(self, result):  # pylint: disable=super-init-not-called
+        self.result = result
+
 
 class ExpressionNode(Node):
     def __init__(self, source_section):
         Node.__init__(self, source_section)
 
+    def has_unboxed_execution(self):
+        """True if execute_long() and execute_double() avoid boxing the result.
+        Otherwise, they unbox what execute() returns."""
+        return False
+
+    def execute_long(self, frame):
+        result = self.execute(frame)
+        if isinstance(result, Integer):
+            return result.get_embedded_integer()
+        raise UnexpectedResultException(result)
+
+    def execute_double(self, frame):
+        result = self.execute(frame)
+        if isinstance(result, Double):
+            return result.get_embedded_double()
+        raise UnexpectedResultException(result)
+
+    def execute_void(self, frame):
+        """Used when the result is not needed, which avoids boxing it."""
+        self.execute(frame)
+
     def create_trivial_method(self, _signature):
         return None
 
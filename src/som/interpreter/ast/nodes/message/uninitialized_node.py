@@ -6,6 +6,7 @@ from som.interpreter.ast.nodes.message.generic_node import (
     NArySend,
 )
 
+from som.interpreter.ast.nodes.specialized.arithmetic_node import ArithmeticNode
 from som.interpreter.ast.nodes.specialized.down_to_do_node import (
     IntDownToIntDoNode,
     IntDownToDoubleDoNode,
@@ -40,6 +41,7 @@ class UninitializedMessageNode(AbstractMessageNode):
                 IntDownToDoubleDoNode,
                 IfTrueIfFalseNode,
                 IfNode,
+                ArithmeticNode,
             ]:
                 if specialization.can_specialize(self._selector, rcvr, args, self):
                     return specialization.specialize_node(
@@ -3,12 +3,11 @@ from som.interpreter.ast.frame import (
     get_inner_as_context,
     read_frame,
     FRAME_AND_INNER_RCVR_IDX,
-    is_on_stack,
 )
 from som.interpreter.ast.nodes.contextual_node import ContextualNode
 from som.interpreter.ast.nodes.expression_node import ExpressionNode
 
-from som.interpreter.control_flow import ReturnException
+from som.interpreter.control_flow import ReturnException, LocalReturnException
 from som.interpreter.send import lookup_and_send_2
 
 
@@ -23,10 +22,7 @@ class ReturnLocalNode(ExpressionNode):
 
     def execute(self, frame):
         result = self._expr.execute(frame)
-        inner = get_inner_as_context(frame)
-
-        assert is_on_stack(inner)
-        raise ReturnException(result, inner)
+        raise LocalReturnException(result)
 
 
 class ReturnNonLocalNode(ContextualNode):
@@ -51,6 +47,7 @@ class ReturnNonLocalNode(ContextualNode):
     def handle_inlining(self, mgenc):
         self._context_level -= 1
         if self._context_level == 0:
+            mgenc.make_non_local_return_local()
             self.replace(
                 ReturnLocalNode(self._expr, self.universe, self.source_section)
             )
@@ -59,6 +56,7 @@ class ReturnNonLocalNode(ContextualNode):
     def handle_outer_inlined(self, removed_ctx_level, mgenc_with_inlined):
         self._context_level -= 1
         if self._context_level == 0:
+            mgenc_with_inlined.make_non_local_return_local()
             self.replace(
                 ReturnLocalNode(self._expr, self.universe, self.source_section)
             )
@@ -79,9 +77,29 @@ class CatchNonLocalReturnNode(ExpressionNode):
 
         try:
             return self._method_body.execute(frame)
+        except LocalReturnException as ex:
+            return ex.get_result()
         except ReturnException as ex:
             if not ex.has_reached_target(inner):
                 raise ex
             return ex.get_result()
         finally:
             mark_as_no_longer_on_stack(inner)
+
+
+class CatchLocalReturnNode(ExpressionNode):
+    """For methods that return out of inlined blocks, but do not need to
+    catch non-local returns. They do not need an on-stack marker."""
+
+    _immutable_fields_ = ["_method_body?"]
+    _child_nodes_ = ["_method_body"]
+
+    def __init__(self, method_body, source_section=None):
+        ExpressionNode.__init__(self, source_section)
+        self._method_body = self.adopt_child(method_body)
+
+    def execute(self, frame):
+        try:
+            return self._method_body.execute(frame)
+        except LocalReturnException as ex:
+            return ex.get_result()
@@ -16,10 +16,14 @@ class SequenceNode(ExpressionNode):
         self._execute_all_but_last(frame)
         return self._exprs[-1].execute(frame)
 
+    def execute_void(self, frame):
+        self._execute_all_but_last(frame)
+        self._exprs[-1].execute_void(frame)
+
     @unroll_safe
     def _execute_all_but_last(self, frame):
         for i in range(0, len(self._exprs) - 1):
-            self._exprs[i].execute(frame)
+            self._exprs[i].execute_void(frame)
 
     def create_trivial_method(self, signature):
         if len(self._exprs) != 2:
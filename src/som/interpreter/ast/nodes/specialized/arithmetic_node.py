@@ -0,0 +1,175 @@
+from rlib.arithmetic import ovfcheck
+
+from som.interpreter.ast.nodes.expression_node import (
+    ExpressionNode,
+    UnexpectedResultException,
+)
+from som.interpreter.ast.nodes.message.generic_node import BinarySend
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+
+_ADD = 0
+_SUBTRACT = 1
+_MULTIPLY = 2
+
+
+def _op_for(selector):
+    sel = selector.get_embedded_string()
+    if sel == "+":
+        return _ADD
+    if sel == "-":
+        return _SUBTRACT
+    if sel == "*":
+        return _MULTIPLY
+    return -1
+
+
+def _long_op(op, left, right):
+    # raises OverflowError when the result does not fit into a long
+    if op == _ADD:
+        return ovfcheck(left + right)
+    if op == _SUBTRACT:
+        return ovfcheck(left - right)
+    assert op == _MULTIPLY
+    return ovfcheck(left * right)
+
+
+def _double_op(op, left, right):
+    if op == _ADD:
+        return left + right
+    if op == _SUBTRACT:
+        return left - right
+    assert op == _MULTIPLY
+    return left * right
+
+
+def _integer_op(op, rcvr, arg):
+    assert isinstance(rcvr, Integer)
+    if op == _ADD:
+        return rcvr.prim_add(arg)
+    if op == _SUBTRACT:
+        return rcvr.prim_subtract(arg)
+    assert op == _MULTIPLY
+    return rcvr.prim_multiply(arg)
+
+
+def _double_prim_op(op, rcvr, arg):
+    assert isinstance(rcvr, Double)
+    if op == _ADD:
+        return rcvr.prim_add(arg)
+    if op == _SUBTRACT:
+        return rcvr.prim_subtract(arg)
+    assert op == _MULTIPLY
+    return rcvr.prim_multiply(arg)
+
+
+def _unbox_long(result):
+    if isinstance(result, Integer):
+        return result.get_embedded_integer()
+    raise UnexpectedResultException(result)
+
+
+def _unbox_double(result):
+    if isinstance(result, Double):
+        return result.get_embedded_double()
+    raise UnexpectedResultException(result)
+
+
+class ArithmeticNode(ExpressionNode):
+    """A send of +, - or * to a number. With execute_long() and
+    execute_double(), the result is not boxed, so that for instance
+    `sum := sum + x` updates an unboxed frame slot without allocating.
+    Any other receiver or argument turns the node into a normal send."""
+
+    _immutable_fields_ = ["_op", "_selector", "_rcvr_expr?", "_arg_expr?", "universe"]
+    _child_nodes_ = ["_rcvr_expr", "_arg_expr"]
+
+    def __init__(self, op, selector, universe, rcvr_expr, arg_expr, source_section):
+        ExpressionNode.__init__(self, source_section)
+        self._op = op
+        self._selector = selector
+        self.universe = universe
+        self._rcvr_expr = self.adopt_child(rcvr_expr)
+        self._arg_expr = self.adopt_child(arg_expr)
+
+    def execute(self, frame):
+        rcvr = self._rcvr_expr.execute(frame)
+        arg = self._arg_expr.execute(frame)
+        return self._execute_evaluated(rcvr, arg)
+
+    def execute_evaluated(self, _frame, rcvr, args):
+        return self._execute_evaluated(rcvr, args[0])
+
+    def _execute_evaluated(self, rcvr, arg):
+        if isinstance(arg, Integer) or isinstance(arg, Double):
+            if isinstance(rcvr, Integer):
+                return _integer_op(self._op, rcvr, arg)
+            if isinstance(rcvr, Double):
+                return _double_prim_op(self._op, rcvr, arg)
+        send = self.replace(
+            BinarySend(
+                self._selector,
+                self.universe,
+                self._rcvr_expr,
+                self._arg_expr,
+                self.source_section,
+            )
+        )
+        return send.exec_evaluated_2(rcvr, arg)
+
+    def has_unboxed_execution(self):
+        return True
+
+    def execute_long(self, frame):
+        try:
+            left = self._rcvr_expr.execute_long(frame)
+        except UnexpectedResultException as e:
+            arg = self._arg_expr.execute(frame)
+            return _unbox_long(self._execute_evaluated(e.result, arg))
+
+        try:
+            right = self._arg_expr.execute_long(frame)
+        except UnexpectedResultException as e:
+            return _unbox_long(self._execute_evaluated(Integer(left), e.result))
+
+        try:
+            return _long_op(self._op, left, right)
+        except OverflowError:
+            raise UnexpectedResultException(
+                _integer_op(self._op, Integer(left), Integer(right))
+            )
+
+    def execute_double(self, frame):
+        try:
+            left = self._rcvr_expr.execute_double(frame)
+        except UnexpectedResultException as e:
+            arg = self._arg_expr.execute(frame)
+            return _unbox_double(self._execute_evaluated(e.result, arg))
+
+        try:
+            right = self._arg_expr.execute_double(frame)
+        except UnexpectedResultException as e:
+            return _unbox_double(self._execute_evaluated(Double(left), e.result))
+
+        return _double_op(self._op, left, right)
+
+    @staticmethod
+    def can_specialize(selector, rcvr, args, _node):
+        return (
+            len(args) == 1
+            and (isinstance(rcvr, Integer) or isinstance(rcvr, Double))
+            and _op_for(selector) != -1
+        )
+
+    @staticmethod
+    def specialize_node(selector, _rcvr, _args, node):
+        return node.replace(
+            ArithmeticNode(
+                _op_for(selector),
+                selector,
+                node.universe,
+                node._rcvr_expr,  # pylint: disable=protected-access
+                node._arg_exprs[0],  # pylint: disable=protected-access
+                node.source_section,
+            )
+        )
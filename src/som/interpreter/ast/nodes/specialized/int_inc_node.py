@@ -1,4 +1,11 @@
-from som.interpreter.ast.nodes.expression_node import ExpressionNode
+from rlib.arithmetic import ovfcheck
+
+from som.interpreter.ast.nodes.expression_node import (
+    ExpressionNode,
+    UnexpectedResultException,
+)
+from som.interpreter.send import increment
+from som.vmobjects.integer import Integer
 
 
 class IntIncrementNode(ExpressionNode):
@@ -11,7 +18,27 @@ class IntIncrementNode(ExpressionNode):
 
     def execute(self, frame):
         result = self._rcvr_expr.execute(frame)
-        return result.prim_inc()
+        return increment(result)
+
+    def has_unboxed_execution(self):
+        return True
+
+    def execute_long(self, frame):
+        try:
+            value = self._rcvr_expr.execute_long(frame)
+        except UnexpectedResultException as e:
+            raise UnexpectedResultException(increment(e.result))
+        try:
+            return ovfcheck(value + 1)
+        except OverflowError:
+            raise UnexpectedResultException(Integer(value).prim_inc())
+
+    def execute_double(self, frame):
+        try:
+            value = self._rcvr_expr.execute_double(frame)
+        except UnexpectedResultException as e:
+            raise UnexpectedResultException(increment(e.result))
+        return value + 1.0
 
     def does_access_field(self, field_idx):
         from som.interpreter.ast.nodes.field_node import FieldReadNode
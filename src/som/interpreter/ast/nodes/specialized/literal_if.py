@@ -2,6 +2,17 @@ from som.interpreter.ast.nodes.expression_node import ExpressionNode
 from som.vm.globals import trueObject, falseObject, nilObject
 
 
+def _is_expected(result, expected_bool, not_expected_bool):
+    if result is expected_bool:
+        return True
+    if result is not_expected_bool:
+        return False
+    raise NotImplementedError(
+        "Would need to generalize, but we haven't implemented that "
+        + "for the bytecode interpreter either"
+    )
+
+
 class IfInlinedNode(ExpressionNode):
     _immutable_fields_ = [
         "_condition_expr?",
@@ -19,16 +30,18 @@ class IfInlinedNode(ExpressionNode):
         self._expected_bool = trueObject if if_true else falseObject
         self._not_expected_bool = falseObject if if_true else trueObject
 
-    def execute(self, frame):
+    def _evaluate_condition(self, frame):
         result = self._condition_expr.execute(frame)
-        if self._expected_bool is result:
+        return _is_expected(result, self._expected_bool, self._not_expected_bool)
+
+    def execute(self, frame):
+        if self._evaluate_condition(frame):
             return self._body_expr.execute(frame)
-        if result is self._not_expected_bool:
-            return nilObject
-        raise NotImplementedError(
-            "Would need to generalize, but we haven't implemented that "
-            + "for the bytecode interpreter either"
-        )
+        return nilObject
+
+    def execute_void(self, frame):
+        if self._evaluate_condition(frame):
+            self._body_expr.execute_void(frame)
 
 
 class IfNilInlinedNode(ExpressionNode):
@@ -93,14 +106,9 @@ class IfElseInlinedNode(ExpressionNode):
 
     def execute(self, frame):
         result = self._condition_expr.execute(frame)
-        if self._expected_bool is result:
+        if _is_expected(result, self._expected_bool, self._not_expected_bool):
             return self._true_expr.execute(frame)
-        if result is self._not_expected_bool:
-            return self._false_expr.execute(frame)
-        raise NotImplementedError(
-            "Would need to generalize, but we haven't implemented that "
-            + "for the bytecode interpreter either"
-        )
+        return self._false_expr.execute(frame)
 
 
 class IfNilNotNilInlinedNode(ExpressionNode):
@@ -40,7 +40,7 @@ class WhileInlinedNode(ExpressionNode):
 
             cond = self._condition_expr.execute(frame)
             if cond is self._expected_bool:
-                self._body_expr.execute(frame)
+                self._body_expr.execute_void(frame)
             elif cond is self._not_expected_bool:
                 return nilObject
             else:
@@ -1,14 +1,24 @@
 from som.interpreter.ast.frame import (
     read_frame,
+    read_frame_boxed,
     read_inner,
     write_inner,
     write_frame,
+    write_frame_long,
+    write_frame_double,
+    LongSlot,
+    DoubleSlot,
     FRAME_AND_INNER_RCVR_IDX,
 )
 from som.vmobjects.block_ast import AstBlock
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
 
 from som.interpreter.ast.nodes.contextual_node import ContextualNode
-from som.interpreter.ast.nodes.expression_node import ExpressionNode
+from som.interpreter.ast.nodes.expression_node import (
+    ExpressionNode,
+    UnexpectedResultException,
+)
 
 
 class UninitializedReadNode(ExpressionNode):
@@ -205,3 +215,146 @@ class LocalFrameVarWriteNode(_LocalVariableWriteNode):
         val = self._expr.execute(frame)
         write_frame(frame, self._frame_idx, val)
         return val
+
+
+SLOT_UNINITIALIZED = 0
+SLOT_LONG = 1
+SLOT_DOUBLE = 2
+SLOT_OBJECT = 3
+
+
+class FrameSlotType(object):
+    """The type speculated for a local variable in the frame, shared by all
+    activations of a method. Like the storage locations of an object layout,
+    it only gets more general: uninitialized -> long or double -> object."""
+
+    _immutable_fields_ = ["kind?"]
+
+    def __init__(self):
+        self.kind = SLOT_UNINITIALIZED
+
+    def generalize_for(self, value):
+        if isinstance(value, Integer):
+            kind = SLOT_LONG
+        elif isinstance(value, Double):
+            kind = SLOT_DOUBLE
+        else:
+            kind = SLOT_OBJECT
+
+        if self.kind == SLOT_UNINITIALIZED:
+            self.kind = kind
+        elif self.kind != kind:
+            self.kind = SLOT_OBJECT
+
+
+def create_local_frame_write_node(slot_type, frame_idx, expr, source_section):
+    kind = slot_type.kind
+    if kind == SLOT_UNINITIALIZED:
+        return UninitializedLocalFrameWriteNode(
+            slot_type, frame_idx, expr, source_section
+        )
+    if kind == SLOT_LONG:
+        return LocalFrameLongWriteNode(slot_type, frame_idx, expr, source_section)
+    if kind == SLOT_DOUBLE:
+        return LocalFrameDoubleWriteNode(slot_type, frame_idx, expr, source_section)
+    return LocalFrameVarWriteNode(frame_idx, expr, source_section)
+
+
+class LocalFrameSlotReadNode(LocalFrameVarReadNode):
+    """Reads a local variable, which may be stored unboxed."""
+
+    def execute(self, frame):
+        return read_frame_boxed(frame, self._frame_idx)
+
+    def execute_long(self, frame):
+        value = read_frame(frame, self._frame_idx)
+        if isinstance(value, LongSlot):
+            return value.value
+        if isinstance(value, Integer):
+            return value.get_embedded_integer()
+        raise UnexpectedResultException(read_frame_boxed(frame, self._frame_idx))
+
+    def execute_double(self, frame):
+        value = read_frame(frame, self._frame_idx)
+        if isinstance(value, DoubleSlot):
+            return value.value
+        if isinstance(value, Double):
+            return value.get_embedded_double()
+        raise UnexpectedResultException(read_frame_boxed(frame, self._frame_idx))
+
+
+class _LocalFrameSlotWriteNode(_LocalVariableWriteNode):
+    _immutable_fields_ = ["_slot_type"]
+
+    def __init__(self, slot_type, frame_idx, expr, source_section):
+        _LocalVariableWriteNode.__init__(self, frame_idx, expr, source_section)
+        self._slot_type = slot_type
+
+    def _respecialize(self):
+        return self.replace(
+            create_local_frame_write_node(
+                self._slot_type, self._frame_idx, self._expr, self.source_section
+            )
+        )
+
+    def _generalize_and_write(self, frame, value):
+        self._slot_type.generalize_for(value)
+        self._respecialize()
+        write_frame(frame, self._frame_idx, value)
+        return value
+
+
+class UninitializedLocalFrameWriteNode(_LocalFrameSlotWriteNode):
+    def execute(self, frame):
+        value = self._expr.execute(frame)
+        return self._generalize_and_write(frame, value)
+
+
+class LocalFrameLongWriteNode(_LocalFrameSlotWriteNode):
+    def execute(self, frame):
+        if self._slot_type.kind != SLOT_LONG:
+            return self._respecialize().execute(frame)
+        value = self._expr.execute(frame)
+        if not isinstance(value, Integer):
+            return self._generalize_and_write(frame, value)
+        write_frame_long(frame, self._frame_idx, value.get_embedded_integer(), value)
+        return value
+
+    def execute_void(self, frame):
+        if self._slot_type.kind != SLOT_LONG:
+            self._respecialize().execute_void(frame)
+            return
+        if not self._expr.has_unboxed_execution():
+            self.execute(frame)
+            return
+        try:
+            value = self._expr.execute_long(frame)
+        except UnexpectedResultException as e:
+            self._generalize_and_write(frame, e.result)
+            return
+        write_frame_long(frame, self._frame_idx, value, None)
+
+
+class LocalFrameDoubleWriteNode(_LocalFrameSlotWriteNode):
+    def execute(self, frame):
+        if self._slot_type.kind != SLOT_DOUBLE:
+            return self._respecialize().execute(frame)
+        value = self._expr.execute(frame)
+        if not isinstance(value, Double):
+            return self._generalize_and_write(frame, value)
+        write_frame_double(frame, self._frame_idx, value.get_embedded_double(), value)
+        return value
+
+    def execute_void(self, frame):
+        if self._slot_type.kind != SLOT_DOUBLE:
+            self._respecialize().execute_void(frame)
+            return
+        if not self._expr.has_unboxed_execution():
+            self.execute(frame)
+            return
+        try:
+            value = self._expr.execute_double(frame)
+        except UnexpectedResultException as e:
+            self._generalize_and_write(frame, e.result)
+            return
+        write_frame_double(frame, self._frame_idx, value, None)
@@ -9,8 +9,9 @@ class Bytecodes(object):
     # Bytecodes used by the Simple Object Machine (SOM)
     halt = 0
     dup = halt + 1
+    dup_second = dup + 1
 
-    push_frame = dup + 1
+    push_frame = dup_second + 1
     push_frame_0 = push_frame + 1
     push_frame_1 = push_frame_0 + 1
     push_frame_2 = push_frame_1 + 1
@@ -35,8 +36,9 @@ class Bytecodes(object):
     push_0 = push_constant_2 + 1
     push_1 = push_0 + 1
     push_nil = push_1 + 1
+    push_literal_array = push_nil + 1
 
-    push_global = push_nil + 1
+    push_global = push_literal_array + 1
 
     pop = push_global + 1
 
@@ -60,8 +62,9 @@ class Bytecodes(object):
     send_n = send_3 + 1
 
     super_send = send_n + 1
+    tail_send = super_send + 1
 
-    return_local = super_send + 1
+    return_local = tail_send + 1
     return_non_local = return_local + 1
     return_self = return_non_local + 1
 
@@ -84,7 +87,9 @@ class Bytecodes(object):
     jump_on_nil_top_top = jump_on_not_nil_top_top + 1
     jump_on_not_nil_pop = jump_on_nil_top_top + 1
     jump_on_nil_pop = jump_on_not_nil_pop + 1
-    jump_backward = jump_on_nil_pop + 1
+    jump_if_greater = jump_on_nil_pop + 1
+    jump_if_less = jump_if_greater + 1
+    jump_backward = jump_if_less + 1
     jump2 = jump_backward + 1
     jump2_on_true_top_nil = jump2 + 1
     jump2_on_false_top_nil = jump2_on_true_top_nil + 1
@@ -94,14 +99,18 @@ class Bytecodes(object):
     jump2_on_nil_top_top = jump2_on_not_nil_top_top + 1
     jump2_on_not_nil_pop = jump2_on_nil_top_top + 1
     jump2_on_nil_pop = jump2_on_not_nil_pop + 1
-    jump2_backward = jump2_on_nil_pop + 1
+    jump2_if_greater = jump2_on_nil_pop + 1
+    jump2_if_less = jump2_if_greater + 1
+    jump2_backward = jump2_if_less + 1
 
     q_super_send_1 = jump2_backward + 1
     q_super_send_2 = q_super_send_1 + 1
     q_super_send_3 = q_super_send_2 + 1
     q_super_send_n = q_super_send_3 + 1
 
-    push_local = q_super_send_n + 1
+    q_inlined_send_guard = q_super_send_n + 1
+
+    push_local = q_inlined_send_guard + 1
     push_argument = push_local + 1
     pop_local = push_argument + 1
     pop_argument = pop_local + 1
@@ -166,6 +175,8 @@ JUMP_BYTECODES = [
     Bytecodes.jump_on_nil_top_top,
     Bytecodes.jump_on_not_nil_pop,
     Bytecodes.jump_on_nil_pop,
+    Bytecodes.jump_if_greater,
+    Bytecodes.jump_if_less,
     Bytecodes.jump_backward,
     Bytecodes.jump2,
     Bytecodes.jump2_on_true_top_nil,
@@ -176,6 +187,8 @@ JUMP_BYTECODES = [
     Bytecodes.jump2_on_nil_top_top,
     Bytecodes.jump2_on_not_nil_pop,
     Bytecodes.jump2_on_nil_pop,
+    Bytecodes.jump2_if_greater,
+    Bytecodes.jump2_if_less,
     Bytecodes.jump2_backward,
 ]
 
@@ -201,6 +214,7 @@ RUN_TIME_ONLY_BYTECODES = [
     Bytecodes.q_super_send_2,
     Bytecodes.q_super_send_3,
     Bytecodes.q_super_send_n,
+    Bytecodes.q_inlined_send_guard,
 ]
 
 # These Bytecodes imply a context level of 0
@@ -212,6 +226,7 @@ NOT_EXPECTED_IN_BLOCK_BYTECODES = [
     Bytecodes.push_field_1,
     Bytecodes.pop_field_0,
     Bytecodes.pop_field_1,
+    Bytecodes.tail_send,
     Bytecodes.return_self,
     Bytecodes.return_field_0,
     Bytecodes.return_field_1,
@@ -221,6 +236,7 @@ NOT_EXPECTED_IN_BLOCK_BYTECODES = [
 _BYTECODE_LENGTH = [
     LEN_NO_ARGS,  # halt
     LEN_NO_ARGS,  # dup
+    LEN_NO_ARGS,  # dup_second
     LEN_TWO_ARGS,  # push_frame
     LEN_TWO_ARGS,  # push_frame_0
     LEN_TWO_ARGS,  # push_frame_1
@@ -241,6 +257,7 @@ _BYTECODE_LENGTH = [
     LEN_NO_ARGS,  # push_0
     LEN_NO_ARGS,  # push_1
     LEN_NO_ARGS,  # push_nil
+    LEN_ONE_ARG,  # push_literal_array
     LEN_ONE_ARG,  # push_global
     LEN_NO_ARGS,  # pop
     LEN_TWO_ARGS,  # pop_frame
@@ -259,6 +276,7 @@ _BYTECODE_LENGTH = [
     LEN_ONE_ARG,  # send_3
     LEN_ONE_ARG,  # send_n
     LEN_ONE_ARG,  # super_send
+    LEN_ONE_ARG,  # tail_send
     LEN_NO_ARGS,  # return_local
     LEN_ONE_ARG,  # return_non_local
     LEN_NO_ARGS,  # return_self
@@ -278,6 +296,8 @@ _BYTECODE_LENGTH = [
     LEN_TWO_ARGS,  # jump_on_nil_top_top,
     LEN_TWO_ARGS,  # jump_on_not_nil_pop,
     LEN_TWO_ARGS,  # jump_on_nil_pop,
+    LEN_TWO_ARGS,  # jump_if_greater
+    LEN_TWO_ARGS,  # jump_if_less
     LEN_TWO_ARGS,  # jump_backward
     LEN_TWO_ARGS,  # jump2
     LEN_TWO_ARGS,  # jump2_on_true_top_nil
@@ -288,11 +308,14 @@ _BYTECODE_LENGTH = [
     LEN_TWO_ARGS,  # jump2_on_nil_top_top,
     LEN_TWO_ARGS,  # jump2_on_not_nil_pop,
     LEN_TWO_ARGS,  # jump2_on_nil_pop,
+    LEN_TWO_ARGS,  # jump2_if_greater
+    LEN_TWO_ARGS,  # jump2_if_less
     LEN_TWO_ARGS,  # jump2_backward
     LEN_ONE_ARG,  # q_super_send_1
     LEN_ONE_ARG,  # q_super_send_2
     LEN_ONE_ARG,  # q_super_send_3
     LEN_ONE_ARG,  # q_super_send_n
+    LEN_TWO_ARGS,  # q_inlined_send_guard
     # rewritten on first use
     LEN_TWO_ARGS,  # push_local
     LEN_TWO_ARGS,  # push_argument
@@ -128,6 +128,22 @@ def create_frame_3(
     return frame
 
 
+@jit.unroll_safe
+def reuse_frame_for_tail_call(frame, size_frame, stack, stack_ptr, num_args):
+    """Moves receiver and arguments of a self tail call from the stack into
+    the frame, and resets the locals to nil. The frame is expected to not have
+    an Inner, except for one created on demand for a block, which stays with
+    that block."""
+    receiver = stack[stack_ptr - (num_args - 1)]
+
+    frame[0] = _erase_list(None)
+    frame[FRAME_AND_INNER_RCVR_IDX] = _erase_obj(receiver)
+    _set_arguments_without_inner(frame, stack, stack_ptr, num_args - 1)
+
+    for i in range(FRAME_AND_INNER_RCVR_IDX + num_args, size_frame):
+        frame[i] = _erase_obj(nilObject)
+
+
 @jit.unroll_safe
 def _set_arguments_without_inner(
     frame, prev_stack, prev_stack_ptr, num_args_without_rcvr
@@ -4,12 +4,13 @@ from som.interpreter.ast.frame import (
     write_inner,
     read_inner,
     FRAME_AND_INNER_RCVR_IDX,
-    get_inner_as_context,
+    get_or_create_inner_as_context,
 )
 from som.interpreter.ast.nodes.dispatch import (
     CachedDispatchNode,
     INLINE_CACHE_SIZE,
     GenericDispatchNode,
+    InlinedSendGuard,
 )
 from som.interpreter.bc.bytecodes import (
     LEN_NO_ARGS,
@@ -21,16 +22,20 @@ from som.interpreter.bc.bytecodes import (
 from som.interpreter.bc.frame import (
     get_block_at,
     get_self_dynamically,
+    reuse_frame_for_tail_call,
 )
+from som.interpreter.bc.stackless import Continuation, is_stackless_enabled
 from som.interpreter.control_flow import ReturnException
 from som.interpreter.send import (
+    decrement,
+    increment,
     lookup_and_send_2,
     lookup_and_send_3,
 )
 from som.vm.globals import nilObject, trueObject, falseObject
 from som.vmobjects.array import Array
 from som.vmobjects.block_bc import BcBlock
-from som.vmobjects.integer import int_0, int_1
+from som.vmobjects.integer import Integer, int_0, int_1
 
 from rlib import jit
 from rlib.jit import promote, elidable_promote, we_are_jitted
@@ -121,6 +126,7 @@ def interpret(method, frame, max_stack_size):
 
     stack_ptr = -1
     stack = [None] * max_stack_size
+    caller = None
 
     while True:
         jitdriver.jit_merge_point(
@@ -129,6 +135,7 @@ def interpret(method, frame, max_stack_size):
             method=method,
             frame=frame,
             stack=stack,
+            caller=caller,
         )
 
         bytecode = method.get_bytecode(current_bc_idx)
@@ -145,6 +152,12 @@ def interpret(method, frame, max_stack_size):
             stack[stack_ptr] = val
             current_bc_idx += LEN_NO_ARGS
 
+        elif bytecode == Bytecodes.dup_second:
+            val = stack[stack_ptr - 1]
+            stack_ptr += 1
+            stack[stack_ptr] = val
+            current_bc_idx += LEN_NO_ARGS
+
         elif bytecode == Bytecodes.push_frame:
             stack_ptr += 1
             stack[stack_ptr] = read_frame(
@@ -217,7 +230,10 @@ def interpret(method, frame, max_stack_size):
         elif bytecode == Bytecodes.push_block:
             block_method = method.get_constant(current_bc_idx)
             stack_ptr += 1
-            stack[stack_ptr] = BcBlock(block_method, get_inner_as_context(frame))
+            stack[stack_ptr] = BcBlock(
+                block_method,
+                get_or_create_inner_as_context(frame, method.get_number_of_arguments()),
+            )
             current_bc_idx += LEN_ONE_ARG
 
         elif bytecode == Bytecodes.push_block_no_ctx:
@@ -261,6 +277,13 @@ def interpret(method, frame, max_stack_size):
             stack[stack_ptr] = nilObject
             current_bc_idx += LEN_NO_ARGS
 
+        elif bytecode == Bytecodes.push_literal_array:
+            literal_array = method.get_constant(current_bc_idx)
+            assert isinstance(literal_array, Array)
+            stack_ptr += 1
+            stack[stack_ptr] = literal_array.copy_on_write()
+            current_bc_idx += LEN_ONE_ARG
+
         elif bytecode == Bytecodes.push_global:
             global_name = method.get_constant(current_bc_idx)
             glob = current_universe.get_global(global_name)
@@ -400,6 +423,21 @@ def interpret(method, frame, max_stack_size):
                     receiver, method, current_bc_idx, current_universe
                 )
 
+            if _is_activated_in_loop(dispatch_node):
+                method, frame, stack, caller = _activate_in_loop(
+                    dispatch_node,
+                    method,
+                    frame,
+                    stack,
+                    stack_ptr,
+                    1,
+                    current_bc_idx + LEN_ONE_ARG,
+                    caller,
+                )
+                stack_ptr = -1
+                current_bc_idx = 0
+                continue
+
             stack[stack_ptr] = dispatch_node.dispatch_1(receiver)
             current_bc_idx += LEN_ONE_ARG
 
@@ -414,6 +452,21 @@ def interpret(method, frame, max_stack_size):
                     receiver, method, current_bc_idx, current_universe
                 )
 
+            if _is_activated_in_loop(dispatch_node):
+                method, frame, stack, caller = _activate_in_loop(
+                    dispatch_node,
+                    method,
+                    frame,
+                    stack,
+                    stack_ptr,
+                    2,
+                    current_bc_idx + LEN_ONE_ARG,
+                    caller,
+                )
+                stack_ptr = -1
+                current_bc_idx = 0
+                continue
+
             arg = stack[stack_ptr]
             if we_are_jitted():
                 stack[stack_ptr] = None
@@ -433,6 +486,21 @@ def interpret(method, frame, max_stack_size):
                     receiver, method, current_bc_idx, current_universe
                 )
 
+            if _is_activated_in_loop(dispatch_node):
+                method, frame, stack, caller = _activate_in_loop(
+                    dispatch_node,
+                    method,
+                    frame,
+                    stack,
+                    stack_ptr,
+                    3,
+                    current_bc_idx + LEN_ONE_ARG,
+                    caller,
+                )
+                stack_ptr = -1
+                current_bc_idx = 0
+                continue
+
             arg2 = stack[stack_ptr]
             arg1 = stack[stack_ptr - 1]
             if we_are_jitted():
@@ -445,9 +513,8 @@ def interpret(method, frame, max_stack_size):
 
         elif bytecode == Bytecodes.send_n:
             signature = method.get_constant(current_bc_idx)
-            receiver = stack[
-                stack_ptr - (signature.get_number_of_signature_arguments() - 1)
-            ]
+            num_args = signature.get_number_of_signature_arguments()
+            receiver = stack[stack_ptr - (num_args - 1)]
 
             layout = receiver.get_object_layout(current_universe)
             dispatch_node = _lookup(layout, method, current_bc_idx, current_universe)
@@ -457,6 +524,21 @@ def interpret(method, frame, max_stack_size):
                     receiver, method, current_bc_idx, current_universe
                 )
 
+            if _is_activated_in_loop(dispatch_node):
+                method, frame, stack, caller = _activate_in_loop(
+                    dispatch_node,
+                    method,
+                    frame,
+                    stack,
+                    stack_ptr,
+                    num_args,
+                    current_bc_idx + LEN_ONE_ARG,
+                    caller,
+                )
+                stack_ptr = -1
+                current_bc_idx = 0
+                continue
+
             stack_ptr = dispatch_node.dispatch_n_bc(stack, stack_ptr, receiver)
             current_bc_idx += LEN_ONE_ARG
 
@@ -464,8 +546,63 @@ def interpret(method, frame, max_stack_size):
             stack_ptr = _do_super_send(current_bc_idx, method, stack, stack_ptr)
             current_bc_idx += LEN_ONE_ARG
 
+        elif bytecode == Bytecodes.tail_send:
+            signature = method.get_constant(current_bc_idx)
+            num_args = signature.get_number_of_signature_arguments()
+            receiver = stack[stack_ptr - (num_args - 1)]
+
+            layout = receiver.get_object_layout(current_universe)
+            dispatch_node = _lookup(layout, method, current_bc_idx, current_universe)
+
+            if not layout.is_latest:
+                _update_object_and_invalidate_old_caches(
+                    receiver, method, current_bc_idx, current_universe
+                )
+            elif _is_self_tail_call(dispatch_node, method):
+                reuse_frame_for_tail_call(
+                    frame, method.get_size_frame(), stack, stack_ptr, num_args
+                )
+                if we_are_jitted():
+                    _clear_stack(stack, stack_ptr)
+                stack_ptr = -1
+                current_bc_idx = 0
+                jitdriver.can_enter_jit(
+                    current_bc_idx=current_bc_idx,
+                    stack_ptr=stack_ptr,
+                    method=method,
+                    frame=frame,
+                    stack=stack,
+                    caller=caller,
+                )
+                continue
+
+            if _is_activated_in_loop(dispatch_node):
+                method, frame, stack, caller = _activate_in_loop(
+                    dispatch_node,
+                    method,
+                    frame,
+                    stack,
+                    stack_ptr,
+                    num_args,
+                    current_bc_idx + LEN_ONE_ARG,
+                    caller,
+                )
+                stack_ptr = -1
+                current_bc_idx = 0
+                continue
+
+            stack_ptr = _dispatch_tail_send(
+                dispatch_node, stack, stack_ptr, receiver, num_args
+            )
+            current_bc_idx += LEN_ONE_ARG
+
         elif bytecode == Bytecodes.return_local:
-            return stack[stack_ptr]
+            result = stack[stack_ptr]
+            if caller is None:
+                return result
+            method, frame, stack, stack_ptr, current_bc_idx, caller = _resume(
+                caller, result
+            )
 
         elif bytecode == Bytecodes.return_non_local:
             val = stack[stack_ptr]
@@ -474,52 +611,46 @@ def interpret(method, frame, max_stack_size):
             )
 
         elif bytecode == Bytecodes.return_self:
-            return read_frame(frame, FRAME_AND_INNER_RCVR_IDX)
+            result = read_frame(frame, FRAME_AND_INNER_RCVR_IDX)
+            if caller is None:
+                return result
+            method, frame, stack, stack_ptr, current_bc_idx, caller = _resume(
+                caller, result
+            )
 
         elif bytecode == Bytecodes.return_field_0:
             self_obj = read_frame(frame, FRAME_AND_INNER_RCVR_IDX)
-            return self_obj.get_field(0)
+            result = self_obj.get_field(0)
+            if caller is None:
+                return result
+            method, frame, stack, stack_ptr, current_bc_idx, caller = _resume(
+                caller, result
+            )
 
         elif bytecode == Bytecodes.return_field_1:
             self_obj = read_frame(frame, FRAME_AND_INNER_RCVR_IDX)
-            return self_obj.get_field(1)
+            result = self_obj.get_field(1)
+            if caller is None:
+                return result
+            method, frame, stack, stack_ptr, current_bc_idx, caller = _resume(
+                caller, result
+            )
 
         elif bytecode == Bytecodes.return_field_2:
             self_obj = read_frame(frame, FRAME_AND_INNER_RCVR_IDX)
-            return self_obj.get_field(2)
+            result = self_obj.get_field(2)
+            if caller is None:
+                return result
+            method, frame, stack, stack_ptr, current_bc_idx, caller = _resume(
+                caller, result
+            )
 
         elif bytecode == Bytecodes.inc:
-            val = stack[stack_ptr]
-            from som.vmobjects.integer import Integer
-            from som.vmobjects.double import Double
-            from som.vmobjects.biginteger import BigInteger
-
-            if isinstance(val, Integer):
-                result = val.prim_inc()
-            elif isinstance(val, Double):
-                result = val.prim_inc()
-            elif isinstance(val, BigInteger):
-                result = val.prim_inc()
-            else:
-                return _not_yet_implemented()
-            stack[stack_ptr] = result
+            stack[stack_ptr] = increment(stack[stack_ptr])
             current_bc_idx += LEN_NO_ARGS
 
         elif bytecode == Bytecodes.dec:
-            val = stack[stack_ptr]
-            from som.vmobjects.integer import Integer
-            from som.vmobjects.double import Double
-            from som.vmobjects.biginteger import BigInteger
-
-            if isinstance(val, Integer):
-                result = val.prim_dec()
-            elif isinstance(val, Double):
-                result = val.prim_dec()
-            elif isinstance(val, BigInteger):
-                result = val.prim_dec()
-            else:
-                return _not_yet_implemented()
-            stack[stack_ptr] = result
+            stack[stack_ptr] = decrement(stack[stack_ptr])
             current_bc_idx += LEN_NO_ARGS
 
         elif bytecode == Bytecodes.inc_field:
@@ -626,6 +757,18 @@ def interpret(method, frame, max_stack_size):
                 stack[stack_ptr] = None
             stack_ptr -= 1
 
+        elif bytecode == Bytecodes.jump_if_greater:
+            if _is_greater(stack[stack_ptr], stack[stack_ptr - 1]):
+                current_bc_idx += method.get_bytecode(current_bc_idx + 1)
+            else:
+                current_bc_idx += LEN_TWO_ARGS
+
+        elif bytecode == Bytecodes.jump_if_less:
+            if _is_less(stack[stack_ptr], stack[stack_ptr - 1]):
+                current_bc_idx += method.get_bytecode(current_bc_idx + 1)
+            else:
+                current_bc_idx += LEN_TWO_ARGS
+
         elif bytecode == Bytecodes.jump_backward:
             current_bc_idx -= method.get_bytecode(current_bc_idx + 1)
             jitdriver.can_enter_jit(
@@ -634,6 +777,7 @@ def interpret(method, frame, max_stack_size):
                 method=method,
                 frame=frame,
                 stack=stack,
+                caller=caller,
             )
 
         elif bytecode == Bytecodes.jump2:
@@ -740,6 +884,23 @@ def interpret(method, frame, max_stack_size):
             if we_are_jitted():
                 stack[stack_ptr] = None
             stack_ptr -= 1
+
+        elif bytecode == Bytecodes.jump2_if_greater:
+            if _is_greater(stack[stack_ptr], stack[stack_ptr - 1]):
+                current_bc_idx += method.get_bytecode(current_bc_idx + 1) + (
+                    method.get_bytecode(current_bc_idx + 2) << 8
+                )
+            else:
+                current_bc_idx += LEN_TWO_ARGS
+
+        elif bytecode == Bytecodes.jump2_if_less:
+            if _is_less(stack[stack_ptr], stack[stack_ptr - 1]):
+                current_bc_idx += method.get_bytecode(current_bc_idx + 1) + (
+                    method.get_bytecode(current_bc_idx + 2) << 8
+                )
+            else:
+                current_bc_idx += LEN_TWO_ARGS
+
         elif bytecode == Bytecodes.jump2_backward:
             current_bc_idx -= method.get_bytecode(current_bc_idx + 1) + (
                 method.get_bytecode(current_bc_idx + 2) << 8
@@ -750,8 +911,22 @@ def interpret(method, frame, max_stack_size):
                 method=method,
                 frame=frame,
                 stack=stack,
+                caller=caller,
             )
 
+        elif bytecode == Bytecodes.q_inlined_send_guard:
+            guard = method.get_inline_cache(current_bc_idx)
+            assert isinstance(guard, InlinedSendGuard)
+            receiver = stack[stack_ptr - (guard.number_of_arguments - 1)]
+            layout = receiver.get_object_layout(current_universe)
+            if layout is guard.expected_layout and layout.is_latest:
+                current_bc_idx += LEN_TWO_ARGS
+            else:
+                # jump to the normal send
+                current_bc_idx += method.get_bytecode(current_bc_idx + 1) + (
+                    method.get_bytecode(current_bc_idx + 2) << 8
+                )
+
         elif bytecode == Bytecodes.q_super_send_1:
             dispatch_node = method.get_inline_cache(current_bc_idx)
             stack[stack_ptr] = dispatch_node.dispatch_1(stack[stack_ptr])
@@ -798,6 +973,21 @@ def interpret(method, frame, max_stack_size):
             _unknown_bytecode(bytecode, current_bc_idx, method)
 
 
+def _is_greater(counter, limit):
+    """The exit test of inlined to:do: loops."""
+    if isinstance(counter, Integer) and isinstance(limit, Integer):
+        return counter.get_embedded_integer() > limit.get_embedded_integer()
+    # other kinds of numbers use the same test as Number>>#to:do:
+    return lookup_and_send_2(counter, limit, "<=") is falseObject
+
+
+def _is_less(counter, limit):
+    """The exit test of inlined downTo:do: loops."""
+    if isinstance(counter, Integer) and isinstance(limit, Integer):
+        return counter.get_embedded_integer() < limit.get_embedded_integer()
+    return lookup_and_send_2(counter, limit, ">=") is falseObject
+
+
 def _not_yet_implemented():
     raise Exception("Not yet implemented")
 
@@ -823,6 +1013,97 @@ def get_self(frame, ctx_level):
     return get_block_at(frame, ctx_level).get_from_outer(FRAME_AND_INNER_RCVR_IDX)
 
 
+def _is_activated_in_loop(dispatch_node):
+    from som.vmobjects.method_bc import BcMethod, BcMethodNLR
+
+    if not is_stackless_enabled():
+        return False
+    if not isinstance(dispatch_node, CachedDispatchNode):
+        return False
+    invokable = dispatch_node.get_method()
+    return isinstance(invokable, BcMethod) and not isinstance(invokable, BcMethodNLR)
+
+
+@jit.unroll_safe
+def _activate_in_loop(
+    dispatch_node, method, frame, stack, stack_ptr, num_args, next_bc_idx, caller
+):
+    from som.vmobjects.method_bc import BcMethod
+
+    invokable = dispatch_node.get_method()
+    assert isinstance(invokable, BcMethod)
+    callee, callee_frame = invokable.activate_from_stack(stack, stack_ptr)
+
+    if we_are_jitted():
+        for i in range(num_args - 1):
+            stack[stack_ptr - i] = None
+    continuation = Continuation(
+        method, frame, stack, stack_ptr - (num_args - 1), next_bc_idx, caller
+    )
+
+    callee_stack = [None] * callee.get_maximum_number_of_stack_elements()
+    return callee, callee_frame, callee_stack, continuation
+
+
+def _resume(continuation, result):
+    continuation.stack[continuation.stack_ptr] = result
+    return (
+        continuation.method,
+        continuation.frame,
+        continuation.stack,
+        continuation.stack_ptr,
+        continuation.bytecode_index,
+        continuation.caller,
+    )
+
+
+def _is_self_tail_call(dispatch_node, method):
+    from som.vmobjects.method_bc import BcAbstractMethod
+
+    if not isinstance(dispatch_node, CachedDispatchNode):
+        return False
+    invokable = dispatch_node.get_method()
+    return (
+        isinstance(invokable, BcAbstractMethod)
+        and invokable.runs_as(method)
+        and method.get_size_inner() == 0
+    )
+
+
+@jit.unroll_safe
+def _clear_stack(stack, stack_ptr):
+    for i in range(stack_ptr + 1):
+        stack[i] = None
+
+
+def _dispatch_tail_send(dispatch_node, stack, stack_ptr, receiver, num_args):
+    # a tail send that is not a self tail call is an ordinary send,
+    # and primitives only implement the invoke_* of their arity
+    if num_args == 1:
+        stack[stack_ptr] = dispatch_node.dispatch_1(receiver)
+        return stack_ptr
+
+    if num_args == 2:
+        arg = stack[stack_ptr]
+        if we_are_jitted():
+            stack[stack_ptr] = None
+        stack_ptr -= 1
+        stack[stack_ptr] = dispatch_node.dispatch_2(receiver, arg)
+        return stack_ptr
+
+    if num_args == 3:
+        arg2 = stack[stack_ptr]
+        arg1 = stack[stack_ptr - 1]
+        if we_are_jitted():
+            stack[stack_ptr] = None
+            stack[stack_ptr - 1] = None
+        stack_ptr -= 2
+        stack[stack_ptr] = dispatch_node.dispatch_3(receiver, arg1, arg2)
+        return stack_ptr
+
+    return dispatch_node.dispatch_n_bc(stack, stack_ptr, receiver)
+
+
 @elidable_promote("all")
 def _lookup(layout, method, bytecode_index, universe):
     cache = first = method.get_inline_cache(bytecode_index)
@@ -902,7 +1183,7 @@ def get_printable_location(bytecode_index, method):
 jitdriver = jit.JitDriver(
     name="Interpreter",
     greens=["current_bc_idx", "method"],
-    reds=["stack_ptr", "frame", "stack"],
+    reds=["stack_ptr", "frame", "stack", "caller"],
     # virtualizables=['frame'],
     get_printable_location=get_printable_location,
     # the next line is a workaround around a likely bug in RPython
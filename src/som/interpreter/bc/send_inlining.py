@@ -0,0 +1,464 @@
+from som.interpreter.ast.frame import FRAME_AND_INNER_RCVR_IDX
+from som.interpreter.ast.nodes.dispatch import CachedDispatchNode, InlinedSendGuard
+from som.interpreter.bc.bytecodes import (
+    Bytecodes,
+    bytecode_length,
+    is_one_of,
+    JUMP_BYTECODES,
+    FIRST_DOUBLE_BYTE_JUMP_BYTECODE,
+    NUM_SINGLE_BYTE_JUMP_BYTECODES,
+)
+
+# Feedback-directed inlining of monomorphic sends
+#
+# After a method was invoked INLINING_THRESHOLD times, the sends in it that
+# only ever saw a single receiver layout are candidates for inlining.
+# If the method found in the inline cache is small and simple enough,
+# a new version of the method is created, in which the send is replaced by:
+#
+#     q_inlined_send_guard -> fallback
+#     pop_frame of the arguments and the receiver into new frame slots
+#     push_nil, pop_frame for each local of the callee
+#     callee body, with its frame slots remapped and the final return removed
+#     jump -> done
+#   fallback:
+#     send_k
+#   done:
+#
+# The guard checks that the receiver still has the layout seen before.
+# The new version is used by all following invocations of the method.
+# Activations already on the stack continue with the old bytecode.
+
+# Number of invocations, after which a method is considered for inlining
+INLINING_THRESHOLD = 1000
+
+# Only methods with at most this many bytecodes are inlined
+MAX_INLINED_BYTECODES = 32
+
+_MAX_JUMP_OFFSET = 0xFFFF
+
+
+class _Config(object):
+    _immutable_fields_ = ["enabled?"]
+
+    def __init__(self):
+        self.enabled = False
+
+
+_config = _Config()
+
+
+def enable_send_inlining():
+    _config.enabled = True
+
+
+def is_send_inlining_enabled():
+    return _config.enabled
+
+
+class _CannotInline(Exception):
+    pass
+
+
+class _Instruction(object):
+    """A bytecode of the new version, before it is assembled.
+
+    Jumps refer to their target instruction. Until all instructions exist,
+    target_index is the bytecode index of the target in the original method."""
+
+    def __init__(self, bytecode, arg1, arg2):
+        self.bytecode = bytecode
+        self.arg1 = arg1
+        self.arg2 = arg2
+        self.cache = None
+        self.target = None
+        self.target_index = -1
+        self.position = 0
+
+    def length(self):
+        return bytecode_length(self.bytecode)
+
+
+def _is_jump(bytecode):
+    return is_one_of(bytecode, JUMP_BYTECODES)
+
+
+def _jump_target(method, bytecode_index):
+    bytecode = method.get_bytecode(bytecode_index)
+    offset = method.get_bytecode(bytecode_index + 1)
+    if bytecode >= FIRST_DOUBLE_BYTE_JUMP_BYTECODE:
+        offset += method.get_bytecode(bytecode_index + 2) << 8
+    if bytecode == Bytecodes.jump_backward or bytecode == Bytecodes.jump2_backward:
+        return bytecode_index - offset
+    return bytecode_index + offset
+
+
+def _as_single_byte_jump(bytecode):
+    if bytecode >= FIRST_DOUBLE_BYTE_JUMP_BYTECODE:
+        return bytecode - NUM_SINGLE_BYTE_JUMP_BYTECODES
+    return bytecode
+
+
+def _unquickened_send(bytecode):
+    if is_one_of(
+        bytecode,
+        [
+            Bytecodes.q_super_send_1,
+            Bytecodes.q_super_send_2,
+            Bytecodes.q_super_send_3,
+            Bytecodes.q_super_send_n,
+        ],
+    ):
+        return Bytecodes.super_send
+    return bytecode
+
+
+def _number_of_send_arguments(bytecode, selector):
+    if bytecode == Bytecodes.send_1:
+        return 1
+    if bytecode == Bytecodes.send_2:
+        return 2
+    if bytecode == Bytecodes.send_3:
+        return 3
+    return selector.get_number_of_signature_arguments()
+
+
+_SEND_BYTECODES = [
+    Bytecodes.send_1,
+    Bytecodes.send_2,
+    Bytecodes.send_3,
+    Bytecodes.send_n,
+]
+
+_FIXED_PUSH_FRAME = [
+    Bytecodes.push_frame_0,
+    Bytecodes.push_frame_1,
+    Bytecodes.push_frame_2,
+]
+
+_FIXED_POP_FRAME = [
+    Bytecodes.pop_frame_0,
+    Bytecodes.pop_frame_1,
+    Bytecodes.pop_frame_2,
+]
+
+_FIXED_PUSH_CONSTANT = [
+    Bytecodes.push_constant_0,
+    Bytecodes.push_constant_1,
+    Bytecodes.push_constant_2,
+]
+
+# Bytecodes, which do not depend on the frame, the receiver, or the literals
+_POSITION_INDEPENDENT_BYTECODES = [
+    Bytecodes.dup,
+    Bytecodes.dup_second,
+    Bytecodes.push_0,
+    Bytecodes.push_1,
+    Bytecodes.push_nil,
+    Bytecodes.pop,
+    Bytecodes.inc,
+    Bytecodes.dec,
+]
+
+
+def _is_inlinable_method(invokable):
+    """Field accesses, blocks, globals, and super sends refer to the receiver,
+    the outer context, or the holder of the method, and are not remapped.
+    Methods using them are not inlined."""
+    from som.vmobjects.method_bc import BcMethod, BcMethodNLR
+
+    if not isinstance(invokable, BcMethod) or isinstance(invokable, BcMethodNLR):
+        return False
+    if invokable.get_size_inner() > 0:
+        return False
+
+    num_bytecodes = invokable.get_number_of_bytecodes()
+    if num_bytecodes > MAX_INLINED_BYTECODES:
+        return False
+
+    i = 0
+    while i < num_bytecodes:
+        bytecode = invokable.get_bytecode(i)
+        length = bytecode_length(bytecode)
+        is_last = i + length == num_bytecodes
+
+        if bytecode == Bytecodes.return_local or bytecode == Bytecodes.return_self:
+            # other returns would leave the stack in an unknown state
+            if not is_last:
+                return False
+        elif is_one_of(
+            bytecode,
+            [
+                Bytecodes.push_argument,
+                Bytecodes.pop_argument,
+                Bytecodes.push_local,
+                Bytecodes.pop_local,
+            ],
+        ):
+            if invokable.get_bytecode(i + 2) != 0:
+                return False
+        elif not (
+            is_one_of(bytecode, _POSITION_INDEPENDENT_BYTECODES)
+            or is_one_of(bytecode, _SEND_BYTECODES)
+            or is_one_of(bytecode, _FIXED_PUSH_FRAME)
+            or is_one_of(bytecode, _FIXED_POP_FRAME)
+            or is_one_of(bytecode, _FIXED_PUSH_CONSTANT)
+            or bytecode == Bytecodes.push_frame
+            or bytecode == Bytecodes.pop_frame
+            or bytecode == Bytecodes.push_constant
+            or bytecode == Bytecodes.push_literal_array
+            or _is_jump(bytecode)
+        ):
+            return False
+        elif is_last:
+            return False
+        i += length
+    return True
+
+
+class _VersionBuilder(object):
+    def __init__(self, method):
+        self._method = method
+        self._instructions = []
+        self._literals = [
+            method.get_literal(i) for i in range(method.get_number_of_literals())
+        ]
+        self._size_frame = method.get_size_frame()
+        self._max_stack = method.get_maximum_number_of_stack_elements()
+        self._num_inlined = 0
+
+    def build(self):
+        method = self._method
+        num_bytecodes = method.get_number_of_bytecodes()
+        by_index = [None] * num_bytecodes
+        jumps = []
+
+        i = 0
+        while i < num_bytecodes:
+            bytecode = method.get_bytecode(i)
+            length = bytecode_length(bytecode)
+
+            instr = _Instruction(
+                _unquickened_send(bytecode),
+                self._arg(method, i, 1, length),
+                self._arg(method, i, 2, length),
+            )
+
+            first = None
+            if is_one_of(bytecode, _SEND_BYTECODES):
+                cache = self._monomorphic_cache(method, i)
+                if cache is not None:
+                    first = self._inline(method, i, cache, instr, jumps)
+
+            # jumps to the send need to go to the guard of the inlined code
+            by_index[i] = instr if first is None else first
+            self._instructions.append(instr)
+            if _is_jump(bytecode):
+                instr.target_index = _jump_target(method, i)
+                jumps.append(instr)
+            i += length
+
+        if self._num_inlined == 0:
+            return None
+
+        for jump in jumps:
+            target = by_index[jump.target_index]
+            assert target is not None
+            jump.target = target
+
+        return self._assemble()
+
+    @staticmethod
+    def _arg(method, bytecode_index, arg_idx, length):
+        if arg_idx < length:
+            return method.get_bytecode(bytecode_index + arg_idx)
+        return 0
+
+    @staticmethod
+    def _monomorphic_cache(method, bytecode_index):
+        cache = method.get_inline_cache(bytecode_index)
+        if not isinstance(cache, CachedDispatchNode) or cache.next_entry is not None:
+            return None
+        if cache.expected_layout is None or not cache.expected_layout.is_latest:
+            return None
+        callee = cache.get_method()
+        if callee is method or not _is_inlinable_method(callee):
+            return None
+        return cache
+
+    def _emit(self, bytecode, arg1=0, arg2=0):
+        instr = _Instruction(bytecode, arg1, arg2)
+        self._instructions.append(instr)
+        return instr
+
+    def _literal_index(self, callee, callee_idx, mapping):
+        idx = mapping.get(callee_idx, -1)
+        if idx == -1:
+            idx = len(self._literals)
+            if idx > 255:
+                raise _CannotInline()
+            self._literals.append(callee.get_literal(callee_idx))
+            mapping[callee_idx] = idx
+        return idx
+
+    def _inline(self, method, send_idx, cache, send, jumps):
+        """Emits the inlined callee before the send, which becomes the fallback.
+        Returns the guard, or None if the callee could not be inlined."""
+        callee = cache.get_method()
+        selector = method.get_constant(send_idx)
+        num_args = _number_of_send_arguments(send.bytecode, selector)
+
+        # callee slot s is mapped to base + s, the slot for the Inner is unused
+        base = self._size_frame - FRAME_AND_INNER_RCVR_IDX
+        size_frame = base + callee.get_size_frame()
+        if size_frame > 256:
+            return None
+
+        start = len(self._instructions)
+        num_literals = len(self._literals)
+
+        guard = self._emit(Bytecodes.q_inlined_send_guard)
+        guard.cache = InlinedSendGuard(cache.expected_layout, num_args)
+        guard.target = send
+
+        slot = FRAME_AND_INNER_RCVR_IDX + num_args - 1
+        while slot >= FRAME_AND_INNER_RCVR_IDX:
+            self._emit(Bytecodes.pop_frame, base + slot)
+            slot -= 1
+        for slot in range(FRAME_AND_INNER_RCVR_IDX + num_args, callee.get_size_frame()):
+            self._emit(Bytecodes.push_nil)
+            self._emit(Bytecodes.pop_frame, base + slot)
+
+        try:
+            jumps_to_end = self._inline_body(callee, base)
+        except _CannotInline:
+            del self._instructions[start:]
+            del self._literals[num_literals:]
+            return None
+
+        # the instruction after the send is not created yet
+        done = self._emit(Bytecodes.jump)
+        done.target_index = send_idx + bytecode_length(send.bytecode)
+        jumps.append(done)
+        for jump in jumps_to_end:
+            jump.target = done
+
+        self._size_frame = size_frame
+        self._max_stack += callee.get_maximum_number_of_stack_elements()
+        self._num_inlined += 1
+        return guard
+
+    def _inline_body(self, callee, base):
+        num_bytecodes = callee.get_number_of_bytecodes()
+        by_index = [None] * num_bytecodes
+        jumps = []
+        literals = {}
+
+        i = 0
+        while i < num_bytecodes:
+            bytecode = callee.get_bytecode(i)
+            length = bytecode_length(bytecode)
+
+            if bytecode == Bytecodes.return_self:
+                instr = self._emit(
+                    Bytecodes.push_frame, base + FRAME_AND_INNER_RCVR_IDX
+                )
+            elif bytecode == Bytecodes.return_local:
+                # the result is already on the stack, continue after the body
+                instr = None
+            elif is_one_of(bytecode, _FIXED_PUSH_FRAME):
+                slot = FRAME_AND_INNER_RCVR_IDX + bytecode - Bytecodes.push_frame_0
+                instr = self._emit(Bytecodes.push_frame, base + slot)
+            elif is_one_of(bytecode, _FIXED_POP_FRAME):
+                slot = FRAME_AND_INNER_RCVR_IDX + bytecode - Bytecodes.pop_frame_0
+                instr = self._emit(Bytecodes.pop_frame, base + slot)
+            elif bytecode == Bytecodes.push_frame or bytecode == Bytecodes.pop_frame:
+                instr = self._emit(bytecode, base + callee.get_bytecode(i + 1))
+            elif is_one_of(bytecode, [Bytecodes.push_argument, Bytecodes.push_local]):
+                var = callee.get_variable(i)
+                instr = self._emit(Bytecodes.push_frame, base + var.access_idx)
+            elif is_one_of(bytecode, [Bytecodes.pop_argument, Bytecodes.pop_local]):
+                var = callee.get_variable(i)
+                instr = self._emit(Bytecodes.pop_frame, base + var.access_idx)
+            elif is_one_of(bytecode, _FIXED_PUSH_CONSTANT):
+                callee_idx = bytecode - Bytecodes.push_constant_0
+                instr = self._emit(
+                    Bytecodes.push_constant,
+                    self._literal_index(callee, callee_idx, literals),
+                )
+            elif (
+                bytecode == Bytecodes.push_constant
+                or bytecode == Bytecodes.push_literal_array
+                or is_one_of(bytecode, _SEND_BYTECODES)
+            ):
+                instr = self._emit(
+                    bytecode,
+                    self._literal_index(callee, callee.get_bytecode(i + 1), literals),
+                )
+            elif _is_jump(bytecode):
+                instr = self._emit(bytecode)
+                instr.target_index = _jump_target(callee, i)
+                jumps.append(instr)
+            else:
+                assert is_one_of(bytecode, _POSITION_INDEPENDENT_BYTECODES)
+                instr = self._emit(bytecode)
+
+            by_index[i] = instr
+            i += length
+
+        # the final return_local is removed, jumps to it need to go to "done"
+        jumps_to_end = []
+        for jump in jumps:
+            target = by_index[jump.target_index]
+            if target is None:
+                jumps_to_end.append(jump)
+            else:
+                jump.target = target
+        return jumps_to_end
+
+    def _assemble(self):
+        position = 0
+        for instr in self._instructions:
+            instr.position = position
+            position += instr.length()
+
+        bytecodes = [0] * position
+        caches = [None] * position
+
+        for instr in self._instructions:
+            bytecode = instr.bytecode
+            arg1 = instr.arg1
+            arg2 = instr.arg2
+
+            if instr.target is not None:
+                offset = instr.target.position - instr.position
+                if offset < 0:
+                    offset = -offset
+                if offset > _MAX_JUMP_OFFSET:
+                    return None
+                arg1 = offset & 0xFF
+                arg2 = offset >> 8
+                if _is_jump(bytecode):
+                    bytecode = _as_single_byte_jump(bytecode)
+                    if offset > 0xFF:
+                        bytecode += NUM_SINGLE_BYTE_JUMP_BYTECODES
+                    else:
+                        arg2 = 0
+
+            bytecodes[instr.position] = bytecode
+            caches[instr.position] = instr.cache
+            length = instr.length()
+            if length > 1:
+                bytecodes[instr.position + 1] = arg1
+            if length > 2:
+                bytecodes[instr.position + 2] = arg2
+
+        return self._method.create_version(
+            bytecodes, caches, self._literals, self._size_frame, self._max_stack
+        )
+
+
+def create_version_with_inlined_sends(method):
+    """Returns a new version of the method with its monomorphic sends inlined,
+    or None if there is nothing to inline."""
+    return _VersionBuilder(method).build()
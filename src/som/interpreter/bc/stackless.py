@@ -0,0 +1,56 @@
+# Stackless execution of sends to bytecode methods
+#
+# Normally, each send is a call of invoke_*(), which starts a new interpreter
+# loop for the callee. Untranslated, this means the SOM call depth is limited
+# by the recursion limit of the host Python.
+#
+# In the stackless mode, sends that resolve to a plain BcMethod do not call
+# the method. Instead, the interpreter loop saves the state of the caller in
+# a Continuation and continues with the callee. When the callee returns,
+# the caller is restored from its Continuation, with the result on its stack.
+# The Continuations form a linked list of the activations of the loop,
+# which can also be walked to sample the stack.
+#
+# Primitives, blocks, and methods that catch non-local returns are invoked
+# as usual. A non-local return unwinds the Python stack, and with it the
+# Continuations of the loops it leaves, none of which catch it.
+
+
+class _Config(object):
+    _immutable_fields_ = ["enabled?"]
+
+    def __init__(self):
+        self.enabled = False
+
+
+_config = _Config()
+
+
+def enable_stackless():
+    _config.enabled = True
+
+
+def is_stackless_enabled():
+    return _config.enabled
+
+
+class Continuation(object):
+    """The state of a caller, while its callee runs in the same loop.
+    The result of the callee goes to stack[stack_ptr]."""
+
+    _immutable_fields_ = [
+        "method",
+        "frame",
+        "stack",
+        "stack_ptr",
+        "bytecode_index",
+        "caller",
+    ]
+
+    def __init__(self, method, frame, stack, stack_ptr, bytecode_index, caller):
+        self.method = method
+        self.frame = frame
+        self.stack = stack
+        self.stack_ptr = stack_ptr
+        self.bytecode_index = bytecode_index
+        self.caller = caller
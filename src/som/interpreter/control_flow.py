@@ -16,3 +16,19 @@ class ReturnException(Exception):
 
     def __str__(self):
         return "ReturnEx(%s)" % self._result
+
+
+class LocalReturnException(Exception):
+    """Returns from a method out of a block that was inlined into it.
+    It is caught by the same activation, and therefore needs no target."""
+
+    _immutable_fields_ = ["_result"]
+
+    def __init__(self, result):  # pylint: disable=super-init-not-called
+        self._result = result
+
+    def get_result(self):
+        return self._result
+
+    def __str__(self):
+        return "LocalReturnEx(%s)" % self._result
@@ -4,6 +4,7 @@ from som.interpreter.objectstorage.layout_transitions import (
     UninitializedStorageLocationException,
     GeneralizeStorageLocationException,
 )
+from som.interpreter.send import increment
 from som.vm.globals import nilObject
 
 from som.vmobjects.double import Double
@@ -174,7 +175,7 @@ def _make_object_direct_inc(field_idx):
     def inc_location(_node, obj):
         field_name = "_field" + str(field_idx)
         val = getattr(obj, field_name)
-        new_val = val.prim_inc()
+        new_val = increment(val)
         setattr(obj, field_name, new_val)
         return new_val
 
@@ -198,7 +199,7 @@ def _object_array_read(node, obj):
 
 def _object_array_inc(node, obj):
     val = obj.fields[node.access_idx]
-    new_val = val.prim_inc()
+    new_val = increment(val)
     obj.fields[node.access_idx] = new_val
     return new_val
 
@@ -1,4 +1,15 @@
 from som.vm.symbols import symbol_for
+from som.vmobjects.biginteger import BigInteger
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+
+
+def lookup_and_send_1(receiver, selector_string):
+    from som.vm.current import current_universe
+
+    selector = symbol_for(selector_string)
+    invokable = receiver.get_class(current_universe).lookup_invokable(selector)
+    return invokable.invoke_1(receiver)
 
 
 def lookup_and_send_2(receiver, arg, selector_string):
@@ -16,3 +27,25 @@ def lookup_and_send_3(receiver, arg1, arg2, selector_string):
     selector = symbol_for(selector_string)
     invokable = receiver.get_class(current_universe).lookup_invokable(selector)
     return invokable.invoke_3(receiver, arg1, arg2)
+
+
+def increment(receiver):
+    """Returns `receiver + 1`, which numbers compute without a send"""
+    if isinstance(receiver, Integer):
+        return receiver.prim_inc()
+    if isinstance(receiver, Double):
+        return receiver.prim_inc()
+    if isinstance(receiver, BigInteger):
+        return receiver.prim_inc()
+    return lookup_and_send_2(receiver, Integer(1), "+")
+
+
+def decrement(receiver):
+    """Returns `receiver - 1`, which numbers compute without a send"""
+    if isinstance(receiver, Integer):
+        return receiver.prim_dec()
+    if isinstance(receiver, Double):
+        return receiver.prim_dec()
+    if isinstance(receiver, BigInteger):
+        return receiver.prim_dec()
+    return lookup_and_send_2(receiver, Integer(1), "-")
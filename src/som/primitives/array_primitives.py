@@ -1,9 +1,16 @@
+from rlib.arithmetic import ovfcheck
 from rlib.jit import JitDriver
+from rlib.listsort import make_timsort_class
 
 from som.interp_type import is_ast_interpreter
+from som.interpreter.send import lookup_and_send_1, lookup_and_send_2
+from som.vm.globals import nilObject, trueObject
 from som.vmobjects.array import Array
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
 from som.vmobjects.primitive import UnaryPrimitive, BinaryPrimitive, TernaryPrimitive
 from som.vmobjects.method import AbstractMethod
+from som.vmobjects.string import String
 from som.primitives.primitives import Primitives
 
 
@@ -23,8 +30,6 @@ def _at_put(rcvr, index, value):
 
 
 def _length(rcvr):
-    from som.vmobjects.integer import Integer
-
     return Integer(rcvr.get_number_of_indexable_fields())
 
 
@@ -36,6 +41,62 @@ def _new(_rcvr, length):
     return Array.from_size(length.get_embedded_integer())
 
 
+def _copy_from_to(rcvr, start, end):
+    s = start.get_embedded_integer() - 1
+    e = end.get_embedded_integer()
+    if not rcvr.is_valid_range(s, e):
+        return String("Error - index out of bounds")
+    return rcvr.copy_range(s, e)
+
+
+def replace_from_to_with_starting_at(rcvr, start, end, source, source_start):
+    s = start.get_embedded_integer() - 1
+    e = end.get_embedded_integer()
+    src_s = source_start.get_embedded_integer() - 1
+
+    if not isinstance(source, Array):
+        return String("Error - source is not an Array")
+    if not rcvr.is_valid_range(s, e) or not source.is_valid_range(
+        src_s, src_s + (e - s)
+    ):
+        return String("Error - index out of bounds")
+
+    rcvr.replace_range(s, e, source, src_s)
+    return rcvr
+
+
+def _index_of(rcvr, value):
+    idx = rcvr.index_of(value)
+    if idx == -1:
+        return nilObject
+    return Integer(idx + 1)
+
+
+def _reverse(rcvr):
+    return rcvr.reverse()
+
+
+def _at_all_put(rcvr, indexes, value):
+    if not isinstance(indexes, Array):
+        return String("Error - indexes are not an Array")
+    if not rcvr.can_store(value):
+        return String("Error - value is not a byte")
+
+    size = rcvr.get_number_of_indexable_fields()
+    i = 0
+    num_indexes = indexes.get_number_of_indexable_fields()
+    while i < num_indexes:
+        idx = indexes.get_indexable_field(i)
+        if not isinstance(idx, Integer):
+            return String("Error - index is not an Integer")
+        j = idx.get_embedded_integer() - 1
+        if not 0 <= j < size:
+            return String("Error - index out of bounds")
+        rcvr.set_indexable_field(j, value)
+        i += 1
+    return rcvr
+
+
 def get_do_index_printable_location(block_method):
     assert isinstance(block_method, AbstractMethod)
     return "#doIndexes: %s" % block_method.merge_point_string()
@@ -50,8 +111,6 @@ do_index_driver = JitDriver(
 
 
 def _do_indexes(rcvr, block):
-    from som.vmobjects.integer import Integer
-
     block_method = block.get_method()
 
     i = 1
@@ -85,25 +144,740 @@ def _do(rcvr, block):
         i += 1
 
 
+def get_collect_long_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#collect: (long_strategy) %s" % block_method.merge_point_string()
+
+
+collect_long_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_collect_long_printable_location,
+)
+
+
+def get_collect_double_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#collect: (double_strategy) %s" % block_method.merge_point_string()
+
+
+collect_double_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_collect_double_printable_location,
+)
+
+
+def get_collect_obj_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#collect: (obj_strategy) %s" % block_method.merge_point_string()
+
+
+collect_obj_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_collect_obj_printable_location,
+)
+
+
+def get_select_long_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#select:/reject: (long_strategy) %s" % block_method.merge_point_string()
+
+
+select_long_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_select_long_printable_location,
+)
+
+
+def get_select_double_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#select:/reject: (double_strategy) %s" % block_method.merge_point_string()
+
+
+select_double_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_select_double_printable_location,
+)
+
+
+def get_select_obj_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#select:/reject: (obj_strategy) %s" % block_method.merge_point_string()
+
+
+select_obj_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_select_obj_printable_location,
+)
+
+
+def get_inject_into_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#inject:into: %s" % block_method.merge_point_string()
+
+
+inject_into_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_inject_into_printable_location,
+)
+
+
+def get_detect_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#detect:ifNone: %s" % block_method.merge_point_string()
+
+
+detect_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_detect_printable_location,
+)
+
+
+def _collect(rcvr, block):
+    size = rcvr.get_number_of_indexable_fields()
+    if size == 0:
+        return Array.from_size(0)
+
+    block_method = block.get_method()
+
+    # the first result determines the storage strategy, as for #putAll:
+    first = block_method.invoke_2(block, rcvr.get_indexable_field(0))
+    if isinstance(first, Integer):
+        long_store = [0] * size
+        long_store[0] = first.get_embedded_integer()
+        return _collect_remaining_as_long(rcvr, block, 1, long_store)
+    if isinstance(first, Double):
+        double_store = [0.0] * size
+        double_store[0] = first.get_embedded_double()
+        return _collect_remaining_as_double(rcvr, block, 1, double_store)
+
+    obj_store = [None] * size
+    obj_store[0] = first
+    return _collect_remaining_as_obj(rcvr, block, 1, obj_store)
+
+
+def _collect_remaining_as_long(rcvr, block, i, storage):
+    block_method = block.get_method()
+    size = len(storage)
+    while i < size:
+        collect_long_driver.jit_merge_point(block_method=block_method)
+        result = block_method.invoke_2(block, rcvr.get_indexable_field(i))
+        if not isinstance(result, Integer):
+            obj_store = [None] * size
+            for j in range(i):
+                obj_store[j] = Integer(storage[j])
+            obj_store[i] = result
+            return _collect_remaining_as_obj(rcvr, block, i + 1, obj_store)
+        storage[i] = result.get_embedded_integer()
+        i += 1
+    return Array.from_integers(storage)
+
+
+def _collect_remaining_as_double(rcvr, block, i, storage):
+    block_method = block.get_method()
+    size = len(storage)
+    while i < size:
+        collect_double_driver.jit_merge_point(block_method=block_method)
+        result = block_method.invoke_2(block, rcvr.get_indexable_field(i))
+        if not isinstance(result, Double):
+            obj_store = [None] * size
+            for j in range(i):
+                obj_store[j] = Double(storage[j])
+            obj_store[i] = result
+            return _collect_remaining_as_obj(rcvr, block, i + 1, obj_store)
+        storage[i] = result.get_embedded_double()
+        i += 1
+    return Array.from_doubles(storage)
+
+
+def _collect_remaining_as_obj(rcvr, block, i, storage):
+    block_method = block.get_method()
+    size = len(storage)
+    while i < size:
+        collect_obj_driver.jit_merge_point(block_method=block_method)
+        storage[i] = block_method.invoke_2(block, rcvr.get_indexable_field(i))
+        i += 1
+    # picks the bool or empty strategy where possible
+    return Array.from_values(storage)
+
+
+def _select_or_reject(rcvr, block, keep_if):
+    longs = rcvr.get_long_storage()
+    if longs is not None:
+        return _select_or_reject_longs(longs, block, keep_if)
+
+    doubles = rcvr.get_double_storage()
+    if doubles is not None:
+        return _select_or_reject_doubles(doubles, block, keep_if)
+
+    return _select_or_reject_objs(rcvr, block, keep_if)
+
+
+def _select_or_reject_longs(longs, block, keep_if):
+    block_method = block.get_method()
+    kept_longs = []
+    for value in longs:
+        select_long_driver.jit_merge_point(block_method=block_method)
+        result = block_method.invoke_2(block, Integer(value))
+        if (result is trueObject) == keep_if:
+            kept_longs.append(value)
+    return Array.from_integers(kept_longs)
+
+
+def _select_or_reject_doubles(doubles, block, keep_if):
+    block_method = block.get_method()
+    kept_doubles = []
+    for value in doubles:
+        select_double_driver.jit_merge_point(block_method=block_method)
+        result = block_method.invoke_2(block, Double(value))
+        if (result is trueObject) == keep_if:
+            kept_doubles.append(value)
+    return Array.from_doubles(kept_doubles)
+
+
+def _select_or_reject_objs(rcvr, block, keep_if):
+    block_method = block.get_method()
+    size = rcvr.get_number_of_indexable_fields()
+    kept = []
+    i = 0
+    while i < size:
+        select_obj_driver.jit_merge_point(block_method=block_method)
+        value = rcvr.get_indexable_field(i)
+        result = block_method.invoke_2(block, value)
+        if (result is trueObject) == keep_if:
+            kept.append(value)
+        i += 1
+    return Array.from_values(kept[:])
+
+
+def _select(rcvr, block):
+    return _select_or_reject(rcvr, block, True)
+
+
+def _reject(rcvr, block):
+    return _select_or_reject(rcvr, block, False)
+
+
+def _inject_into(rcvr, initial, block):
+    block_method = block.get_method()
+    size = rcvr.get_number_of_indexable_fields()
+
+    result = initial
+    i = 0
+    while i < size:
+        inject_into_driver.jit_merge_point(block_method=block_method)
+        result = block_method.invoke_3(block, result, rcvr.get_indexable_field(i))
+        i += 1
+    return result
+
+
+def _detect_if_none(rcvr, block, none_block):
+    block_method = block.get_method()
+    size = rcvr.get_number_of_indexable_fields()
+
+    i = 0
+    while i < size:
+        detect_driver.jit_merge_point(block_method=block_method)
+        value = rcvr.get_indexable_field(i)
+        if block_method.invoke_2(block, value) is trueObject:
+            return value
+        i += 1
+
+    if isinstance(none_block, _Block):
+        return none_block.get_method().invoke_1(none_block)
+    # like Collection>>#detect:ifNone:, which sends #value to the argument
+    return lookup_and_send_1(none_block, "value")
+
+
 def _put_all(rcvr, arg):
     if isinstance(arg, _Block):
-        rcvr.set_all_with_block(arg)
+        if rcvr.set_all_with_block(arg) is not None:
+            return String("Error - value is not a byte")
         return rcvr
 
     # It is a simple value, just put it into the array
+    if not rcvr.can_store(arg):
+        return String("Error - value is not a byte")
     rcvr.set_all(arg)
     return rcvr
 
 
+_ADD = 0
+_SUBTRACT = 1
+_MULTIPLY = 2
+_DIVIDE = 3
+_OP_SELECTORS = ["+", "-", "*", "/"]
+
+
+def _long_op(op, left, right):
+    # raises OverflowError or ZeroDivisionError when the result is not a long
+    if op == _ADD:
+        return ovfcheck(left + right)
+    if op == _SUBTRACT:
+        return ovfcheck(left - right)
+    if op == _MULTIPLY:
+        return ovfcheck(left * right)
+    assert op == _DIVIDE
+    if right == 0:
+        raise ZeroDivisionError()
+    return ovfcheck(left // right)
+
+
+def _double_op(op, left, right):
+    if op == _ADD:
+        return left + right
+    if op == _SUBTRACT:
+        return left - right
+    assert op == _MULTIPLY
+    return left * right
+
+
+def _as_doubles(arr):
+    """Returns the elements as floats if they are all Integers or Doubles"""
+    doubles = arr.get_double_storage()
+    if doubles is not None:
+        return doubles
+    longs = arr.get_long_storage()
+    if longs is not None:
+        return [float(v) for v in longs]
+    return None
+
+
+def _generic_element_wise(result, rcvr, arg, op, start):
+    # all results are computed before the first one is stored, so that an
+    # in-place operation does not leave the receiver partly updated
+    selector = _OP_SELECTORS[op]
+    size = rcvr.get_number_of_indexable_fields()
+    values = []
+    i = start
+    while i < size:
+        if isinstance(arg, Array):
+            right = arg.get_indexable_field(i)
+        else:
+            right = arg
+        value = lookup_and_send_2(rcvr.get_indexable_field(i), right, selector)
+        if not result.can_store(value):
+            return String("Error - value is not a byte")
+        values.append(value)
+        i += 1
+
+    i = start
+    for value in values:
+        result.set_indexable_field(i, value)
+        i += 1
+    return result
+
+
+def _has_zero_divisor(right, scalar):
+    if right is None:
+        return scalar == 0
+    for value in right:
+        if value == 0:
+            return True
+    return False
+
+
+def _long_element_wise(rcvr, left, arg, right, scalar, op, in_place):
+    if in_place and op == _DIVIDE and _has_zero_divisor(right, scalar):
+        # the fast path would already have written the elements before the
+        # zero divisor, so leave the whole operation to the Integer primitives
+        return _generic_element_wise(rcvr, rcvr, arg, op, 0)
+
+    size = len(left)
+    if in_place:
+        out = left
+    else:
+        out = [0] * size
+
+    i = 0
+    try:
+        while i < size:
+            if right is None:
+                out[i] = _long_op(op, left[i], scalar)
+            else:
+                out[i] = _long_op(op, left[i], right[i])
+            i += 1
+    except (OverflowError, ZeroDivisionError):
+        pass
+
+    if in_place:
+        result = rcvr
+    else:
+        result = Array.from_integers(out)
+
+    if i < size:
+        # let the Integer primitives handle the remaining elements
+        _generic_element_wise(result, rcvr, arg, op, i)
+    return result
+
+
+def _double_element_wise(rcvr, left, right, scalar, op, in_place):
+    size = len(left)
+    if in_place:
+        out = left
+    else:
+        out = [0.0] * size
+
+    i = 0
+    while i < size:
+        if right is None:
+            out[i] = _double_op(op, left[i], scalar)
+        else:
+            out[i] = _double_op(op, left[i], right[i])
+        i += 1
+
+    if in_place:
+        rcvr.set_double_storage(out)
+        return rcvr
+    return Array.from_doubles(out)
+
+
+def _element_wise(rcvr, arg, op, in_place):
+    if in_place:
+        rcvr.unshare_storage()
+
+    if isinstance(arg, Array):
+        size = rcvr.get_number_of_indexable_fields()
+        if arg.get_number_of_indexable_fields() != size:
+            return String("Error - arrays have different sizes")
+
+    left_longs = rcvr.get_long_storage()
+    if left_longs is not None:
+        if isinstance(arg, Integer):
+            return _long_element_wise(
+                rcvr, left_longs, arg, None, arg.get_embedded_integer(), op, in_place
+            )
+        if isinstance(arg, Array):
+            right_longs = arg.get_long_storage()
+            if right_longs is not None:
+                return _long_element_wise(
+                    rcvr, left_longs, arg, right_longs, 0, op, in_place
+                )
+
+    # Integer>>/ is an integer division, even with a Double argument,
+    # so division with Doubles is left to the per-element sends
+    left_doubles = None
+    if op != _DIVIDE:
+        left_doubles = _as_doubles(rcvr)
+    if left_doubles is not None:
+        if isinstance(arg, Double):
+            return _double_element_wise(
+                rcvr, left_doubles, None, arg.get_embedded_double(), op, in_place
+            )
+        if isinstance(arg, Integer):
+            return _double_element_wise(
+                rcvr,
+                left_doubles,
+                None,
+                float(arg.get_embedded_integer()),
+                op,
+                in_place,
+            )
+        if isinstance(arg, Array):
+            right_doubles = _as_doubles(arg)
+            if right_doubles is not None:
+                return _double_element_wise(
+                    rcvr, left_doubles, right_doubles, 0.0, op, in_place
+                )
+
+    if in_place:
+        result = rcvr
+    else:
+        result = Array.from_size(rcvr.get_number_of_indexable_fields())
+    return _generic_element_wise(result, rcvr, arg, op, 0)
+
+
+def _plus(rcvr, arg):
+    return _element_wise(rcvr, arg, _ADD, False)
+
+
+def _minus(rcvr, arg):
+    return _element_wise(rcvr, arg, _SUBTRACT, False)
+
+
+def _mult(rcvr, arg):
+    return _element_wise(rcvr, arg, _MULTIPLY, False)
+
+
+def _divide(rcvr, arg):
+    return _element_wise(rcvr, arg, _DIVIDE, False)
+
+
+def _add_in_place(rcvr, arg):
+    return _element_wise(rcvr, arg, _ADD, True)
+
+
+def _subtract_in_place(rcvr, arg):
+    return _element_wise(rcvr, arg, _SUBTRACT, True)
+
+
+def _multiply_in_place(rcvr, arg):
+    return _element_wise(rcvr, arg, _MULTIPLY, True)
+
+
+def _divide_in_place(rcvr, arg):
+    return _element_wise(rcvr, arg, _DIVIDE, True)
+
+
+def _generic_sum(rcvr, start):
+    i = start
+    total = Integer(0)
+    size = rcvr.get_number_of_indexable_fields()
+    while i < size:
+        total = lookup_and_send_2(total, rcvr.get_indexable_field(i), "+")
+        i += 1
+    return total
+
+
+def _sum(rcvr):
+    longs = rcvr.get_long_storage()
+    if longs is not None:
+        total = 0
+        try:
+            for v in longs:
+                total = ovfcheck(total + v)
+            return Integer(total)
+        except OverflowError:
+            pass
+    else:
+        doubles = rcvr.get_double_storage()
+        if doubles is not None:
+            double_total = 0.0
+            for d in doubles:
+                double_total += d
+            return Double(double_total)
+    return _generic_sum(rcvr, 0)
+
+
+def _extreme(rcvr, selector):
+    """Returns the element for which `element selector: other` is true
+    for all other elements, i.e., the minimum for < and the maximum for >"""
+    size = rcvr.get_number_of_indexable_fields()
+    if size == 0:
+        return nilObject
+
+    is_min = selector == "<"
+    longs = rcvr.get_long_storage()
+    if longs is not None:
+        result = longs[0]
+        for v in longs:
+            if (is_min and v < result) or (not is_min and v > result):
+                result = v
+        return Integer(result)
+
+    doubles = rcvr.get_double_storage()
+    if doubles is not None:
+        double_result = doubles[0]
+        for d in doubles:
+            if (is_min and d < double_result) or (not is_min and d > double_result):
+                double_result = d
+        return Double(double_result)
+
+    extreme = rcvr.get_indexable_field(0)
+    i = 1
+    while i < size:
+        value = rcvr.get_indexable_field(i)
+        if lookup_and_send_2(value, extreme, selector) is trueObject:
+            extreme = value
+        i += 1
+    return extreme
+
+
+def _min(rcvr):
+    return _extreme(rcvr, "<")
+
+
+def _max(rcvr):
+    return _extreme(rcvr, ">")
+
+
+def _dot(rcvr, arg):
+    if not isinstance(arg, Array):
+        return String("Error - argument is not an Array")
+    size = rcvr.get_number_of_indexable_fields()
+    if arg.get_number_of_indexable_fields() != size:
+        return String("Error - arrays have different sizes")
+
+    left_longs = rcvr.get_long_storage()
+    right_longs = arg.get_long_storage()
+    if left_longs is not None and right_longs is not None:
+        total = 0
+        try:
+            for i in range(size):
+                total = ovfcheck(total + ovfcheck(left_longs[i] * right_longs[i]))
+            return Integer(total)
+        except OverflowError:
+            pass
+    else:
+        left_doubles = _as_doubles(rcvr)
+        right_doubles = _as_doubles(arg)
+        if left_doubles is not None and right_doubles is not None:
+            double_total = 0.0
+            for i in range(size):
+                double_total += left_doubles[i] * right_doubles[i]
+            return Double(double_total)
+
+    products = _generic_element_wise(Array.from_size(size), rcvr, arg, _MULTIPLY, 0)
+    return _generic_sum(products, 0)
+
+
+def _scale_by(rcvr, factor):
+    return _element_wise(rcvr, factor, _MULTIPLY, True)
+
+
+_LongSort = make_timsort_class()
+_DoubleSort = make_timsort_class()
+
+
+def get_sort_printable_location(block_method):
+    if block_method is None:
+        return "#sort"
+    assert isinstance(block_method, AbstractMethod)
+    return "#sort: %s" % block_method.merge_point_string()
+
+
+sort_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_sort_printable_location,
+)
+
+
+def _is_ordered(block, block_method, left, right):
+    if block is None:
+        return lookup_and_send_2(left, right, "<=") is trueObject
+    return block_method.invoke_3(block, left, right) is trueObject
+
+
+def _merge_sort(values, block):
+    """A stable bottom-up merge sort, which returns the sorted list.
+    Without a block, elements are compared with <=."""
+    if block is None:
+        block_method = None
+    else:
+        block_method = block.get_method()
+
+    size = len(values)
+    src = values
+    dst = [None] * size
+
+    width = 1
+    while width < size:
+        start = 0
+        while start < size:
+            mid = min(start + width, size)
+            end = min(start + 2 * width, size)
+            i = start
+            j = mid
+            k = start
+            while k < end:
+                sort_driver.jit_merge_point(block_method=block_method)
+                if i < mid and (
+                    j >= end or _is_ordered(block, block_method, src[i], src[j])
+                ):
+                    dst[k] = src[i]
+                    i += 1
+                else:
+                    dst[k] = src[j]
+                    j += 1
+                k += 1
+            start = end
+        src, dst = dst, src
+        width *= 2
+    return src
+
+
+def _sort_with_block(rcvr, block):
+    size = rcvr.get_number_of_indexable_fields()
+    if size < 2:
+        return rcvr
+    values = _merge_sort(rcvr.as_argument_array()[:], block)
+    rcvr.replace_range(0, size, Array.from_values(values), 0)
+    return rcvr
+
+
+def _sort(rcvr):
+    rcvr.unshare_storage()
+    longs = rcvr.get_long_storage()
+    if longs is not None:
+        _LongSort(longs).sort()
+        return rcvr
+
+    doubles = rcvr.get_double_storage()
+    if doubles is not None:
+        _DoubleSort(doubles).sort()
+        return rcvr
+
+    return _sort_with_block(rcvr, None)
+
+
+def _sort_with(rcvr, block):
+    return _sort_with_block(rcvr, block)
+
+
 class ArrayPrimitivesBase(Primitives):
     def install_primitives(self):
         self._install_instance_primitive(BinaryPrimitive("at:", _at))
         self._install_instance_primitive(TernaryPrimitive("at:put:", _at_put))
         self._install_instance_primitive(UnaryPrimitive("length", _length))
         self._install_instance_primitive(UnaryPrimitive("copy", _copy))
+        self._install_instance_primitive(
+            TernaryPrimitive("copyFrom:to:", _copy_from_to)
+        )
+        self._install_instance_primitive(BinaryPrimitive("indexOf:", _index_of))
+        self._install_instance_primitive(UnaryPrimitive("reverse", _reverse))
+        self._install_instance_primitive(TernaryPrimitive("atAll:put:", _at_all_put))
+
+        self._install_instance_primitive(BinaryPrimitive("+", _plus))
+        self._install_instance_primitive(BinaryPrimitive("-", _minus))
+        self._install_instance_primitive(BinaryPrimitive("*", _mult))
+        self._install_instance_primitive(BinaryPrimitive("/", _divide))
+        self._install_instance_primitive(BinaryPrimitive("addInPlace:", _add_in_place))
+        self._install_instance_primitive(
+            BinaryPrimitive("subtractInPlace:", _subtract_in_place)
+        )
+        self._install_instance_primitive(
+            BinaryPrimitive("multiplyInPlace:", _multiply_in_place)
+        )
+        self._install_instance_primitive(
+            BinaryPrimitive("divideInPlace:", _divide_in_place)
+        )
+        self._install_instance_primitive(BinaryPrimitive("scaleBy:", _scale_by))
+        self._install_instance_primitive(UnaryPrimitive("sum", _sum))
+        self._install_instance_primitive(UnaryPrimitive("min", _min))
+        self._install_instance_primitive(UnaryPrimitive("max", _max))
+        self._install_instance_primitive(BinaryPrimitive("dot:", _dot))
+
+        self._install_instance_primitive(UnaryPrimitive("sort", _sort))
+        self._install_instance_primitive(BinaryPrimitive("sort:", _sort_with))
 
         self._install_class_primitive(BinaryPrimitive("new:", _new))
 
         self._install_instance_primitive(BinaryPrimitive("doIndexes:", _do_indexes))
         self._install_instance_primitive(BinaryPrimitive("do:", _do))
         self._install_instance_primitive(BinaryPrimitive("putAll:", _put_all))
+        self._install_instance_primitive(BinaryPrimitive("collect:", _collect))
+        self._install_instance_primitive(BinaryPrimitive("select:", _select))
+        self._install_instance_primitive(BinaryPrimitive("reject:", _reject))
+        self._install_instance_primitive(
+            TernaryPrimitive("inject:into:", _inject_into)
+        )
+        self._install_instance_primitive(
+            TernaryPrimitive("detect:ifNone:", _detect_if_none)
+        )
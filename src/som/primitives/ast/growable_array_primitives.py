@@ -0,0 +1,5 @@
+from som.primitives.growable_array_primitives import (
+    GrowableArrayPrimitivesBase as _Base,
+)
+
+GrowableArrayPrimitives = _Base
@@ -0,0 +1,3 @@
+from som.primitives.hash_table_primitives import HashTablePrimitivesBase as _Base
+
+HashTablePrimitives = _Base
@@ -0,0 +1,3 @@
+from som.primitives.json_primitives import JSONPrimitivesBase as _Base
+
+JSONPrimitives = _Base
@@ -0,0 +1,39 @@
+from som.primitives.byte_array_primitives import (
+    ByteArrayPrimitivesBase as _Base,
+    replace_from_to_with_starting_at,
+)
+from som.vmobjects.primitive import Primitive
+
+
+def _replace_from_to_with_starting_at(_ivkbl, stack, stack_ptr):
+    source_start = stack[stack_ptr]
+    stack[stack_ptr] = None
+    stack_ptr -= 1
+
+    source = stack[stack_ptr]
+    stack[stack_ptr] = None
+    stack_ptr -= 1
+
+    end = stack[stack_ptr]
+    stack[stack_ptr] = None
+    stack_ptr -= 1
+
+    start = stack[stack_ptr]
+    stack[stack_ptr] = None
+    stack_ptr -= 1
+
+    rcvr = stack[stack_ptr]
+    stack[stack_ptr] = replace_from_to_with_starting_at(
+        rcvr, start, end, source, source_start
+    )
+    return stack_ptr
+
+
+class ByteArrayPrimitives(_Base):
+    def install_primitives(self):
+        _Base.install_primitives(self)
+        self._install_instance_primitive(
+            Primitive(
+                "replaceFrom:to:with:startingAt:", _replace_from_to_with_starting_at
+            )
+        )
@@ -0,0 +1,5 @@
+from som.primitives.mapped_byte_array_primitives import (
+    MappedByteArrayPrimitivesBase as _Base,
+)
+
+MappedByteArrayPrimitives = _Base
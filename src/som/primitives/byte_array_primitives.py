@@ -0,0 +1,74 @@
+from som.primitives.primitives import Primitives
+from som.vmobjects.array import ByteArray
+from som.vmobjects.integer import Integer
+from som.vmobjects.primitive import UnaryPrimitive, BinaryPrimitive, TernaryPrimitive
+from som.vmobjects.string import String
+
+
+def _at(rcvr, idx):
+    i = idx.get_embedded_integer() - 1
+    if not rcvr.is_valid_range(i, i + 1):
+        return String("Error - index out of bounds")
+    return Integer(rcvr.get_byte(i))
+
+
+def _at_put(rcvr, idx, value):
+    i = idx.get_embedded_integer() - 1
+    if not rcvr.is_valid_range(i, i + 1):
+        return String("Error - index out of bounds")
+    if not rcvr.can_store(value):
+        return String("Error - value is not a byte")
+    rcvr.set_indexable_field(i, value)
+    return value
+
+
+def _length(rcvr):
+    return Integer(rcvr.get_number_of_indexable_fields())
+
+
+def _copy(rcvr):
+    return rcvr.copy()
+
+
+def _as_string(rcvr):
+    return String(rcvr.as_string())
+
+
+def replace_from_to_with_starting_at(rcvr, start, end, source, source_start):
+    s = start.get_embedded_integer() - 1
+    e = end.get_embedded_integer()
+    src_s = source_start.get_embedded_integer() - 1
+
+    if not isinstance(source, ByteArray):
+        return String("Error - source is not a ByteArray")
+    if not rcvr.is_valid_range(s, e) or not source.is_valid_range(
+        src_s, src_s + (e - s)
+    ):
+        return String("Error - index out of bounds")
+
+    rcvr.replace_range(s, e, source, src_s)
+    return rcvr
+
+
+def _new(_rcvr, length):
+    size = length.get_embedded_integer()
+    if size < 0:
+        return String("Error - negative size")
+    return ByteArray.from_size(size)
+
+
+def _from_string(_rcvr, string):
+    return ByteArray.from_string(string.get_embedded_string())
+
+
+class ByteArrayPrimitivesBase(Primitives):
+    def install_primitives(self):
+        self._install_instance_primitive(BinaryPrimitive("at:", _at))
+        self._install_instance_primitive(TernaryPrimitive("at:put:", _at_put))
+        self._install_instance_primitive(UnaryPrimitive("length", _length))
+        self._install_instance_primitive(UnaryPrimitive("size", _length))
+        self._install_instance_primitive(UnaryPrimitive("copy", _copy))
+        self._install_instance_primitive(UnaryPrimitive("asString", _as_string))
+
+        self._install_class_primitive(BinaryPrimitive("new:", _new))
+        self._install_class_primitive(BinaryPrimitive("fromString:", _from_string))
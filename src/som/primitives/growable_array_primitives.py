@@ -0,0 +1,72 @@
+from som.primitives.primitives import Primitives
+from som.vmobjects.growable_array import GrowableArray
+from som.vmobjects.integer import Integer
+from som.vmobjects.primitive import UnaryPrimitive, BinaryPrimitive, TernaryPrimitive
+from som.vmobjects.string import String
+
+
+def _new(_rcvr):
+    return GrowableArray()
+
+
+def _new_with_capacity(_rcvr, capacity):
+    size = capacity.get_embedded_integer()
+    if size < 0:
+        return String("Error - negative capacity")
+    return GrowableArray(size)
+
+
+def _append(rcvr, value):
+    rcvr.append(value)
+    return rcvr
+
+
+def _at(rcvr, idx):
+    i = idx.get_embedded_integer() - 1
+    if not 0 <= i < rcvr.get_size():
+        return String("Error - index out of bounds")
+    return rcvr.get(i)
+
+
+def _at_put(rcvr, idx, value):
+    i = idx.get_embedded_integer() - 1
+    if not 0 <= i < rcvr.get_size():
+        return String("Error - index out of bounds")
+    rcvr.set(i, value)
+    return value
+
+
+def _remove_first(rcvr):
+    value = rcvr.remove_first()
+    if value is None:
+        return String("Error - GrowableArray is empty")
+    return value
+
+
+def _remove_last(rcvr):
+    value = rcvr.remove_last()
+    if value is None:
+        return String("Error - GrowableArray is empty")
+    return value
+
+
+def _size(rcvr):
+    return Integer(rcvr.get_size())
+
+
+def _as_array(rcvr):
+    return rcvr.as_array()
+
+
+class GrowableArrayPrimitivesBase(Primitives):
+    def install_primitives(self):
+        self._install_instance_primitive(BinaryPrimitive("append:", _append))
+        self._install_instance_primitive(BinaryPrimitive("at:", _at))
+        self._install_instance_primitive(TernaryPrimitive("at:put:", _at_put))
+        self._install_instance_primitive(UnaryPrimitive("removeFirst", _remove_first))
+        self._install_instance_primitive(UnaryPrimitive("removeLast", _remove_last))
+        self._install_instance_primitive(UnaryPrimitive("size", _size))
+        self._install_instance_primitive(UnaryPrimitive("asArray", _as_array))
+
+        self._install_class_primitive(UnaryPrimitive("new", _new))
+        self._install_class_primitive(BinaryPrimitive("new:", _new_with_capacity))
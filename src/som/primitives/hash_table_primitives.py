@@ -0,0 +1,131 @@
+from rlib.jit import JitDriver
+
+from som.interp_type import is_ast_interpreter
+from som.interpreter.send import lookup_and_send_1
+from som.primitives.primitives import Primitives
+from som.vm.globals import nilObject, trueObject, falseObject
+from som.vmobjects.array import Array
+from som.vmobjects.hash_table import HashTable
+from som.vmobjects.integer import Integer
+from som.vmobjects.method import AbstractMethod
+from som.vmobjects.primitive import UnaryPrimitive, BinaryPrimitive, TernaryPrimitive
+
+if is_ast_interpreter():
+    from som.vmobjects.block_ast import AstBlock as _Block
+else:
+    from som.vmobjects.block_bc import BcBlock as _Block
+
+
+def _new(_rcvr):
+    return HashTable(False)
+
+
+def _new_identity(_rcvr):
+    return HashTable(True)
+
+
+def _at(rcvr, key):
+    value = rcvr.get(key)
+    if value is None:
+        return nilObject
+    return value
+
+
+def _at_put(rcvr, key, value):
+    rcvr.put(key, value)
+    return value
+
+
+def _at_if_absent(rcvr, key, block):
+    value = rcvr.get(key)
+    if value is None:
+        if isinstance(block, _Block):
+            return block.get_method().invoke_1(block)
+        # like Dictionary>>#at:ifAbsent:, which sends #value to the argument
+        return lookup_and_send_1(block, "value")
+    return value
+
+
+def _contains_key(rcvr, key):
+    if rcvr.contains_key(key):
+        return trueObject
+    return falseObject
+
+
+def _remove_key(rcvr, key):
+    value = rcvr.remove(key)
+    if value is None:
+        return nilObject
+    return value
+
+
+def _remove_all(rcvr):
+    rcvr.remove_all()
+    return rcvr
+
+
+def _size(rcvr):
+    return Integer(rcvr.size())
+
+
+def _is_empty(rcvr):
+    if rcvr.size() == 0:
+        return trueObject
+    return falseObject
+
+
+def _keys(rcvr):
+    return Array.from_values(rcvr.get_keys())
+
+
+def _values(rcvr):
+    return Array.from_values(rcvr.get_values())
+
+
+def get_keys_and_values_do_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#keysAndValuesDo: %s" % block_method.merge_point_string()
+
+
+keys_and_values_do_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_keys_and_values_do_printable_location,
+)
+
+
+def _keys_and_values_do(rcvr, block):
+    block_method = block.get_method()
+
+    # iterate over a snapshot, because the block may change the table
+    keys = rcvr.get_keys()
+    values = rcvr.get_values()
+    i = 0
+    while i < len(keys):
+        keys_and_values_do_driver.jit_merge_point(block_method=block_method)
+        block_method.invoke_3(block, keys[i], values[i])
+        i += 1
+    return rcvr
+
+
+class HashTablePrimitivesBase(Primitives):
+    def install_primitives(self):
+        self._install_instance_primitive(BinaryPrimitive("at:", _at))
+        self._install_instance_primitive(TernaryPrimitive("at:put:", _at_put))
+        self._install_instance_primitive(
+            TernaryPrimitive("at:ifAbsent:", _at_if_absent)
+        )
+        self._install_instance_primitive(BinaryPrimitive("containsKey:", _contains_key))
+        self._install_instance_primitive(BinaryPrimitive("removeKey:", _remove_key))
+        self._install_instance_primitive(UnaryPrimitive("removeAll", _remove_all))
+        self._install_instance_primitive(UnaryPrimitive("size", _size))
+        self._install_instance_primitive(UnaryPrimitive("isEmpty", _is_empty))
+        self._install_instance_primitive(UnaryPrimitive("keys", _keys))
+        self._install_instance_primitive(UnaryPrimitive("values", _values))
+        self._install_instance_primitive(
+            BinaryPrimitive("keysAndValuesDo:", _keys_and_values_do)
+        )
+
+        self._install_class_primitive(UnaryPrimitive("new", _new))
+        self._install_class_primitive(UnaryPrimitive("newIdentity", _new_identity))
@@ -0,0 +1,56 @@
+from rlib import jit
+from rlib.streamio import open_file_as_stream, readall_from_stream
+
+from som.primitives.primitives import Primitives
+from som.vm.globals import nilObject
+from som.vm.json_codec import parse, serialize, JsonError
+from som.vmobjects.primitive import BinaryPrimitive
+from som.vmobjects.string import String
+
+
+def _parse(_rcvr, text):
+    if not isinstance(text, String):
+        return String("Error - argument is not a String")
+    try:
+        return parse(text.get_embedded_string())
+    except JsonError as e:
+        return String("Error - " + e.message)
+
+
+@jit.dont_look_inside
+def _read_file(file_name):
+    try:
+        input_file = open_file_as_stream(file_name, "r")
+        try:
+            return readall_from_stream(input_file)
+        finally:
+            input_file.close()
+    except (OSError, IOError):
+        pass
+    return None
+
+
+def _parse_file(_rcvr, file_name):
+    if not isinstance(file_name, String):
+        return String("Error - argument is not a String")
+    text = _read_file(file_name.get_embedded_string())
+    if text is None:
+        return nilObject
+    try:
+        return parse(text)
+    except JsonError as e:
+        return String("Error - " + e.message)
+
+
+def _serialize(_rcvr, obj):
+    try:
+        return String(serialize(obj))
+    except JsonError as e:
+        return String("Error - " + e.message)
+
+
+class JSONPrimitivesBase(Primitives):
+    def install_primitives(self):
+        self._install_class_primitive(BinaryPrimitive("parse:", _parse))
+        self._install_class_primitive(BinaryPrimitive("parseFile:", _parse_file))
+        self._install_class_primitive(BinaryPrimitive("serialize:", _serialize))
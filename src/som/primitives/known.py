@@ -7,7 +7,7 @@ from som.interp_type import is_ast_interpreter, is_bytecode_interpreter
    time with RPython.
 """
 
-EXPECTED_NUMBER_OF_PRIMITIVE_FILES = 13
+EXPECTED_NUMBER_OF_PRIMITIVE_FILES = 18
 
 
 class PrimitivesNotFound(Exception):
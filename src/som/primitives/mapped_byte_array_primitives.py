@@ -0,0 +1,76 @@
+from rlib import jit
+
+from som.primitives.primitives import Primitives
+from som.vm.globals import nilObject
+from som.vmobjects.integer import Integer
+from som.vmobjects.mapped_byte_array import MappedByteArray
+from som.vmobjects.primitive import UnaryPrimitive, BinaryPrimitive, TernaryPrimitive
+from som.vmobjects.string import String
+
+
+@jit.dont_look_inside
+def _open(_rcvr, file_name):
+    result = MappedByteArray.map_file(file_name.get_embedded_string())
+    if result is None:
+        return nilObject
+    return result
+
+
+def _at(rcvr, idx):
+    i = idx.get_embedded_integer() - 1
+    if not rcvr.is_valid_range(i, i + 1):
+        return String("Error - index out of bounds")
+    return Integer(rcvr.get_byte(i))
+
+
+def _size(rcvr):
+    return Integer(rcvr.get_size())
+
+
+def _copy_from_to(rcvr, start, end):
+    s = start.get_embedded_integer() - 1
+    e = end.get_embedded_integer()
+
+    if not rcvr.is_valid_range(s, e):
+        return String("Error - index out of bounds")
+    return String(rcvr.get_string(s, e))
+
+
+def _index_of_from(rcvr, needle, start):
+    s = start.get_embedded_integer() - 1
+    if not rcvr.is_valid_range(s, rcvr.get_size()):
+        return Integer(0)
+
+    if isinstance(needle, Integer):
+        byte = needle.get_embedded_integer()
+        if not 0 <= byte <= 255:
+            return Integer(0)
+        string = chr(byte)
+    elif isinstance(needle, String):
+        string = needle.get_embedded_string()
+    else:
+        return String("Error - needle is neither a byte nor a String")
+
+    return Integer(rcvr.index_of(string, s) + 1)
+
+
+@jit.dont_look_inside
+def _close(rcvr):
+    rcvr.close()
+    return rcvr
+
+
+class MappedByteArrayPrimitivesBase(Primitives):
+    def install_primitives(self):
+        self._install_instance_primitive(BinaryPrimitive("at:", _at))
+        self._install_instance_primitive(UnaryPrimitive("size", _size))
+        self._install_instance_primitive(UnaryPrimitive("length", _size))
+        self._install_instance_primitive(
+            TernaryPrimitive("copyFrom:to:", _copy_from_to)
+        )
+        self._install_instance_primitive(
+            TernaryPrimitive("indexOf:from:", _index_of_from)
+        )
+        self._install_instance_primitive(UnaryPrimitive("close", _close))
+
+        self._install_class_primitive(BinaryPrimitive("open:", _open))
@@ -1,9 +1,12 @@
-from rlib.objectmodel import compute_hash
+from rlib.jit import JitDriver
 from som.primitives.primitives import Primitives
 
 from som.vm.globals import trueObject, falseObject
+from som.vm.strings import char_for, string_for
 from som.vm.symbols import symbol_for
+from som.vmobjects.array import Array
 from som.vmobjects.integer import Integer
+from som.vmobjects.method import AbstractMethod
 from som.vmobjects.primitive import UnaryPrimitive, BinaryPrimitive, TernaryPrimitive
 from som.vmobjects.string import String
 
@@ -21,6 +24,8 @@ def _length(rcvr):
 
 
 def _equals(op1, op2):
+    if op1 is op2:
+        return trueObject
     if (
         isinstance(op2, String)
         and op1.get_embedded_string() == op2.get_embedded_string()
@@ -36,7 +41,7 @@ def _substring(rcvr, start, end):
 
     if s < 0 or s >= len(string) or e > len(string) or e < s:
         return String("Error - index out of bounds")
-    return String(string[s:e])
+    return string_for(string[s:e])
 
 
 def _char_at(rcvr, idx):
@@ -45,11 +50,103 @@ def _char_at(rcvr, idx):
 
     if i < 0 or i >= len(string):
         return String("Error - index out of bounds")
-    return String(string[i])
+    return char_for(string[i])
 
 
 def _hashcode(rcvr):
-    return Integer(compute_hash(rcvr.get_embedded_string()))
+    return Integer(rcvr.get_hash())
+
+
+def get_do_printable_location(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#String>>do: %s" % block_method.merge_point_string()
+
+
+do_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=get_do_printable_location,
+)
+
+
+def _do(rcvr, block):
+    block_method = block.get_method()
+    string = rcvr.get_embedded_string()
+
+    i = 0
+    while i < len(string):
+        do_driver.jit_merge_point(block_method=block_method)
+        block_method.invoke_2(block, char_for(string[i]))
+        i += 1
+    return rcvr
+
+
+def _index_of(rcvr, string):
+    if not isinstance(string, String):
+        return String("Error - argument is not a String")
+    return Integer(rcvr.get_embedded_string().find(string.get_embedded_string()) + 1)
+
+
+def _begins_with(rcvr, prefix):
+    if not isinstance(prefix, String):
+        return String("Error - argument is not a String")
+    if rcvr.get_embedded_string().startswith(prefix.get_embedded_string()):
+        return trueObject
+    return falseObject
+
+
+def _ends_with(rcvr, suffix):
+    if not isinstance(suffix, String):
+        return String("Error - argument is not a String")
+    if rcvr.get_embedded_string().endswith(suffix.get_embedded_string()):
+        return trueObject
+    return falseObject
+
+
+def _split(rcvr, separator):
+    if not isinstance(separator, String):
+        return String("Error - argument is not a String")
+    sep = separator.get_embedded_string()
+    if sep == "":
+        return String("Error - empty separator")
+
+    parts = rcvr.get_embedded_string().split(sep)
+    return Array.from_objects([string_for(part) for part in parts][:])
+
+
+def _replace_all_with(rcvr, old, new):
+    if not isinstance(old, String) or not isinstance(new, String):
+        return String("Error - argument is not a String")
+    old_str = old.get_embedded_string()
+    if old_str == "":
+        return String("Error - empty search string")
+    return String(
+        rcvr.get_embedded_string().replace(old_str, new.get_embedded_string())
+    )
+
+
+def _as_uppercase(rcvr):
+    return String(rcvr.get_embedded_string().upper())
+
+
+def _as_lowercase(rcvr):
+    return String(rcvr.get_embedded_string().lower())
+
+
+def _trim(rcvr):
+    string = rcvr.get_embedded_string()
+    start = 0
+    end = len(string)
+    while start < end and string[start].isspace():
+        start += 1
+    while end > start and string[end - 1].isspace():
+        end -= 1
+
+    if start == 0 and end == len(string):
+        return rcvr
+    assert end >= start
+    return string_for(string[start:end])
 
 
 def _is_whitespace(self):
@@ -99,6 +196,18 @@ class StringPrimitivesBase(Primitives):
             TernaryPrimitive("primSubstringFrom:to:", _substring)
         )
         self._install_instance_primitive(UnaryPrimitive("hashcode", _hashcode))
+        self._install_instance_primitive(BinaryPrimitive("do:", _do))
+
+        self._install_instance_primitive(BinaryPrimitive("indexOf:", _index_of))
+        self._install_instance_primitive(BinaryPrimitive("beginsWith:", _begins_with))
+        self._install_instance_primitive(BinaryPrimitive("endsWith:", _ends_with))
+        self._install_instance_primitive(BinaryPrimitive("split:", _split))
+        self._install_instance_primitive(
+            TernaryPrimitive("replaceAll:with:", _replace_all_with)
+        )
+        self._install_instance_primitive(UnaryPrimitive("asUppercase", _as_uppercase))
+        self._install_instance_primitive(UnaryPrimitive("asLowercase", _as_lowercase))
+        self._install_instance_primitive(UnaryPrimitive("trim", _trim))
 
         self._install_instance_primitive(UnaryPrimitive("isWhiteSpace", _is_whitespace))
         self._install_instance_primitive(UnaryPrimitive("isLetters", _is_letters))
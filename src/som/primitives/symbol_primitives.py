@@ -1,11 +1,12 @@
 from som.primitives.primitives import Primitives
 from som.vmobjects.primitive import BinaryPrimitive, UnaryPrimitive
 from som.vm.globals import trueObject, falseObject
+from som.vm.strings import string_for
 from som.vmobjects.string import String
 
 
 def _as_string(rcvr):
-    return String(rcvr.get_embedded_string())
+    return string_for(rcvr.get_embedded_string())
 
 
 def _equals(op1, op2):
@@ -0,0 +1,140 @@
+import os
+
+from rlib.rzipfile import RZipFile, BadZipfile
+
+_EXTENSION = ".som"
+
+# Class path entries ending with this extension are zip archives
+# with .som files, which may be in subdirectories of the archive.
+_ARCHIVE_EXTENSION = ".zip"
+
+
+def _modification_time(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return -1.0
+
+
+def _class_name(file_name):
+    """Returns the class name for a .som file name, or None."""
+    if not file_name.endswith(_EXTENSION):
+        return None
+    end = len(file_name) - len(_EXTENSION)
+    assert end >= 0
+    return file_name[:end]
+
+
+class _EntryIndex(object):
+    """The names of the classes for which a class path entry has a file."""
+
+    def __init__(self, path):
+        self._path = path
+        self._modification_time = -1.0
+        self._class_names = {}
+        self._read()
+
+    def _read(self):
+        self._modification_time = _modification_time(self._path)
+        self._class_names = {}
+        self._read_class_names()
+
+    def _read_class_names(self):
+        raise NotImplementedError("Subclasses need to implement _read_class_names().")
+
+    def has_class(self, class_name):
+        return class_name in self._class_names
+
+    def read_class(self, class_name):
+        """Returns the source of the class, or None if it is to be read
+        from a file."""
+        return None
+
+    def refresh_if_changed(self):
+        """Returns True if the entry changed since it was last read."""
+        if _modification_time(self._path) == self._modification_time:
+            return False
+        self._read()
+        return True
+
+
+class _DirectoryIndex(_EntryIndex):
+    def _read_class_names(self):
+        try:
+            file_names = os.listdir(self._path)
+        except OSError:
+            # not a directory, or it does not exist (yet)
+            return
+
+        for file_name in file_names:
+            class_name = _class_name(file_name)
+            if class_name is not None:
+                self._class_names[class_name] = file_name
+
+
+class _ArchiveIndex(_EntryIndex):
+    """The archive is opened when it is read, and classes are read from it
+    by name. When it changed, it is closed and opened again."""
+
+    def __init__(self, path):
+        self._archive = None
+        _EntryIndex.__init__(self, path)
+
+    def _read_class_names(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+        try:
+            self._archive = RZipFile(self._path, "r")
+        except (OSError, BadZipfile):
+            return
+
+        for member_name in self._archive.NameToInfo:
+            class_name = _class_name(member_name.split("/")[-1])
+            if class_name is not None and class_name not in self._class_names:
+                self._class_names[class_name] = member_name
+
+    def read_class(self, class_name):
+        assert self._archive is not None
+        return self._archive.read(self._class_names[class_name])
+
+
+class ClassPathIndex(object):
+    """Remembers which class path entries have a file for a class, so that
+    loading a class does not need to try to open it in every entry.
+
+    An entry is read the first time it is consulted: a directory is listed,
+    and an archive is opened and stays open to read classes from it,
+    until it is reopened by a refresh.
+    When a class is not found, refresh() re-reads the entries that changed.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def _get_entry(self, path):
+        entry = self._entries.get(path, None)
+        if entry is None:
+            if path.endswith(_ARCHIVE_EXTENSION):
+                entry = _ArchiveIndex(path)
+            else:
+                entry = _DirectoryIndex(path)
+            self._entries[path] = entry
+        return entry
+
+    def has_class(self, path, class_name):
+        return self._get_entry(path).has_class(class_name)
+
+    def read_class(self, path, class_name):
+        """Returns the source of a class in an archive, or None for
+        a class in a directory, which is to be read from its file."""
+        return self._get_entry(path).read_class(class_name)
+
+    def refresh(self):
+        """Returns True if any of the entries changed."""
+        changed = False
+        for entry in self._entries.values():
+            if entry.refresh_if_changed():
+                changed = True
+        return changed
@@ -0,0 +1,393 @@
+from rlib.arithmetic import string_to_int, bigint_from_str, ParseStringOverflowError
+from rlib.float import float_to_str, INFINITY
+
+from som.vm.globals import nilObject, trueObject, falseObject
+from som.vm.strings import string_for
+from som.vmobjects.array import Array
+from som.vmobjects.biginteger import BigInteger
+from som.vmobjects.double import Double
+from som.vmobjects.hash_table import HashTable
+from som.vmobjects.integer import Integer
+from som.vmobjects.string import String
+
+# Guards against stack overflows for deeply nested or cyclic structures
+MAX_DEPTH = 512
+
+
+class JsonError(Exception):
+    def __init__(self, message):  # pylint: disable=super-init-not-called
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+def _is_digit(char):
+    return "0" <= char <= "9"
+
+
+def _hex_value(char):
+    if "0" <= char <= "9":
+        return ord(char) - ord("0")
+    if "a" <= char <= "f":
+        return ord(char) - ord("a") + 10
+    if "A" <= char <= "F":
+        return ord(char) - ord("A") + 10
+    return -1
+
+
+def _append_utf8(builder, code_point):
+    if code_point < 0x80:
+        builder.append(chr(code_point))
+    elif code_point < 0x800:
+        builder.append(chr(0xC0 | (code_point >> 6)))
+        builder.append(chr(0x80 | (code_point & 0x3F)))
+    elif code_point < 0x10000:
+        builder.append(chr(0xE0 | (code_point >> 12)))
+        builder.append(chr(0x80 | ((code_point >> 6) & 0x3F)))
+        builder.append(chr(0x80 | (code_point & 0x3F)))
+    else:
+        builder.append(chr(0xF0 | (code_point >> 18)))
+        builder.append(chr(0x80 | ((code_point >> 12) & 0x3F)))
+        builder.append(chr(0x80 | ((code_point >> 6) & 0x3F)))
+        builder.append(chr(0x80 | (code_point & 0x3F)))
+
+
+class JsonParser(object):
+    """Parses a JSON document directly into SOM objects.
+
+    Objects become HashTables with String keys, arrays become Arrays with the
+    most specific storage strategy for their elements.
+    """
+
+    def __init__(self, text):
+        self._text = text
+        self._pos = 0
+        self._depth = 0
+
+    def parse(self):
+        self._skip_whitespace()
+        result = self._value()
+        self._skip_whitespace()
+        if self._pos < len(self._text):
+            self._error("unexpected trailing characters")
+        return result
+
+    def _error(self, message):
+        raise JsonError("%s at position %d" % (message, self._pos))
+
+    def _peek(self):
+        if self._pos < len(self._text):
+            return self._text[self._pos]
+        return "\0"
+
+    def _skip_whitespace(self):
+        text = self._text
+        pos = self._pos
+        while pos < len(text) and text[pos] in " \t\n\r":
+            pos += 1
+        self._pos = pos
+
+    def _expect(self, char):
+        if self._peek() != char:
+            self._error("expected '%s'" % char)
+        self._pos += 1
+
+    def _expect_word(self, word):
+        end = self._pos + len(word)
+        if self._text[self._pos : end] != word:
+            self._error("unexpected token")
+        self._pos = end
+
+    def _value(self):
+        char = self._peek()
+        if char == "{":
+            return self._object()
+        if char == "[":
+            return self._array()
+        if char == '"':
+            return self._string()
+        if char == "-" or _is_digit(char):
+            return self._number()
+        if char == "t":
+            self._expect_word("true")
+            return trueObject
+        if char == "f":
+            self._expect_word("false")
+            return falseObject
+        if char == "n":
+            self._expect_word("null")
+            return nilObject
+        if self._pos >= len(self._text):
+            self._error("unexpected end of input")
+        self._error("unexpected character")
+        return None
+
+    def _enter(self):
+        self._depth += 1
+        if self._depth > MAX_DEPTH:
+            self._error("nesting too deep")
+
+    def _object(self):
+        self._enter()
+        self._expect("{")
+        result = HashTable(False)
+
+        self._skip_whitespace()
+        if self._peek() == "}":
+            self._pos += 1
+            self._depth -= 1
+            return result
+
+        while True:
+            self._skip_whitespace()
+            if self._peek() != '"':
+                self._error("expected a string key")
+            key = self._string()
+            self._skip_whitespace()
+            self._expect(":")
+            self._skip_whitespace()
+            result.put(key, self._value())
+            self._skip_whitespace()
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("}")
+            self._depth -= 1
+            return result
+
+    def _array(self):
+        self._enter()
+        self._expect("[")
+        values = []
+
+        self._skip_whitespace()
+        if self._peek() == "]":
+            self._pos += 1
+            self._depth -= 1
+            return Array.from_size(0)
+
+        while True:
+            self._skip_whitespace()
+            values.append(self._value())
+            self._skip_whitespace()
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("]")
+            self._depth -= 1
+            return Array.from_values(values[:])
+
+    def _string(self):
+        self._expect('"')
+        text = self._text
+        start = self._pos
+
+        # fast path, strings without escapes are sliced directly
+        pos = start
+        while pos < len(text):
+            char = text[pos]
+            if char == '"':
+                self._pos = pos + 1
+                assert pos >= start
+                return string_for(text[start:pos])
+            if char == "\\":
+                break
+            if ord(char) < 0x20:
+                self._pos = pos
+                self._error("control character in string")
+            pos += 1
+
+        builder = [text[start:pos]]
+        while pos < len(text):
+            char = text[pos]
+            if char == '"':
+                self._pos = pos + 1
+                return String("".join(builder))
+            if ord(char) < 0x20:
+                self._pos = pos
+                self._error("control character in string")
+            if char != "\\":
+                builder.append(char)
+                pos += 1
+                continue
+
+            pos += 1
+            self._pos = pos
+            escaped = self._peek()
+            pos += 1
+            if escaped == '"' or escaped == "\\" or escaped == "/":
+                builder.append(escaped)
+            elif escaped == "b":
+                builder.append("\b")
+            elif escaped == "f":
+                builder.append("\f")
+            elif escaped == "n":
+                builder.append("\n")
+            elif escaped == "r":
+                builder.append("\r")
+            elif escaped == "t":
+                builder.append("\t")
+            elif escaped == "u":
+                self._pos = pos
+                code_point = self._hex4()
+                if (
+                    0xD800 <= code_point < 0xDC00
+                    and self._text[self._pos : self._pos + 2] == "\\u"
+                ):
+                    self._pos += 2
+                    low = self._hex4()
+                    if 0xDC00 <= low < 0xE000:
+                        code_point = (
+                            0x10000 + ((code_point - 0xD800) << 10) + (low - 0xDC00)
+                        )
+                    else:
+                        _append_utf8(builder, code_point)
+                        code_point = low
+                _append_utf8(builder, code_point)
+                pos = self._pos
+            else:
+                self._error("invalid escape sequence")
+
+        self._pos = pos
+        self._error("unterminated string")
+        return None
+
+    def _hex4(self):
+        result = 0
+        for _ in range(4):
+            digit = _hex_value(self._peek())
+            if digit < 0:
+                self._error("invalid unicode escape")
+            result = (result << 4) | digit
+            self._pos += 1
+        return result
+
+    def _digits(self):
+        start = self._pos
+        while _is_digit(self._peek()):
+            self._pos += 1
+        if self._pos == start:
+            self._error("expected a digit")
+
+    def _number(self):
+        text = self._text
+        start = self._pos
+        if self._peek() == "-":
+            self._pos += 1
+
+        if self._peek() == "0":
+            self._pos += 1
+        else:
+            self._digits()
+
+        is_double = False
+        if self._peek() == ".":
+            is_double = True
+            self._pos += 1
+            self._digits()
+        if self._peek() == "e" or self._peek() == "E":
+            is_double = True
+            self._pos += 1
+            if self._peek() == "+" or self._peek() == "-":
+                self._pos += 1
+            self._digits()
+
+        end = self._pos
+        assert end >= start
+        number = text[start:end]
+        if is_double:
+            try:
+                return Double(float(number))
+            except ValueError:
+                self._error("invalid number")
+
+        try:
+            return Integer(string_to_int(number))
+        except ParseStringOverflowError:
+            return BigInteger(bigint_from_str(number))
+
+
+def parse(text):
+    """Returns the SOM object for the JSON text, or raises a JsonError."""
+    return JsonParser(text).parse()
+
+
+_HEX_DIGITS = "0123456789abcdef"
+
+
+def _append_unicode_escape(builder, code_unit):
+    # RPython does not support padded formatting like %04x
+    builder.append("\\u")
+    for shift in [12, 8, 4, 0]:
+        builder.append(_HEX_DIGITS[(code_unit >> shift) & 0xF])
+
+
+def _serialize_string(string, builder):
+    builder.append('"')
+    for char in string:
+        if char == '"':
+            builder.append('\\"')
+        elif char == "\\":
+            builder.append("\\\\")
+        elif char == "\n":
+            builder.append("\\n")
+        elif char == "\r":
+            builder.append("\\r")
+        elif char == "\t":
+            builder.append("\\t")
+        elif ord(char) < 0x20:
+            _append_unicode_escape(builder, ord(char))
+        else:
+            builder.append(char)
+    builder.append('"')
+
+
+def _serialize(obj, builder, depth):
+    if depth > MAX_DEPTH:
+        raise JsonError("nesting too deep, or a cyclic structure")
+
+    if obj is nilObject:
+        builder.append("null")
+    elif obj is trueObject:
+        builder.append("true")
+    elif obj is falseObject:
+        builder.append("false")
+    elif isinstance(obj, String):
+        _serialize_string(obj.get_embedded_string(), builder)
+    elif isinstance(obj, Integer) or isinstance(obj, BigInteger):
+        builder.append(obj.prim_as_string().get_embedded_string())
+    elif isinstance(obj, Double):
+        value = obj.get_embedded_double()
+        if value != value or value == INFINITY or value == -INFINITY:
+            raise JsonError("NaN and infinity cannot be represented in JSON")
+        builder.append(float_to_str(value))
+    elif isinstance(obj, Array):
+        builder.append("[")
+        for i in range(obj.get_number_of_indexable_fields()):
+            if i > 0:
+                builder.append(",")
+            _serialize(obj.get_indexable_field(i), builder, depth + 1)
+        builder.append("]")
+    elif isinstance(obj, HashTable):
+        builder.append("{")
+        keys = obj.get_keys()
+        values = obj.get_values()
+        for i, key in enumerate(keys):
+            if not isinstance(key, String):
+                raise JsonError("object keys must be strings")
+            if i > 0:
+                builder.append(",")
+            _serialize_string(key.get_embedded_string(), builder)
+            builder.append(":")
+            _serialize(values[i], builder, depth + 1)
+        builder.append("}")
+    else:
+        raise JsonError("object cannot be represented in JSON")
+
+
+def serialize(obj):
+    """Returns the JSON text for the SOM object, or raises a JsonError."""
+    builder = []
+    _serialize(obj, builder, 0)
+    return "".join(builder)
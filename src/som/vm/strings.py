@@ -0,0 +1,51 @@
+# pylint: disable=invalid-name
+from som.vmobjects.string import String
+
+# Strings up to this length are interned, if interning is enabled
+MAX_INTERNED_LENGTH = 16
+
+# Limits the memory used for interned strings
+MAX_INTERNED_STRINGS = 64 * 1024
+
+
+class _StringTable(object):
+    _immutable_fields_ = ["enabled?"]
+
+    def __init__(self):
+        self.enabled = False
+        self.strings = {}
+
+
+_string_table = _StringTable()
+
+# Single-character strings are immutable, so they can always be shared
+_single_char_strings = [String(chr(i)) for i in range(256)]
+
+
+def enable_string_interning():
+    _string_table.enabled = True
+
+
+def char_for(char):
+    """Returns the shared String object for a single character."""
+    return _single_char_strings[ord(char)]
+
+
+def string_for(string):
+    """Returns a String object for the given string.
+    With interning enabled, equal short strings are the same object,
+    which makes comparing them an identity check, and their hash
+    is computed only once."""
+    if len(string) == 1:
+        return char_for(string[0])
+    if not _string_table.enabled or len(string) > MAX_INTERNED_LENGTH:
+        return String(string)
+
+    result = _string_table.strings.get(string, None)
+    if result is not None:
+        return result
+
+    result = String(string)
+    if len(_string_table.strings) < MAX_INTERNED_STRINGS:
+        _string_table.strings[string] = result
+    return result
@@ -25,7 +25,6 @@ sym_true = symbol_for("true")
 sym_false = symbol_for("false")
 sym_plus = symbol_for("+")
 sym_minus = symbol_for("-")
-sym_array_size_placeholder = symbol_for("ArraySizeLiteralPlaceholder")
 
 sym_new_msg = symbol_for("new:")
 sym_at_put_msg = symbol_for("at:put:")
@@ -6,7 +6,11 @@ from rlib.string_stream import encode_to_bytes
 from rlib.exit import Exit
 from rlib.osext import path_split
 from rlib import rgc
+from som.vm.class_path import ClassPathIndex
 from som.vm.symbols import symbol_for, sym_false, sym_true, sym_nil
+from som.vm.strings import enable_string_interning
+from som.interpreter.bc.send_inlining import enable_send_inlining
+from som.interpreter.bc.stackless import enable_stackless
 
 from som.vmobjects.array import Array
 from som.vmobjects.block_bc import block_evaluation_primitive
@@ -19,6 +23,7 @@ from som.vm.globals import nilObject, trueObject, falseObject
 from som.vm.shell import Shell
 
 from som.compiler.sourcecode_compiler import (
+    compile_class_from_archive,
     compile_class_from_file,
     compile_class_from_string,
 )
@@ -59,7 +64,17 @@ class Universe(object):
         "string_layout?",
         "double_class",
         "double_layout?",
+        "mapped_byte_array_class",
+        "mapped_byte_array_layout?",
+        "byte_array_class",
+        "byte_array_layout?",
+        "hash_table_class",
+        "hash_table_layout?",
+        "json_class",
+        "growable_array_class",
+        "growable_array_layout?",
         "_globals",
+        "_class_path_index",
         "start_time",
         "_object_system_initialized",
     ]
@@ -90,11 +105,21 @@ class Universe(object):
         self.string_layout = None
         self.double_class = None
         self.double_layout = None
+        self.mapped_byte_array_class = None
+        self.mapped_byte_array_layout = None
+        self.byte_array_class = None
+        self.byte_array_layout = None
+        self.hash_table_class = None
+        self.hash_table_layout = None
+        self.json_class = None
+        self.growable_array_class = None
+        self.growable_array_layout = None
 
         self._last_exit_code = 0
         self._avoid_exit = avoid_exit
         self._dump_bytecodes = False
         self.classpath = None
+        self._class_path_index = ClassPathIndex()
         self.start_time = time.time()  # a float of the time in seconds
         self._object_system_initialized = False
 
@@ -156,6 +181,12 @@ class Universe(object):
                 self._dump_bytecodes = True
             elif arguments[i] in ["-h", "--help", "-?"] and not saw_others:
                 self._print_usage_and_exit()
+            elif arguments[i] == "--intern-strings" and not saw_others:
+                enable_string_interning()
+            elif arguments[i] == "--inline-sends" and not saw_others:
+                enable_send_inlining()
+            elif arguments[i] == "--stackless" and not saw_others:
+                enable_stackless()
             elif arguments[i] == "--no-gc" and not saw_others:
                 rgc.disable()
                 if rgc.isenabled() == 0:
@@ -201,11 +232,19 @@ class Universe(object):
         std_println("                                                         ")
         std_println("where options include:                                   ")
         std_println("    -cp <directories separated by " + os.pathsep + ">")
-        std_println("        set search path for application classes")
+        std_println("        set search path for application classes,")
+        std_println("        entries can be directories or .zip archives")
         std_println("    -d  enable disassembling")
         std_println("    -h  print this help")
         std_println("")
         std_println("    --no-gc disable garbage collection")
+        std_println("    --intern-strings share short strings created by primitives")
+        std_println(
+            "    --inline-sends inline small methods at monomorphic sends (BC only)"
+        )
+        std_println(
+            "    --stackless run sends to methods without host recursion (BC only)"
+        )
 
         # Exit
         self.exit(0)
@@ -240,6 +279,24 @@ class Universe(object):
         self.double_class = self.new_system_class()
         self.double_layout = self.double_class.get_layout_for_instances()
 
+        self.mapped_byte_array_class = self.new_system_class()
+        self.mapped_byte_array_layout = (
+            self.mapped_byte_array_class.get_layout_for_instances()
+        )
+
+        self.byte_array_class = self.new_system_class()
+        self.byte_array_layout = self.byte_array_class.get_layout_for_instances()
+
+        self.hash_table_class = self.new_system_class()
+        self.hash_table_layout = self.hash_table_class.get_layout_for_instances()
+
+        self.json_class = self.new_system_class()
+
+        self.growable_array_class = self.new_system_class()
+        self.growable_array_layout = (
+            self.growable_array_class.get_layout_for_instances()
+        )
+
         # Setup the class reference for the nil object
         nilObject.set_class(self.nil_class)
 
@@ -259,6 +316,19 @@ class Universe(object):
         self._initialize_system_class(self.string_class, self.object_class, "String")
         self._initialize_system_class(self.symbol_class, self.string_class, "Symbol")
         self._initialize_system_class(self.double_class, self.object_class, "Double")
+        self._initialize_system_class(
+            self.mapped_byte_array_class, self.object_class, "MappedByteArray"
+        )
+        self._initialize_system_class(
+            self.byte_array_class, self.array_class, "ByteArray"
+        )
+        self._initialize_system_class(
+            self.hash_table_class, self.object_class, "HashTable"
+        )
+        self._initialize_system_class(self.json_class, self.object_class, "JSON")
+        self._initialize_system_class(
+            self.growable_array_class, self.object_class, "GrowableArray"
+        )
 
         # Load methods and fields into the system classes
         self._load_system_class(self.object_class)
@@ -273,6 +343,13 @@ class Universe(object):
         self._load_system_class(self.primitive_class)
         self._load_system_class(self.double_class)
 
+        # Classes provided by the VM, which may be extended on the class path
+        self._load_vm_class(self.mapped_byte_array_class)
+        self._load_vm_class(self.byte_array_class)
+        self._load_vm_class(self.hash_table_class)
+        self._load_vm_class(self.json_class)
+        self._load_vm_class(self.growable_array_class)
+
         # Load the generic block class
         self.block_class = self.load_class(symbol_for("Block"))
 
@@ -448,14 +525,36 @@ class Universe(object):
 
         self._load_primitives(result, True)
 
+    def _load_vm_class(self, vm_class):
+        # A VM class does not need a definition on the class path.
+        # If there is one, it is loaded to add the methods defined in SOM.
+        self._load_class(vm_class.get_name(), vm_class)
+        self._load_primitives(vm_class, True)
+
     def _load_class(self, name, system_class):
-        # Try loading the class from all different paths
+        class_name = name.get_embedded_string()
+        result = self._load_class_from_class_path(class_name, system_class)
+        if result is None and self._class_path_index.refresh():
+            # a file may have been added since the class path was indexed
+            result = self._load_class_from_class_path(class_name, system_class)
+        return result
+
+    def _load_class_from_class_path(self, class_name, system_class):
+        # Try loading the class from all paths that have a file for it
         for cp_entry in self.classpath:
+            if not self._class_path_index.has_class(cp_entry, class_name):
+                continue
             try:
                 # Load the class from a file and return the loaded class
-                result = compile_class_from_file(
-                    cp_entry, name.get_embedded_string(), system_class, self
-                )
+                source = self._class_path_index.read_class(cp_entry, class_name)
+                if source is None:
+                    result = compile_class_from_file(
+                        cp_entry, class_name, system_class, self
+                    )
+                else:
+                    result = compile_class_from_archive(
+                        source, cp_entry, class_name, system_class, self
+                    )
                 if self._dump_bytecodes:
                     from som.compiler.disassembler import dump
 
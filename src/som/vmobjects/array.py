@@ -2,7 +2,9 @@ from rlib.arithmetic import IntType
 from rlib.erased import new_erasing_pair
 from rlib.jit import JitDriver
 from rlib.debug import make_sure_not_resized
+from rlib.objectmodel import specialize
 
+from som.interpreter.send import lookup_and_send_2
 from som.vmobjects.abstract_object import AbstractObject
 from som.vm.globals import nilObject, falseObject, trueObject
 from som.vmobjects.double import Double
@@ -35,6 +37,11 @@ def put_all_bool_pl(block_method):
     return "#putAll: (bool_strategy) %s" % block_method.merge_point_string()
 
 
+def put_all_byte_pl(block_method):
+    assert isinstance(block_method, AbstractMethod)
+    return "#putAll: (byte_strategy) %s" % block_method.merge_point_string()
+
+
 put_all_obj_driver = JitDriver(
     greens=["block_method"],
     reds="auto",
@@ -59,6 +66,12 @@ put_all_long_driver = JitDriver(
     is_recursive=True,
     get_printable_location=put_all_long_pl,
 )
+put_all_byte_driver = JitDriver(
+    greens=["block_method"],
+    reds="auto",
+    is_recursive=True,
+    get_printable_location=put_all_byte_pl,
+)
 put_all_bool_driver = JitDriver(
     greens=["block_method"],
     reds="auto",
@@ -67,7 +80,76 @@ put_all_bool_driver = JitDriver(
 )
 
 
+@specialize.argtype(0)
+def _index_of(store, value):
+    for i, v in enumerate(store):
+        if v == value:
+            return i
+    return -1
+
+
+@specialize.argtype(0)
+def _copy_within(store, start, end, source_store, source_start):
+    """Copies source_store[source_start..] into store[start..end).
+    The two lists may be the same and the ranges may overlap."""
+    if store is source_store and start > source_start:
+        i = end - 1
+        while i >= start:
+            store[i] = source_store[source_start + i - start]
+            i -= 1
+    else:
+        i = start
+        while i < end:
+            store[i] = source_store[source_start + i - start]
+            i += 1
+
+
+def _is_byte(value):
+    return isinstance(value, Integer) and 0 <= value.get_embedded_integer() <= 255
+
+
 class _ArrayStrategy(object):
+    def can_store(self, value):  # pylint: disable=unused-argument
+        return True
+
+    def index_of(self, storage, value):
+        """Returns the 0-based index of the first element that is equal to value,
+        or -1. Elements are compared by sending #=."""
+        i = 0
+        size = self.get_size(storage)
+        while i < size:
+            if lookup_and_send_2(self.get_idx(storage, i), value, "=") is trueObject:
+                return i
+            i += 1
+        return -1
+
+    def replace_range(self, array, start, end, source, source_start):
+        self._replace_range_generic(array, start, end, source, source_start)
+
+    def _transition_to_object_array(self, array, idx, value):
+        new_store = self.as_arguments_array(array.storage)
+        new_store[idx] = value
+        array.storage = _ObjectStrategy.new_storage_with_values(new_store)
+        array.strategy = _obj_strategy
+
+    @staticmethod
+    def _replace_range_generic(array, start, end, source, source_start):
+        # copies element by element, which lets the array change its strategy
+        if source is array and start > source_start:
+            i = end - 1
+            while i >= start:
+                array.set_indexable_field(
+                    i, source.get_indexable_field(source_start + i - start)
+                )
+                i -= 1
+        else:
+            i = start
+            while i < end:
+                array.set_indexable_field(
+                    i, source.get_indexable_field(source_start + i - start)
+                )
+                i += 1
+
     @staticmethod
     def _set_all_with_value(array, value, size):
         if value is nilObject:
@@ -276,6 +358,28 @@ class _ObjectStrategy(_ArrayStrategy):
         store = self.unerase(storage)
         return Array(_obj_strategy, self.erase(store[:]))
 
+    def copy_range(self, storage, start, end):
+        store = self.unerase(storage)
+        assert 0 <= start <= end
+        return Array(_obj_strategy, self.erase(store[start:end]))
+
+    def reverse(self, storage):
+        new = self.unerase(storage)[:]
+        new.reverse()
+        return Array(_obj_strategy, self.erase(new))
+
+    def replace_range(self, array, start, end, source, source_start):
+        if source.strategy is not self:
+            self._replace_range_generic(array, start, end, source, source_start)
+            return
+        _copy_within(
+            self.unerase(array.storage),
+            start,
+            end,
+            self.unerase(source.storage),
+            source_start,
+        )
+
     def copy_and_extend_with(self, storage, value):
         store = self.unerase(storage)
         old_size = len(store)
@@ -310,16 +414,6 @@ class _LongStrategy(_ArrayStrategy):
         else:
             self._transition_to_object_array(array, idx, value)
 
-    def _transition_to_object_array(self, array, idx, value):
-        store = self.unerase(array.storage)
-        new_store = [None] * len(store)
-        for i, val in enumerate(store):
-            new_store[i] = Integer(val)
-
-        new_store[idx] = value
-        array.storage = _ObjectStrategy.new_storage_with_values(new_store)
-        array.strategy = _obj_strategy
-
     def set_all(self, array, value):
         assert isinstance(array, Array)
 
@@ -360,6 +454,33 @@ class _LongStrategy(_ArrayStrategy):
         store = self.unerase(storage)
         return Array(_long_strategy, self.erase(store[:]))
 
+    def copy_range(self, storage, start, end):
+        store = self.unerase(storage)
+        assert 0 <= start <= end
+        return Array(_long_strategy, self.erase(store[start:end]))
+
+    def reverse(self, storage):
+        new = self.unerase(storage)[:]
+        new.reverse()
+        return Array(_long_strategy, self.erase(new))
+
+    def index_of(self, storage, value):
+        if isinstance(value, Integer):
+            return _index_of(self.unerase(storage), value.get_embedded_integer())
+        return _ArrayStrategy.index_of(self, storage, value)
+
+    def replace_range(self, array, start, end, source, source_start):
+        if source.strategy is not self:
+            self._replace_range_generic(array, start, end, source, source_start)
+            return
+        _copy_within(
+            self.unerase(array.storage),
+            start,
+            end,
+            self.unerase(source.storage),
+            source_start,
+        )
+
     def copy_and_extend_with(self, storage, value):
         assert isinstance(value, Integer)
         store = self.unerase(storage)
@@ -389,9 +510,11 @@ class _DoubleStrategy(_ArrayStrategy):
 
     def set_idx(self, array, idx, value):
         assert isinstance(array, Array)
-        assert isinstance(value, Double)
-        store = self.unerase(array.storage)
-        store[idx] = value.get_embedded_double()
+        if isinstance(value, Double):
+            store = self.unerase(array.storage)
+            store[idx] = value.get_embedded_double()
+        else:
+            self._transition_to_object_array(array, idx, value)
 
     def set_all(self, array, value):
         assert isinstance(array, Array)
@@ -433,6 +556,33 @@ class _DoubleStrategy(_ArrayStrategy):
         store = self.unerase(storage)
         return Array(_double_strategy, self.erase(store[:]))
 
+    def copy_range(self, storage, start, end):
+        store = self.unerase(storage)
+        assert 0 <= start <= end
+        return Array(_double_strategy, self.erase(store[start:end]))
+
+    def reverse(self, storage):
+        new = self.unerase(storage)[:]
+        new.reverse()
+        return Array(_double_strategy, self.erase(new))
+
+    def index_of(self, storage, value):
+        if isinstance(value, Double):
+            return _index_of(self.unerase(storage), value.get_embedded_double())
+        return _ArrayStrategy.index_of(self, storage, value)
+
+    def replace_range(self, array, start, end, source, source_start):
+        if source.strategy is not self:
+            self._replace_range_generic(array, start, end, source, source_start)
+            return
+        _copy_within(
+            self.unerase(array.storage),
+            start,
+            end,
+            self.unerase(source.storage),
+            source_start,
+        )
+
     def copy_and_extend_with(self, storage, value):
         assert isinstance(value, Double)
         store = self.unerase(storage)
@@ -462,9 +612,11 @@ class _BoolStrategy(_ArrayStrategy):
 
     def set_idx(self, array, idx, value):
         assert isinstance(array, Array)
-        assert value is trueObject or value is falseObject
-        store = self.unerase(array.storage)
-        store[idx] = value is trueObject
+        if value is trueObject or value is falseObject:
+            store = self.unerase(array.storage)
+            store[idx] = value is trueObject
+        else:
+            self._transition_to_object_array(array, idx, value)
 
     def set_all(self, array, value):
         assert isinstance(array, Array)
@@ -506,6 +658,33 @@ class _BoolStrategy(_ArrayStrategy):
         store = self.unerase(storage)
         return Array(_bool_strategy, self.erase(store[:]))
 
+    def copy_range(self, storage, start, end):
+        store = self.unerase(storage)
+        assert 0 <= start <= end
+        return Array(_bool_strategy, self.erase(store[start:end]))
+
+    def reverse(self, storage):
+        new = self.unerase(storage)[:]
+        new.reverse()
+        return Array(_bool_strategy, self.erase(new))
+
+    def index_of(self, storage, value):
+        if value is trueObject or value is falseObject:
+            return _index_of(self.unerase(storage), value is trueObject)
+        return _ArrayStrategy.index_of(self, storage, value)
+
+    def replace_range(self, array, start, end, source, source_start):
+        if source.strategy is not self:
+            self._replace_range_generic(array, start, end, source, source_start)
+            return
+        _copy_within(
+            self.unerase(array.storage),
+            start,
+            end,
+            self.unerase(source.storage),
+            source_start,
+        )
+
     def copy_and_extend_with(self, storage, value):
         assert value is trueObject or value is falseObject
         store = self.unerase(storage)
@@ -522,6 +701,109 @@ class _BoolStrategy(_ArrayStrategy):
         return Array(_bool_strategy, self.erase(new))
 
 
+class _ByteStrategy(_ArrayStrategy):
+    # Bytes are stored as a list of characters, which RPython represents
+    # compactly with one byte per element.
+    # This strategy is only used by ByteArray. It does not generalize,
+    # so the primitives check with can_store() that only values in the
+    # range of [0..255] are stored.
+    erase, unerase = new_erasing_pair("byte_list")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def can_store(self, value):
+        return _is_byte(value)
+
+    def get_idx(self, storage, idx):
+        store = self.unerase(storage)
+        return Integer(ord(store[idx]))
+
+    def set_idx(self, array, idx, value):
+        assert isinstance(array, ByteArray)
+        assert _is_byte(value)
+        store = self.unerase(array.storage)
+        store[idx] = chr(value.get_embedded_integer())
+
+    def set_all(self, array, value):
+        assert isinstance(array, ByteArray)
+        assert _is_byte(value)
+        store = self.unerase(array.storage)
+        byte = chr(value.get_embedded_integer())
+        for i in range(len(store)):
+            store[i] = byte
+
+    def set_all_with_block(self, array, block):
+        assert isinstance(array, ByteArray)
+        store = self.unerase(array.storage)
+        block_method = block.get_method()
+
+        i = 0
+        size = len(store)
+        while i < size:
+            put_all_byte_driver.jit_merge_point(block_method=block_method)
+            value = block_method.invoke_1(block)
+            if not _is_byte(value):
+                return value
+            store[i] = chr(value.get_embedded_integer())
+            i += 1
+        return None
+
+    def as_arguments_array(self, storage):
+        store = self.unerase(storage)
+        return [Integer(ord(v)) for v in store]
+
+    def get_size(self, storage):
+        return len(self.unerase(storage))
+
+    @staticmethod
+    def new_storage_for(size):
+        return _ByteStrategy.erase(["\x00"] * size)
+
+    @staticmethod
+    def new_storage_with_values(values):
+        assert isinstance(values, list)
+        make_sure_not_resized(values)
+        new = [chr(v.get_embedded_integer()) for v in values]
+        return _ByteStrategy.erase(new)
+
+    def copy(self, storage):
+        store = self.unerase(storage)
+        return ByteArray(self.erase(store[:]))
+
+    def copy_range(self, storage, start, end):
+        store = self.unerase(storage)
+        assert 0 <= start <= end
+        return ByteArray(self.erase(store[start:end]))
+
+    def reverse(self, storage):
+        new = self.unerase(storage)[:]
+        new.reverse()
+        return ByteArray(self.erase(new))
+
+    def index_of(self, storage, value):
+        if _is_byte(value):
+            return _index_of(self.unerase(storage), chr(value.get_embedded_integer()))
+        return _ArrayStrategy.index_of(self, storage, value)
+
+    def replace_range(self, array, start, end, source, source_start):
+        if source.strategy is not self:
+            self._replace_range_generic(array, start, end, source, source_start)
+            return
+        _copy_within(
+            self.unerase(array.storage),
+            start,
+            end,
+            self.unerase(source.storage),
+            source_start,
+        )
+
+    def copy_and_extend_with(self, storage, value):
+        assert isinstance(value, Integer)
+        store = self.unerase(storage)
+        new = store + [chr(value.get_embedded_integer())]
+        return ByteArray(self.erase(new))
+
+
 class _EmptyStrategy(_ArrayStrategy):
     # We have these basic erase/unerase methods, and then the once to be used, which
     # do also the wrapping with Integer objects of the integer value
@@ -591,6 +873,12 @@ class _EmptyStrategy(_ArrayStrategy):
     def copy(self, storage):
         return Array(_empty_strategy, storage)
 
+    def copy_range(self, storage, start, end):
+        return Array.from_size(end - start)
+
+    def reverse(self, storage):
+        return Array(_empty_strategy, storage)
+
     def copy_and_extend_with(self, storage, value):
         size = self.unerase(storage)
         if value is nilObject:
@@ -707,10 +995,20 @@ class _PartiallyEmptyStrategy(_ArrayStrategy):
 
     def copy(self, storage):
         store = self.unerase(storage)
-        return Array(
-            _partially_empty_strategy,
-            self.erase(_PartialStorage.from_obj_values(store.storage[:])),
+        new_store = _PartialStorage(
+            store.storage[:], store.size, store.empty_elements, store.type
         )
+        return Array(_partially_empty_strategy, self.erase(new_store))
+
+    def copy_range(self, storage, start, end):
+        store = self.unerase(storage)
+        assert 0 <= start <= end
+        return Array.from_values(store.storage[start:end])
+
+    def reverse(self, storage):
+        new = self.unerase(storage).storage[:]
+        new.reverse()
+        return Array.from_values(new)
 
     def copy_and_extend_with(self, storage, value):
         store = self.unerase(storage)
@@ -732,6 +1030,7 @@ _obj_strategy = _ObjectStrategy()
 _long_strategy = _LongStrategy()
 _double_strategy = _DoubleStrategy()
 _bool_strategy = _BoolStrategy()
+_byte_strategy = _ByteStrategy()
 _empty_strategy = _EmptyStrategy()
 _partially_empty_strategy = _PartiallyEmptyStrategy()
 
@@ -741,8 +1040,10 @@ def _determine_strategy(values):
     only_double = True
     only_long = True
     only_bool = True
+    has_nil = False
     for value in values:
         if value is None or value is nilObject:
+            has_nil = True
             continue
         if isinstance(value, int) or isinstance(value, Integer):
             is_empty = False
@@ -766,6 +1067,9 @@ def _determine_strategy(values):
 
     if is_empty:
         return _empty_strategy
+    if has_nil:
+        # the typed strategies cannot represent nil
+        return _obj_strategy
     if only_double:
         return _double_strategy
     if only_long:
@@ -797,6 +1101,10 @@ class Array(AbstractObject):
     def from_integers(ints):
         return Array(_long_strategy, _long_strategy.erase(ints))
 
+    @staticmethod
+    def from_doubles(doubles):
+        return Array(_double_strategy, _double_strategy.erase(doubles))
+
     @staticmethod
     def from_objects(values):
         make_sure_not_resized(values)
@@ -805,6 +1113,8 @@ class Array(AbstractObject):
     def __init__(self, strategy, storage):  # pylint: disable=super-init-not-called
         self.strategy = strategy
         self.storage = storage
+        # the storage may be used by another array, see copy_on_write()
+        self._shared = False
 
     def get_indexable_field(self, index):
         # Get the indexable field with the given index
@@ -812,13 +1122,22 @@ class Array(AbstractObject):
 
     def set_indexable_field(self, index, value):
         # Set the indexable field with the given index to the given value
+        self.unshare_storage()
         self.strategy.set_idx(self, index, value)
 
     def set_all(self, value):
+        self.unshare_storage()
         self.strategy.set_all(self, value)
 
     def set_all_with_block(self, block):
-        self.strategy.set_all_with_block(self, block)
+        """Returns the first value of the block that the array cannot store,
+        after storing the values before it, or None."""
+        self.unshare_storage()
+        return self.strategy.set_all_with_block(self, block)
+
+    def can_store(self, value):
+        """Returns False only for a value that a ByteArray cannot store"""
+        return self.strategy.can_store(value)
 
     def as_argument_array(self):
         return self.strategy.as_arguments_array(self.storage)
@@ -828,13 +1147,100 @@ class Array(AbstractObject):
         return self.strategy.get_size(self.storage)
 
     def copy(self):
-        return self.strategy.copy(self.storage)
+        return self.copy_on_write()
 
     def copy_and_extend_with(self, value):
         return self.strategy.copy_and_extend_with(self.storage, value)
 
+    def copy_on_write(self):
+        """Returns a copy that shares the storage with this array.
+        The storage is copied only before one of the arrays is changed.
+        Both arrays stay marked as shared, even if the other one is gone,
+        so the first change of each may copy unnecessarily."""
+        if isinstance(self, ByteArray):
+            copy = ByteArray(self.storage)
+        else:
+            copy = Array(self.strategy, self.storage)
+        copy._shared = True  # pylint: disable=protected-access
+        self._shared = True
+        return copy
+
+    def unshare_storage(self):
+        """Needs to be called before changing the storage in place"""
+        if self._shared:
+            self.storage = self.strategy.copy(self.storage).storage
+            self._shared = False
+
+    def is_valid_range(self, start, end):
+        """start and end are 0-based, end is exclusive"""
+        return 0 <= start <= end <= self.get_number_of_indexable_fields()
+
+    def copy_range(self, start, end):
+        """start and end are 0-based, end is exclusive"""
+        return self.strategy.copy_range(self.storage, start, end)
+
+    def replace_range(self, start, end, source, source_start):
+        """Copies the elements of source, which may be self, into [start..end)"""
+        self.unshare_storage()
+        self.strategy.replace_range(self, start, end, source, source_start)
+
+    def index_of(self, value):
+        """Returns the 0-based index of value, or -1 if it is not found"""
+        return self.strategy.index_of(self.storage, value)
+
+    def reverse(self):
+        return self.strategy.reverse(self.storage)
+
+    def get_long_storage(self):
+        """Returns the unboxed storage for the long strategy, or None"""
+        if self.strategy is _long_strategy:
+            return _long_strategy.unerase(self.storage)
+        return None
+
+    def get_double_storage(self):
+        """Returns the unboxed storage for the double strategy, or None"""
+        if self.strategy is _double_strategy:
+            return _double_strategy.unerase(self.storage)
+        return None
+
+    def set_double_storage(self, doubles):
+        assert not isinstance(self, ByteArray)
+        self.strategy = _double_strategy
+        self.storage = _double_strategy.erase(doubles)
+        self._shared = False
+
     def get_class(self, universe):
         return universe.array_class
 
     def get_object_layout(self, universe):
         return universe.array_layout
+
+
+class ByteArray(Array):
+    """An array that holds only bytes, i.e., integers in the range [0..255].
+    Range checks are done by the primitives, see Array.can_store()."""
+
+    @staticmethod
+    def from_size(size):
+        return ByteArray(_byte_strategy.new_storage_for(size))
+
+    @staticmethod
+    def from_string(string):
+        return ByteArray(_byte_strategy.erase([c for c in string]))
+
+    def __init__(self, storage):  # pylint: disable=super-init-not-called
+        self.strategy = _byte_strategy
+        self.storage = storage
+        self._shared = False
+
+    def get_byte(self, index):
+        return ord(_byte_strategy.unerase(self.storage)[index])
+
+    def as_string(self):
+        return "".join(_byte_strategy.unerase(self.storage))
+
+    def get_class(self, universe):
+        return universe.byte_array_class
+
+    def get_object_layout(self, universe):
+        return universe.byte_array_layout
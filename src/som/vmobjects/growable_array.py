@@ -0,0 +1,191 @@
+from som.vm.globals import nilObject
+from som.vmobjects.abstract_object import AbstractObject
+from som.vmobjects.array import Array
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+
+# The kinds of storage, from most to least specific.
+# Integers and Doubles are stored unboxed, as long as all elements have the
+# same type. Anything else moves the elements into an object list.
+_EMPTY = 0
+_LONG = 1
+_DOUBLE = 2
+_OBJECT = 3
+
+DEFAULT_CAPACITY = 8
+
+
+class GrowableArray(AbstractObject):
+    """A sequence that grows at its end and can shrink at both ends.
+
+    The elements are kept in _first ... _first + _size - 1 of a list with
+    spare capacity, which is doubled when full. This makes append: and
+    removeFirst amortized constant time.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        AbstractObject.__init__(self)
+        self._kind = _EMPTY
+        self._capacity = max(capacity, 1)
+        self._first = 0
+        self._size = 0
+        self._longs = None
+        self._doubles = None
+        self._objects = None
+
+    def get_size(self):
+        return self._size
+
+    def _has_room(self):
+        return self._first + self._size < self._capacity
+
+    def _new_capacity(self):
+        """Removed elements at the front are reused before growing."""
+        if self._size * 2 <= self._capacity:
+            return self._capacity
+        return self._capacity * 2
+
+    def _grow(self):
+        capacity = self._new_capacity()
+        first = self._first
+        end = first + self._size
+
+        if self._kind == _LONG:
+            longs = [0] * capacity
+            for i in range(first, end):
+                longs[i - first] = self._longs[i]
+            self._longs = longs
+        elif self._kind == _DOUBLE:
+            doubles = [0.0] * capacity
+            for i in range(first, end):
+                doubles[i - first] = self._doubles[i]
+            self._doubles = doubles
+        elif self._kind == _OBJECT:
+            objects = [None] * capacity
+            for i in range(first, end):
+                objects[i - first] = self._objects[i]
+            self._objects = objects
+
+        self._capacity = capacity
+        self._first = 0
+
+    def _transition_to_objects(self):
+        objects = [None] * self._capacity
+        for i in range(self._first, self._first + self._size):
+            objects[i] = self._get(i)
+        self._objects = objects
+        self._longs = None
+        self._doubles = None
+        self._kind = _OBJECT
+
+    def _start_with(self, value):
+        assert self._size == 0
+        if isinstance(value, Integer):
+            self._kind = _LONG
+            self._longs = [0] * self._capacity
+        elif isinstance(value, Double):
+            self._kind = _DOUBLE
+            self._doubles = [0.0] * self._capacity
+        else:
+            self._kind = _OBJECT
+            self._objects = [None] * self._capacity
+
+    def _fits(self, value):
+        kind = self._kind
+        if kind == _LONG:
+            return isinstance(value, Integer)
+        if kind == _DOUBLE:
+            return isinstance(value, Double)
+        return True
+
+    def _get(self, index):
+        kind = self._kind
+        if kind == _LONG:
+            return Integer(self._longs[index])
+        if kind == _DOUBLE:
+            return Double(self._doubles[index])
+        assert kind == _OBJECT
+        return self._objects[index]
+
+    def _set(self, index, value):
+        kind = self._kind
+        if kind == _LONG:
+            assert isinstance(value, Integer)
+            self._longs[index] = value.get_embedded_integer()
+        elif kind == _DOUBLE:
+            assert isinstance(value, Double)
+            self._doubles[index] = value.get_embedded_double()
+        else:
+            assert kind == _OBJECT
+            self._objects[index] = value
+
+    def append(self, value):
+        if self._size == 0:
+            self._first = 0
+            if self._kind == _EMPTY or not self._fits(value):
+                self._start_with(value)
+        elif not self._fits(value):
+            self._transition_to_objects()
+
+        if not self._has_room():
+            self._grow()
+        self._set(self._first + self._size, value)
+        self._size += 1
+
+    def get(self, index):
+        """index is 0-based and needs to be valid"""
+        assert 0 <= index < self._size
+        return self._get(self._first + index)
+
+    def set(self, index, value):
+        """index is 0-based and needs to be valid"""
+        assert 0 <= index < self._size
+        if not self._fits(value):
+            self._transition_to_objects()
+        self._set(self._first + index, value)
+
+    def remove_first(self):
+        """Returns the first element, or None if empty."""
+        if self._size == 0:
+            return None
+        index = self._first
+        value = self._get(index)
+        if self._kind == _OBJECT:
+            self._objects[index] = None
+        self._first += 1
+        self._size -= 1
+        return value
+
+    def remove_last(self):
+        """Returns the last element, or None if empty."""
+        if self._size == 0:
+            return None
+        index = self._first + self._size - 1
+        value = self._get(index)
+        if self._kind == _OBJECT:
+            self._objects[index] = None
+        self._size -= 1
+        return value
+
+    def as_array(self):
+        start = self._first
+        end = start + self._size
+        kind = self._kind
+        if self._size == 0:
+            return Array.from_size(0)
+        if kind == _LONG:
+            return Array.from_integers(self._longs[start:end])
+        if kind == _DOUBLE:
+            return Array.from_doubles(self._doubles[start:end])
+        values = [nilObject] * self._size
+        for i in range(self._size):
+            value = self._objects[start + i]
+            assert value is not None
+            values[i] = value
+        return Array.from_values(values)
+
+    def get_class(self, universe):
+        return universe.growable_array_class
+
+    def get_object_layout(self, universe):
+        return universe.growable_array_layout
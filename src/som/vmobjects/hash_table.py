@@ -0,0 +1,104 @@
+from rlib.objectmodel import r_dict, compute_hash, compute_identity_hash
+
+from som.interpreter.send import lookup_and_send_1, lookup_and_send_2
+from som.vm.globals import trueObject
+from som.vmobjects.abstract_object import AbstractObject
+from som.vmobjects.integer import Integer
+from som.vmobjects.string import String
+
+
+def _key_eq(key_a, key_b):
+    if key_a is key_b:
+        return True
+    if isinstance(key_a, String):
+        return (
+            isinstance(key_b, String)
+            and key_a.get_embedded_string() == key_b.get_embedded_string()
+        )
+    if isinstance(key_a, Integer):
+        return (
+            isinstance(key_b, Integer)
+            and key_a.get_embedded_integer() == key_b.get_embedded_integer()
+        )
+    return lookup_and_send_2(key_a, key_b, "=") is trueObject
+
+
+def _key_hash(key):
+    if isinstance(key, String):
+        return key.get_hash()
+    if isinstance(key, Integer):
+        return compute_hash(key.get_embedded_integer())
+    hashcode = lookup_and_send_1(key, "hashcode")
+    if isinstance(hashcode, Integer):
+        return hashcode.get_embedded_integer()
+    return 0
+
+
+def _identity_key_eq(key_a, key_b):
+    # Integers are boxed, but identical if they have the same value
+    if isinstance(key_a, Integer):
+        return (
+            isinstance(key_b, Integer)
+            and key_a.get_embedded_integer() == key_b.get_embedded_integer()
+        )
+    return key_a is key_b
+
+
+def _identity_key_hash(key):
+    if isinstance(key, Integer):
+        return compute_hash(key.get_embedded_integer())
+    return compute_identity_hash(key)
+
+
+class HashTable(AbstractObject):
+    """A hash table mapping keys to values, to implement dictionaries and sets.
+
+    Strings, Symbols and Integers are hashed and compared directly. Other keys
+    are compared with #= and hashed with #hashcode, unless the table compares
+    keys by identity.
+    """
+
+    _immutable_fields_ = ["_is_identity"]
+
+    def __init__(self, is_identity):
+        AbstractObject.__init__(self)
+        self._is_identity = is_identity
+        if is_identity:
+            self._table = r_dict(_identity_key_eq, _identity_key_hash)
+        else:
+            self._table = r_dict(_key_eq, _key_hash)
+
+    def is_identity(self):
+        return self._is_identity
+
+    def get(self, key):
+        """Returns the value for the key, or None"""
+        return self._table.get(key, None)
+
+    def put(self, key, value):
+        self._table[key] = value
+
+    def contains_key(self, key):
+        return key in self._table
+
+    def remove(self, key):
+        """Returns the removed value, or None"""
+        return self._table.pop(key, None)
+
+    def remove_all(self):
+        self._table.clear()
+
+    def size(self):
+        return len(self._table)
+
+    def get_keys(self):
+        return self._table.keys()
+
+    def get_values(self):
+        return self._table.values()
+
+    def get_class(self, universe):
+        return universe.hash_table_class
+
+    def get_object_layout(self, universe):
+        return universe.hash_table_layout
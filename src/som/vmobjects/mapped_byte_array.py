@@ -0,0 +1,74 @@
+import os
+
+from rlib.rmmap import mmap, ACCESS_READ, MapError
+
+from som.vmobjects.abstract_object import AbstractObject
+
+
+class MappedByteArray(AbstractObject):
+    """A read-only view on a memory-mapped file.
+
+    The bytes are accessed directly in the mapping, i.e., nothing is copied
+    into the heap until a part of the file is explicitly extracted.
+    """
+
+    _immutable_fields_ = ["_size"]
+
+    def __init__(self, mapping, size):
+        AbstractObject.__init__(self)
+        self._mapping = mapping
+        self._size = size
+
+    @staticmethod
+    def map_file(file_name):
+        """Returns a new mapping of the file, or None if it cannot be mapped."""
+        try:
+            fd = os.open(file_name, os.O_RDONLY, 0)
+        except OSError:
+            return None
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                # empty files cannot be mapped, but there is nothing to map
+                return MappedByteArray(None, 0)
+            return MappedByteArray(mmap(fd, size, access=ACCESS_READ), size)
+        except (OSError, MapError):
+            return None
+        finally:
+            # the mapping keeps its own reference to the file
+            os.close(fd)
+
+    def get_size(self):
+        return self._size
+
+    def is_closed(self):
+        return self._mapping is None and self._size > 0
+
+    def is_valid_range(self, start, end):
+        """start and end are 0-based, end is exclusive"""
+        return 0 <= start <= end <= self._size and not self.is_closed()
+
+    def get_byte(self, index):
+        assert 0 <= index < self._size
+        return ord(self._mapping.getitem(index))
+
+    def get_string(self, start, end):
+        if start == end:
+            return ""
+        return self._mapping.getslice(start, end - start)
+
+    def index_of(self, string, start):
+        if self._mapping is None or string == "":
+            return -1
+        return self._mapping.find(string, start, self._size)
+
+    def close(self):
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def get_class(self, universe):
+        return universe.mapped_byte_array_class
+
+    def get_object_layout(self, universe):
+        return universe.mapped_byte_array_layout
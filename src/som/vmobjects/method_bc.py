@@ -6,6 +6,7 @@ from som.compiler.bc.bytecode_generator import (
     emit1,
     emit3,
     emit_push_constant,
+    emit_push_literal_array,
     emit_return_local,
     emit_return_non_local,
     emit_send,
@@ -14,6 +15,7 @@ from som.compiler.bc.bytecode_generator import (
     emit_push_block,
     emit_push_field_with_index,
     emit_pop_field_with_index,
+    emit_pop_local,
     emit3_with_dummy,
     compute_offset,
 )
@@ -38,6 +40,11 @@ from som.interpreter.bc.frame import (
     create_frame_3,
 )
 from som.interpreter.bc.interpreter import interpret
+from som.interpreter.bc.send_inlining import (
+    INLINING_THRESHOLD,
+    create_version_with_inlined_sends,
+    is_send_inlining_enabled,
+)
 from som.interpreter.control_flow import ReturnException
 from som.vmobjects.abstract_object import AbstractObject
 from som.vmobjects.method import AbstractMethod
@@ -56,6 +63,7 @@ class BcAbstractMethod(AbstractMethod):
         "_size_inner",
         "_lexical_scope",
         "_inlined_loops[*]",
+        "_version?",
     ]
 
     def __init__(
@@ -91,6 +99,10 @@ class BcAbstractMethod(AbstractMethod):
 
         self._inlined_loops = inlined_loops
 
+        # the version used for invocations, see send_inlining.py
+        self._version = None
+        self._invocation_count = 0
+
     def get_number_of_locals(self):
         return self._number_of_locals
 
@@ -124,6 +136,23 @@ class BcAbstractMethod(AbstractMethod):
     def get_number_of_signature_arguments(self):
         return self._number_of_arguments
 
+    def get_literal(self, index):
+        return self._literals[index]
+
+    def get_number_of_literals(self):
+        return len(self._literals)
+
+    def get_size_frame(self):
+        return self._size_frame
+
+    def get_size_inner(self):
+        return self._size_inner
+
+    def runs_as(self, method):
+        """Whether invoking this method executes the given method, which is
+        either this method itself or its version with inlined sends."""
+        return self is method or self._version is method
+
     def get_number_of_bytecodes(self):
         # Get the number of bytecodes in this method
         return len(self._bytecodes)
@@ -170,25 +199,27 @@ class BcAbstractMethod(AbstractMethod):
 
             cache = cache.next_entry
 
-    def patch_variable_access(self, bytecode_index):
+    def get_variable(self, bytecode_index):
+        """The variable accessed by an unpatched push/pop_argument/local."""
         bc = self.get_bytecode(bytecode_index)
         idx = self.get_bytecode(bytecode_index + 1)
         ctx_level = self.get_bytecode(bytecode_index + 2)
 
-        if bc == Bytecodes.push_argument:
-            var = self._lexical_scope.get_argument(idx, ctx_level)
-            self.set_bytecode(bytecode_index, var.get_push_bytecode(ctx_level))
-        elif bc == Bytecodes.pop_argument:
-            var = self._lexical_scope.get_argument(idx, ctx_level)
-            self.set_bytecode(bytecode_index, var.get_pop_bytecode(ctx_level))
-        elif bc == Bytecodes.push_local:
-            var = self._lexical_scope.get_local(idx, ctx_level)
+        if bc == Bytecodes.push_argument or bc == Bytecodes.pop_argument:
+            return self._lexical_scope.get_argument(idx, ctx_level)
+        if bc == Bytecodes.push_local or bc == Bytecodes.pop_local:
+            return self._lexical_scope.get_local(idx, ctx_level)
+        raise Exception("Unsupported bytecode?")
+
+    def patch_variable_access(self, bytecode_index):
+        bc = self.get_bytecode(bytecode_index)
+        ctx_level = self.get_bytecode(bytecode_index + 2)
+        var = self.get_variable(bytecode_index)
+
+        if bc == Bytecodes.push_argument or bc == Bytecodes.push_local:
             self.set_bytecode(bytecode_index, var.get_push_bytecode(ctx_level))
-        elif bc == Bytecodes.pop_local:
-            var = self._lexical_scope.get_local(idx, ctx_level)
-            self.set_bytecode(bytecode_index, var.get_pop_bytecode(ctx_level))
         else:
-            raise Exception("Unsupported bytecode?")
+            self.set_bytecode(bytecode_index, var.get_pop_bytecode(ctx_level))
         assert (
             FRAME_AND_INNER_RCVR_IDX <= var.access_idx <= 255
         ), "Expected variable access index to be in valid range, but was " + str(
@@ -212,50 +243,137 @@ def _interp_with_nlr(method, new_frame, max_stack_size):
 
 
 class BcMethod(BcAbstractMethod):
+    def _get_version(self):
+        version = self._version
+        if version is None:
+            return self._count_invocation()
+        return version
+
+    @jit.dont_look_inside
+    def _count_invocation(self):
+        if not is_send_inlining_enabled():
+            self._version = self
+            return self
+
+        self._invocation_count += 1
+        if self._invocation_count < INLINING_THRESHOLD:
+            return self
+
+        version = create_version_with_inlined_sends(self)
+        if version is None:
+            version = self
+        self._version = version
+        return version
+
+    def create_version(self, bytecodes, inline_caches, literals, size_frame, max_stack):
+        """A copy of this method with new bytecodes, used by send inlining.
+        The frame of the copy has extra slots after the ones of this method."""
+        if isinstance(self, BcMethodNLR):
+            version = BcMethodNLR(
+                literals,
+                self._number_of_locals + size_frame - self._size_frame,
+                max_stack,
+                len(bytecodes),
+                self._signature,
+                self._arg_inner_access,
+                size_frame,
+                self._size_inner,
+                self._lexical_scope,
+                [],
+            )
+        else:
+            version = BcMethod(
+                literals,
+                self._number_of_locals + size_frame - self._size_frame,
+                max_stack,
+                len(bytecodes),
+                self._signature,
+                self._arg_inner_access,
+                size_frame,
+                self._size_inner,
+                self._lexical_scope,
+                [],
+            )
+        for i, bytecode in enumerate(bytecodes):
+            version.set_bytecode(i, bytecode)
+            version.set_inline_cache(i, inline_caches[i])
+        version.set_holder(self._holder)
+        version._version = version  # pylint: disable=protected-access
+        return version
+
     def invoke_1(self, rcvr):
-        new_frame = create_frame_1(rcvr, self._size_frame, self._size_inner)
-        return interpret(self, new_frame, self._maximum_number_of_stack_elements)
+        method = self._get_version()
+        new_frame = create_frame_1(rcvr, method._size_frame, self._size_inner)
+        return interpret(method, new_frame, method._maximum_number_of_stack_elements)
 
     def invoke_2(self, rcvr, arg1):
+        method = self._get_version()
         new_frame = create_frame_2(
             rcvr,
             arg1,
             self._arg_inner_access[0],
-            self._size_frame,
+            method._size_frame,
             self._size_inner,
         )
-        return interpret(self, new_frame, self._maximum_number_of_stack_elements)
+        return interpret(method, new_frame, method._maximum_number_of_stack_elements)
 
     def invoke_3(self, rcvr, arg1, arg2):
+        method = self._get_version()
         new_frame = create_frame_3(
             self._arg_inner_access,
-            self._size_frame,
+            method._size_frame,
             self._size_inner,
             rcvr,
             arg1,
             arg2,
         )
-        return interpret(self, new_frame, self._maximum_number_of_stack_elements)
+        return interpret(method, new_frame, method._maximum_number_of_stack_elements)
 
     def invoke_n(self, stack, stack_ptr):
+        method = self._get_version()
         new_frame = create_frame(
             self._arg_inner_access,
-            self._size_frame,
+            method._size_frame,
             self._size_inner,
             stack,
             stack_ptr,
             self._number_of_arguments,
         )
 
-        result = interpret(self, new_frame, self._maximum_number_of_stack_elements)
+        result = interpret(method, new_frame, method._maximum_number_of_stack_elements)
         return stack_pop_old_arguments_and_push_result(
             stack, stack_ptr, self._number_of_arguments, result
         )
 
+    def activate_from_stack(self, stack, stack_ptr):
+        """Returns the method to be executed, and its frame with receiver
+        and arguments from the stack. The caller runs it in its own loop."""
+        method = self._get_version()
+        new_frame = create_frame(
+            self._arg_inner_access,
+            method._size_frame,
+            self._size_inner,
+            stack,
+            stack_ptr,
+            self._number_of_arguments,
+        )
+        return method, new_frame
+
     def inline(self, mgenc):
         mgenc.merge_into_scope(self._lexical_scope)
         self._inline_into(mgenc)
 
+    def is_argument_captured(self, idx):
+        return self._lexical_scope.get_argument(idx, 0).is_accessed_out_of_context()
+
+    def inline_with_argument_from_stack(self, mgenc):
+        """Inline a block with a single argument, which is initialized with
+        the value on top of the stack."""
+        mgenc.merge_into_scope(self._lexical_scope)
+        arg = self._lexical_scope.get_argument(1, 0)
+        emit_pop_local(mgenc, mgenc.get_inlined_local_idx(arg, 0), 0)
+        self._inline_into(mgenc)
+
     def _create_back_jump_heap(self):
         heap = []
         if self._inlined_loops:
@@ -306,9 +424,21 @@ class BcMethod(BcAbstractMethod):
             if bytecode == Bytecodes.halt:
                 emit1(mgenc, bytecode, 0)
 
-            elif bytecode == Bytecodes.dup:
+            elif bytecode == Bytecodes.dup or bytecode == Bytecodes.dup_second:
                 emit1(mgenc, bytecode, 1)
 
+            elif (
+                bytecode == Bytecodes.push_argument
+                or bytecode == Bytecodes.pop_argument
+            ) and self.get_bytecode(i + 2) == 0:
+                # the argument of a loop body, it became a local of the outer context
+                var = self._lexical_scope.get_argument(self.get_bytecode(i + 1), 0)
+                idx = mgenc.get_inlined_local_idx(var, 0)
+                if bytecode == Bytecodes.push_argument:
+                    emit3(mgenc, Bytecodes.push_local, idx, 0, 1)
+                else:
+                    emit3(mgenc, Bytecodes.pop_local, idx, 0, -1)
+
             elif (
                 bytecode == Bytecodes.push_field
                 or bytecode == Bytecodes.pop_field
@@ -391,6 +521,11 @@ class BcMethod(BcAbstractMethod):
             elif bytecode == Bytecodes.inc or bytecode == Bytecodes.dec:
                 emit1(mgenc, bytecode, 0)
 
+            elif bytecode == Bytecodes.push_literal_array:
+                literal_idx = self.get_bytecode(i + 1)
+                literal = self._literals[literal_idx]
+                emit_push_literal_array(mgenc, literal)
+
             elif bytecode == Bytecodes.push_global:
                 literal_idx = self.get_bytecode(i + 1)
                 sym = self._literals[literal_idx]
@@ -419,6 +554,7 @@ class BcMethod(BcAbstractMethod):
                 new_ctx_level = self.get_bytecode(i + 1) - 1
                 if new_ctx_level == 0:
                     emit_return_local(mgenc)
+                    mgenc.make_non_local_return_local()
                 else:
                     assert new_ctx_level == mgenc.get_max_context_level()
                     emit_return_non_local(mgenc)
@@ -436,11 +572,15 @@ class BcMethod(BcAbstractMethod):
                 or bytecode == Bytecodes.jump_on_false_top_nil
                 or bytecode == Bytecodes.jump_on_not_nil_top_top
                 or bytecode == Bytecodes.jump_on_nil_top_top
+                or bytecode == Bytecodes.jump_if_greater
+                or bytecode == Bytecodes.jump_if_less
                 or bytecode == Bytecodes.jump2
                 or bytecode == Bytecodes.jump2_on_true_top_nil
                 or bytecode == Bytecodes.jump2_on_false_top_nil
                 or bytecode == Bytecodes.jump2_on_not_nil_top_top
                 or bytecode == Bytecodes.jump2_on_nil_top_top
+                or bytecode == Bytecodes.jump2_if_greater
+                or bytecode == Bytecodes.jump2_if_less
             ):
                 # emit the jump, but instead of the offset, emit a dummy
                 idx = emit3_with_dummy(mgenc, bytecode, 0)
@@ -511,6 +651,7 @@ class BcMethod(BcAbstractMethod):
             if (
                 bytecode == Bytecodes.halt
                 or bytecode == Bytecodes.dup
+                or bytecode == Bytecodes.dup_second
                 or bytecode == Bytecodes.push_block_no_ctx
                 or bytecode == Bytecodes.push_constant
                 or bytecode == Bytecodes.push_constant_0
@@ -519,6 +660,7 @@ class BcMethod(BcAbstractMethod):
                 or bytecode == Bytecodes.push_0
                 or bytecode == Bytecodes.push_1
                 or bytecode == Bytecodes.push_nil
+                or bytecode == Bytecodes.push_literal_array
                 or bytecode == Bytecodes.push_global
                 or bytecode == Bytecodes.pop  # push_global doesn't encode context
                 or bytecode == Bytecodes.send_1
@@ -541,6 +683,8 @@ class BcMethod(BcAbstractMethod):
                 or bytecode == Bytecodes.jump_on_nil_top_top
                 or bytecode == Bytecodes.jump_on_not_nil_pop
                 or bytecode == Bytecodes.jump_on_nil_pop
+                or bytecode == Bytecodes.jump_if_greater
+                or bytecode == Bytecodes.jump_if_less
                 or bytecode == Bytecodes.jump_backward
                 or bytecode == Bytecodes.jump2
                 or bytecode == Bytecodes.jump2_on_true_top_nil
@@ -551,6 +695,8 @@ class BcMethod(BcAbstractMethod):
                 or bytecode == Bytecodes.jump2_on_nil_top_top
                 or bytecode == Bytecodes.jump2_on_not_nil_pop
                 or bytecode == Bytecodes.jump2_on_nil_pop
+                or bytecode == Bytecodes.jump2_if_greater
+                or bytecode == Bytecodes.jump2_if_less
                 or bytecode == Bytecodes.jump2_backward
             ):
                 # don't use context
@@ -643,34 +789,44 @@ class _BackJumpPatch(HeapEntry):
 
 class BcMethodNLR(BcMethod):
     def invoke_1(self, rcvr):
-        new_frame = create_frame_1(rcvr, self._size_frame, self._size_inner)
-        return _interp_with_nlr(self, new_frame, self._maximum_number_of_stack_elements)
+        method = self._get_version()
+        new_frame = create_frame_1(rcvr, method._size_frame, self._size_inner)
+        return _interp_with_nlr(
+            method, new_frame, method._maximum_number_of_stack_elements
+        )
 
     def invoke_2(self, rcvr, arg1):
+        method = self._get_version()
         new_frame = create_frame_2(
             rcvr,
             arg1,
             self._arg_inner_access[0],
-            self._size_frame,
+            method._size_frame,
             self._size_inner,
         )
-        return _interp_with_nlr(self, new_frame, self._maximum_number_of_stack_elements)
+        return _interp_with_nlr(
+            method, new_frame, method._maximum_number_of_stack_elements
+        )
 
     def invoke_3(self, rcvr, arg1, arg2):
+        method = self._get_version()
         new_frame = create_frame_3(
             self._arg_inner_access,
-            self._size_frame,
+            method._size_frame,
             self._size_inner,
             rcvr,
             arg1,
             arg2,
         )
-        return _interp_with_nlr(self, new_frame, self._maximum_number_of_stack_elements)
+        return _interp_with_nlr(
+            method, new_frame, method._maximum_number_of_stack_elements
+        )
 
     def invoke_n(self, stack, stack_ptr):
+        method = self._get_version()
         new_frame = create_frame(
             self._arg_inner_access,
-            self._size_frame,
+            method._size_frame,
             self._size_inner,
             stack,
             stack_ptr,
@@ -679,7 +835,9 @@ class BcMethodNLR(BcMethod):
         inner = get_inner_as_context(new_frame)
 
         try:
-            result = interpret(self, new_frame, self._maximum_number_of_stack_elements)
+            result = interpret(
+                method, new_frame, method._maximum_number_of_stack_elements
+            )
             stack_ptr = stack_pop_old_arguments_and_push_result(
                 stack, stack_ptr, self._number_of_arguments, result
             )
@@ -1,3 +1,4 @@
+from rlib.objectmodel import compute_hash
 from som.vmobjects.abstract_object import AbstractObject
 
 
@@ -7,10 +8,16 @@ class String(AbstractObject):
     def __init__(self, value):
         AbstractObject.__init__(self)
         self._string = value
+        self._hash = -1  # computed on first use
 
     def get_embedded_string(self):
         return self._string
 
+    def get_hash(self):
+        if self._hash == -1:
+            self._hash = compute_hash(self._string)
+        return self._hash
+
     def __str__(self):
         return '"' + self._string + '"'
 
@@ -1,12 +1,27 @@
-from som.vm.globals import trueObject
-from som.vmobjects.array import Array
+import pytest
+
+from rlib.string_stream import StringStream
+from som.compiler.class_generation_context import ClassGenerationContext
+from som.interp_type import is_ast_interpreter
+from som.primitives.array_primitives import ArrayPrimitivesBase
+from som.primitives.integer_primitives import IntegerPrimitivesBase
+from som.vm.current import current_universe
+from som.vm.globals import nilObject, trueObject
+from som.vm.symbols import symbol_for
+from som.vmobjects.array import Array, ByteArray
 from som.vmobjects.array import _empty_strategy  # pylint: disable=protected-access
 from som.vmobjects.array import _obj_strategy  # pylint: disable=protected-access
 from som.vmobjects.array import _long_strategy  # pylint: disable=protected-access
 from som.vmobjects.array import _partially_empty_strategy  # pylint: disable=W
 from som.vmobjects.array import _bool_strategy  # pylint: disable=protected-access
+from som.vmobjects.array import _byte_strategy  # pylint: disable=protected-access
+from som.vmobjects.clazz import Class
 
+from som.vmobjects.double import Double
 from som.vmobjects.integer import Integer
+from som.vmobjects.object_with_layout import Object
+from som.vmobjects.primitive import UnaryPrimitive
+from som.vmobjects.string import String
 
 
 def test_empty_array():
@@ -54,3 +69,298 @@ def test_copy_and_extend_partially_empty():
     assert arr is not new_arr
     assert new_arr.get_number_of_indexable_fields() == 4
     assert new_arr.strategy is _partially_empty_strategy
+
+
+def test_byte_array():
+    arr = ByteArray.from_size(3)
+    assert arr.strategy is _byte_strategy
+    assert arr.get_byte(0) == 0
+
+    arr.set_indexable_field(1, Integer(255))
+    assert arr.strategy is _byte_strategy
+    assert arr.get_indexable_field(1).get_embedded_integer() == 255
+
+
+def test_byte_array_string_conversion():
+    arr = ByteArray.from_string("abc")
+    assert arr.get_byte(1) == ord("b")
+    assert arr.as_string() == "abc"
+    assert arr.copy_range(1, 3).as_string() == "bc"
+
+
+def test_byte_array_overlapping_replace():
+    arr = ByteArray.from_string("abcdef")
+    arr.replace_range(2, 6, arr, 0)
+    assert arr.as_string() == "ababcd"
+
+    arr = ByteArray.from_string("abcdef")
+    arr.replace_range(0, 4, arr, 2)
+    assert arr.as_string() == "cdefef"
+
+
+def test_byte_array_rejects_non_bytes_from_array_primitives():
+    from som.primitives.array_primitives import (  # pylint: disable=W
+        _put_all,
+        _at_all_put,
+    )
+
+    arr = ByteArray.from_string("ab")
+    assert arr.can_store(Integer(255))
+    assert not arr.can_store(Integer(300))
+    assert not arr.can_store(String("x"))
+
+    assert isinstance(_put_all(arr, Integer(300)), String)
+    assert isinstance(_put_all(arr, String("x")), String)
+    assert isinstance(_at_all_put(arr, Array.from_integers([1]), Integer(300)), String)
+    assert arr.as_string() == "ab"
+
+    assert _put_all(arr, Integer(99)) is arr
+    assert arr.as_string() == "cc"
+
+
+def test_copy_range_keeps_strategy():
+    arr = Array.from_integers([1, 2, 3, 4])
+    copy = arr.copy_range(1, 3)
+    assert copy.strategy is _long_strategy
+    assert [i.get_embedded_integer() for i in copy.as_argument_array()] == [2, 3]
+
+
+def test_replace_range_overlapping():
+    arr = Array.from_integers([1, 2, 3, 4, 5])
+    arr.replace_range(1, 5, arr, 0)
+    assert arr.strategy is _long_strategy
+    assert [i.get_embedded_integer() for i in arr.as_argument_array()] == [
+        1,
+        1,
+        2,
+        3,
+        4,
+    ]
+
+
+def test_replace_range_with_other_strategy():
+    arr = Array.from_integers([1, 2, 3])
+    arr.replace_range(0, 1, Array.from_values([trueObject]), 0)
+    assert arr.strategy is _obj_strategy
+    assert arr.get_indexable_field(0) is trueObject
+    assert arr.get_indexable_field(2).get_embedded_integer() == 3
+
+
+def test_reverse_and_index_of():
+    arr = Array.from_integers([1, 2, 3])
+    rev = arr.reverse()
+    assert rev.strategy is _long_strategy
+    assert rev.get_indexable_field(0).get_embedded_integer() == 3
+    assert rev.index_of(Integer(1)) == 2
+    assert rev.index_of(Integer(42)) == -1
+
+
+def test_element_wise_arithmetic_keeps_unboxed_storage():
+    from som.primitives.array_primitives import (  # pylint: disable=W
+        _plus,
+        _mult,
+        _scale_by,
+        _sum,
+        _dot,
+    )
+
+    arr = Array.from_integers([1, 2, 3])
+    result = _plus(arr, Integer(1))
+    assert result.strategy is _long_strategy
+    assert _sum(result).get_embedded_integer() == 9
+    assert _dot(arr, result).get_embedded_integer() == 20
+
+    doubles = _mult(arr, Double(0.5))
+    assert doubles.get_double_storage() == [0.5, 1.0, 1.5]
+
+    _scale_by(arr, Double(2.0))
+    assert arr.get_double_storage() == [2.0, 4.0, 6.0]
+
+
+def test_sort_unboxed_storage():
+    from som.primitives.array_primitives import _sort  # pylint: disable=W
+
+    arr = Array.from_integers([3, 1, 2])
+    _sort(arr)
+    assert arr.strategy is _long_strategy
+    assert arr.get_long_storage() == [1, 2, 3]
+
+    arr = Array.from_doubles([2.5, -1.0, 0.0])
+    _sort(arr)
+    assert arr.get_double_storage() == [-1.0, 0.0, 2.5]
+
+
+def test_copy_on_write():
+    arr = Array.from_integers([1, 2, 3])
+    copy = arr.copy_on_write()
+    assert copy.storage is arr.storage
+
+    copy.set_indexable_field(0, Integer(42))
+    assert copy.storage is not arr.storage
+    assert arr.get_indexable_field(0).get_embedded_integer() == 1
+    assert copy.get_indexable_field(0).get_embedded_integer() == 42
+
+
+def test_copy_shares_storage_until_changed():
+    arr = Array.from_integers([1, 2, 3])
+    copy = arr.copy()
+    assert copy.storage is arr.storage
+
+    arr.set_all(Integer(7))
+    assert copy.get_indexable_field(0).get_embedded_integer() == 1
+    assert arr.get_indexable_field(2).get_embedded_integer() == 7
+
+
+def test_copy_of_partially_empty_array():
+    arr = Array.from_size(4)
+    arr.set_indexable_field(0, Integer(1))
+    copy = arr.copy()
+    copy.set_indexable_field(1, Integer(2))
+    assert arr.get_indexable_field(1) is nilObject
+    assert copy.get_indexable_field(1).get_embedded_integer() == 2
+    assert copy.get_indexable_field(0).get_embedded_integer() == 1
+
+
+@pytest.fixture
+def integer_class():
+    """Integer with its primitives, and #value, which core-lib's Object has."""
+    saved = (current_universe.integer_class, current_universe.integer_layout)
+    clazz = Class(0, Class(0, None))
+    IntegerPrimitivesBase(current_universe).install_primitives_in(clazz)
+    clazz.add_primitive(UnaryPrimitive("value", lambda rcvr: rcvr), False)
+    current_universe.integer_class = clazz
+    current_universe.integer_layout = clazz.get_layout_for_instances()
+    yield clazz
+    current_universe.integer_class, current_universe.integer_layout = saved
+
+
+def _compile(source):
+    if is_ast_interpreter():
+        from som.compiler.ast.method_generation_context import (
+            MethodGenerationContext,
+        )
+        from som.compiler.ast.parser import Parser
+    else:
+        from som.compiler.bc.method_generation_context import (
+            MethodGenerationContext,
+        )
+        from som.compiler.bc.parser import Parser
+
+    cgenc = ClassGenerationContext(current_universe)
+    cgenc.name = symbol_for("Test")
+    cgenc.add_instance_field(symbol_for("field"))
+    mgenc = MethodGenerationContext(current_universe, cgenc, None)
+    mgenc.add_argument("self", None, None)
+    parser = Parser(StringStream(source), "test", current_universe)
+    return mgenc.assemble(parser.method(mgenc))
+
+
+def _block(source):
+    """Returns the block that `source` evaluates to."""
+    return _compile("test = ( ^ " + source + " )").invoke_1(nilObject)
+
+
+def _integers(arr):
+    return [v.get_embedded_integer() for v in arr.as_argument_array()]
+
+
+@pytest.fixture
+def array_class():
+    saved = (current_universe.array_class, current_universe.array_layout)
+    clazz = Class(0, Class(0, None))
+    ArrayPrimitivesBase(current_universe).install_primitives_in(clazz)
+    current_universe.array_class = clazz
+    current_universe.array_layout = clazz.get_layout_for_instances()
+    yield clazz
+    current_universe.array_class, current_universe.array_layout = saved
+
+
+@pytest.mark.usefixtures("integer_class")
+def test_collect():
+    from som.primitives.array_primitives import _collect  # pylint: disable=W
+
+    result = _collect(Array.from_integers([1, 2, 3]), _block("[:x | x * 2]"))
+    assert result.strategy is _long_strategy
+    assert _integers(result) == [2, 4, 6]
+
+    result = _collect(Array.from_integers([1, 2]), _block("[:x | x = 1]"))
+    assert result.strategy is _bool_strategy
+    assert result.get_indexable_field(0) is trueObject
+
+
+@pytest.mark.usefixtures("integer_class")
+def test_select_and_reject():
+    from som.primitives.array_primitives import (  # pylint: disable=W
+        _select,
+        _reject,
+    )
+
+    arr = Array.from_integers([1, 2, 3, 4])
+    assert _integers(_select(arr, _block("[:x | x > 2]"))) == [3, 4]
+    assert _integers(_reject(arr, _block("[:x | x > 2]"))) == [1, 2]
+    assert _integers(_select(arr, _block("[:x | x > 9]"))) == []
+
+
+@pytest.mark.usefixtures("integer_class")
+def test_inject_into():
+    from som.primitives.array_primitives import _inject_into  # pylint: disable=W
+
+    arr = Array.from_integers([1, 2, 3])
+    result = _inject_into(arr, Integer(10), _block("[:sum :x | sum + x]"))
+    assert result.get_embedded_integer() == 16
+
+
+@pytest.mark.usefixtures("integer_class")
+def test_detect_if_none():
+    from som.primitives.array_primitives import _detect_if_none  # pylint: disable=W
+
+    arr = Array.from_integers([1, 2, 3])
+    found = _detect_if_none(arr, _block("[:x | x > 1]"), _block("[ 0 ]"))
+    assert found.get_embedded_integer() == 2
+
+    none = _detect_if_none(arr, _block("[:x | x > 5]"), _block("[ 0 ]"))
+    assert none.get_embedded_integer() == 0
+
+    # like core-lib, sends #value to an argument that is not a block
+    none = _detect_if_none(arr, _block("[:x | x > 5]"), Integer(7))
+    assert none.get_embedded_integer() == 7
+
+
+@pytest.mark.usefixtures("integer_class")
+def test_division_by_double_is_integer_division():
+    from som.primitives.array_primitives import (  # pylint: disable=W
+        _divide,
+        _divide_in_place,
+    )
+
+    # like Integer>>/, which is an integer division for a Double argument too
+    arr = Array.from_integers([5, 7])
+    assert _integers(_divide(arr, Double(2.0))) == [2, 3]
+    assert _integers(_divide_in_place(arr, Double(2.0))) == [2, 3]
+
+
+@pytest.mark.usefixtures("integer_class")
+def test_in_place_arithmetic_leaves_receiver_unchanged_on_error():
+    from som.primitives.array_primitives import _add_in_place  # pylint: disable=W
+
+    arr = ByteArray.from_string("a" + chr(250))
+    assert isinstance(_add_in_place(arr, Integer(10)), String)
+    assert arr.as_string() == "a" + chr(250)
+
+    assert _add_in_place(arr, Integer(1)) is arr
+    assert arr.as_string() == "b" + chr(251)
+
+
+@pytest.mark.usefixtures("integer_class", "array_class")
+def test_increment_and_decrement_of_array():
+    # `+ 1` and `- 1` are specialized for numbers, but send to anything else
+    arr = Array.from_integers([1, 2])
+    inc = _compile("test: a = ( ^ a + 1 )")
+    assert _integers(inc.invoke_2(nilObject, arr)) == [2, 3]
+
+    dec = _compile("test: a = ( ^ a - 1 )")
+    assert _integers(dec.invoke_2(nilObject, arr)) == [0, 1]
+
+    inc_field = _compile("test: a = ( field := a. field := field + 1. ^ field )")
+    obj = Object(Class(1).get_layout_for_instances())
+    assert _integers(inc_field.invoke_2(obj, arr)) == [2, 3]
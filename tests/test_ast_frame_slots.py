@@ -0,0 +1,157 @@
+# pylint: disable=protected-access
+import pytest
+
+from som.interp_type import is_bytecode_interpreter
+from som.interpreter.ast.frame import (
+    create_frame_1,
+    read_frame,
+    LongSlot,
+    DoubleSlot,
+)
+from som.interpreter.ast.nodes.literal_node import LiteralNode
+from som.interpreter.ast.nodes.sequence_node import SequenceNode
+from som.interpreter.ast.nodes.specialized.arithmetic_node import (
+    ArithmeticNode,
+    _ADD,
+    _MULTIPLY,
+)
+from som.interpreter.ast.nodes.specialized.int_inc_node import IntIncrementNode
+from som.interpreter.ast.nodes.variable_node import (
+    FrameSlotType,
+    LocalFrameSlotReadNode,
+    LocalFrameLongWriteNode,
+    LocalFrameVarWriteNode,
+    create_local_frame_write_node,
+    SLOT_LONG,
+    SLOT_OBJECT,
+)
+from som.vm.globals import nilObject
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+from som.vmobjects.string import String
+
+pytestmark = pytest.mark.skipif(  # pylint: disable=invalid-name
+    is_bytecode_interpreter(), reason="Tests are specific to AST interpreter"
+)
+
+_LOCAL_IDX = 2
+
+
+_OTHER_IDX = 3
+
+
+def _write(slot_type, expr, idx=_LOCAL_IDX):
+    return create_local_frame_write_node(slot_type, idx, expr, None)
+
+
+def _read(idx=_LOCAL_IDX):
+    return LocalFrameSlotReadNode(idx, None)
+
+
+def _frame():
+    return create_frame_1(nilObject, 4, 0)
+
+
+def test_slot_specializes_to_long():
+    slot_type = FrameSlotType()
+    seq = SequenceNode([_write(slot_type, LiteralNode(Integer(1))), _read()], None)
+    frame = _frame()
+
+    assert seq.execute(frame).get_embedded_integer() == 1
+    assert slot_type.kind == SLOT_LONG
+    assert isinstance(seq._exprs[0], LocalFrameLongWriteNode)
+
+
+def test_increment_updates_slot_in_place():
+    slot_type = FrameSlotType()
+    seq = SequenceNode(
+        [
+            _write(slot_type, LiteralNode(Integer(1))),
+            _write(slot_type, IntIncrementNode(_read(), None)),
+            _write(slot_type, IntIncrementNode(_read(), None)),
+            _read(),
+        ],
+        None,
+    )
+    frame = _frame()
+    seq.execute(frame)
+    seq.execute(frame)
+    slot = read_frame(frame, _LOCAL_IDX)
+    assert isinstance(slot, LongSlot)
+
+    assert seq.execute(frame).get_embedded_integer() == 3
+    assert read_frame(frame, _LOCAL_IDX) is slot
+
+
+def test_slot_generalizes_to_object():
+    slot_type = FrameSlotType()
+    seq = SequenceNode(
+        [
+            _write(slot_type, LiteralNode(Integer(1))),
+            _write(slot_type, LiteralNode(String("a"))),
+            _read(),
+        ],
+        None,
+    )
+    frame = _frame()
+    seq.execute(frame)
+    assert seq.execute(frame).get_embedded_string() == "a"
+    assert slot_type.kind == SLOT_OBJECT
+    assert isinstance(seq._exprs[0], LocalFrameVarWriteNode)
+
+
+def test_long_read_of_double_slot():
+    slot_type = FrameSlotType()
+    seq = SequenceNode(
+        [
+            _write(slot_type, LiteralNode(Double(1.5))),
+            _write(slot_type, IntIncrementNode(_read(), None)),
+            _read(),
+        ],
+        None,
+    )
+    frame = _frame()
+    seq.execute(frame)
+    assert seq.execute(frame).get_embedded_double() == 2.5
+
+
+def _accumulate(op, initial, operand):
+    """Runs `sum := initial. x := operand. sum := sum op x. sum := sum op x`
+    twice as statement, and returns what is stored in the frame for sum."""
+    sum_type = FrameSlotType()
+    seq = SequenceNode(
+        [
+            _write(sum_type, LiteralNode(initial)),
+            _write(FrameSlotType(), LiteralNode(operand), _OTHER_IDX),
+            _write(sum_type, _arithmetic(op)),
+            _write(sum_type, _arithmetic(op)),
+        ],
+        None,
+    )
+    frame = _frame()
+    seq.execute_void(frame)
+    seq.execute_void(frame)
+    return read_frame(frame, _LOCAL_IDX)
+
+
+def _arithmetic(op):
+    return ArithmeticNode(op, None, None, _read(), _read(_OTHER_IDX), None)
+
+
+def test_arithmetic_updates_long_slot_without_boxing():
+    slot = _accumulate(_ADD, Integer(1), Integer(2))
+    assert isinstance(slot, LongSlot)
+    assert slot.boxed is None
+    assert slot.value == 5
+
+
+def test_arithmetic_updates_double_slot_without_boxing():
+    slot = _accumulate(_MULTIPLY, Double(1.5), Double(2.0))
+    assert isinstance(slot, DoubleSlot)
+    assert slot.boxed is None
+    assert slot.value == 6.0
+
+
+def test_arithmetic_with_double_generalizes_long_slot():
+    value = _accumulate(_ADD, Integer(1), Double(0.5))
+    assert value.get_embedded_double() == 2.0
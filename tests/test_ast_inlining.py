@@ -12,7 +12,11 @@ from som.interpreter.ast.nodes.block_node import BlockNode, BlockNodeWithContext
 from som.interpreter.ast.nodes.field_node import FieldReadNode, FieldIncrementNode
 from som.interpreter.ast.nodes.global_read_node import _UninitializedGlobalReadNode
 from som.interpreter.ast.nodes.literal_node import LiteralNode
-from som.interpreter.ast.nodes.return_non_local_node import ReturnLocalNode
+from som.interpreter.ast.nodes.return_non_local_node import (
+    ReturnLocalNode,
+    CatchLocalReturnNode,
+    CatchNonLocalReturnNode,
+)
 from som.interpreter.ast.nodes.sequence_node import SequenceNode
 from som.interpreter.ast.nodes.specialized.int_inc_node import IntIncrementNode
 from som.interpreter.ast.nodes.specialized.literal_and_or import (
@@ -593,3 +597,23 @@ def test_inlining_of_or(mgenc, or_sel):
     )
 
     assert isinstance(ast._exprs[0], OrInlinedNode)
+
+
+def test_return_from_inlined_block_is_local(mgenc):
+    body = parse_method(mgenc, "test: a = ( a ifTrue: [ ^ 1 ]. ^ 2 )")
+    method = mgenc.assemble(body)
+
+    assert isinstance(body._exprs[0]._body_expr, ReturnLocalNode)
+    assert not mgenc.needs_to_catch_non_local_returns
+    assert isinstance(method.invokable.expr_or_sequence, CatchLocalReturnNode)
+    assert method._size_inner == 0
+
+
+def test_return_from_block_remains_non_local(mgenc):
+    body = parse_method(
+        mgenc, "test: a = ( a ifTrue: [ ^ 1 ]. #(1) do: [:e | ^ e ]. ^ 2 )"
+    )
+    method = mgenc.assemble(body)
+
+    assert mgenc.needs_to_catch_non_local_returns
+    assert isinstance(method.invokable.expr_or_sequence, CatchNonLocalReturnNode)
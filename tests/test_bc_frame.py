@@ -4,10 +4,15 @@ from som.interpreter.ast.frame import (
     read_inner,
     create_frame_1,
     create_frame_2,
+    get_inner_as_context,
+    get_or_create_inner_as_context,
+    write_frame,
 )
 from som.interpreter.bc.frame import (
     create_frame,
+    reuse_frame_for_tail_call,
 )
+from som.vm.globals import nilObject
 from som.vmobjects.integer import Integer
 
 _MIN_FRAME_SIZE = 1 + 1  # Inner, Receiver
@@ -143,3 +148,49 @@ def test_create_frame_2_frame():
     assert read_inner(frame, FRAME_AND_INNER_RCVR_IDX).get_embedded_integer() == 1
     assert read_frame(frame, FRAME_AND_INNER_RCVR_IDX).get_embedded_integer() == 1
     assert read_frame(frame, FRAME_AND_INNER_RCVR_IDX + 1).get_embedded_integer() == 2
+
+
+def test_inner_is_created_on_demand():
+    num_args = 3
+    prev_stack = [Integer(i) for i in range(num_args)]
+    frame = create_frame(
+        [False] * (num_args - 1),
+        _MIN_FRAME_SIZE + num_args,
+        0,
+        prev_stack,
+        num_args - 1,
+        num_args,
+    )
+    assert get_inner_as_context(frame) is None
+
+    inner = get_or_create_inner_as_context(frame, num_args)
+    for i in range(num_args):
+        assert (
+            read_inner(frame, FRAME_AND_INNER_RCVR_IDX + i).get_embedded_integer() == i
+        )
+        assert (
+            read_frame(frame, FRAME_AND_INNER_RCVR_IDX + i).get_embedded_integer() == i
+        )
+    assert get_or_create_inner_as_context(frame, num_args) is inner
+
+
+def test_existing_inner_is_used_for_blocks():
+    frame = create_frame_1(Integer(1), _MIN_FRAME_SIZE, _MIN_FRAME_SIZE)
+    inner = get_inner_as_context(frame)
+
+    assert inner is not None
+    assert get_or_create_inner_as_context(frame, 1) is inner
+
+
+def test_frame_is_reused_for_tail_call():
+    frame = create_frame_2(Integer(0), Integer(1), False, _MIN_FRAME_SIZE + 2, 0)
+    write_frame(frame, FRAME_AND_INNER_RCVR_IDX + 2, Integer(2))
+    get_or_create_inner_as_context(frame, 2)
+
+    stack = [Integer(10), Integer(11)]
+    reuse_frame_for_tail_call(frame, _MIN_FRAME_SIZE + 2, stack, 1, 2)
+
+    assert get_inner_as_context(frame) is None
+    assert read_frame(frame, FRAME_AND_INNER_RCVR_IDX).get_embedded_integer() == 10
+    assert read_frame(frame, FRAME_AND_INNER_RCVR_IDX + 1).get_embedded_integer() == 11
+    assert read_frame(frame, FRAME_AND_INNER_RCVR_IDX + 2) is nilObject
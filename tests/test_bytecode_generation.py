@@ -286,9 +286,7 @@ def test_if_true_with_literal_return(mgenc, literal, bytecode):
     source = """
         test = (
             self method ifTrue: [ LITERAL ].
-        )""".replace(
-        "LITERAL", literal
-    )
+        )""".replace("LITERAL", literal)
     bytecodes = method_to_bytecodes(mgenc, source)
 
     length = bytecode_length(bytecode)
@@ -332,9 +330,7 @@ def test_if_true_with_something_and_literal_return(mgenc, literal, bytecode):
     source = """
         test = (
             self method ifTrue: [ #fooBarNonTrivialBlock. LITERAL ].
-        )""".replace(
-        "LITERAL", literal
-    )
+        )""".replace("LITERAL", literal)
     bytecodes = method_to_bytecodes(mgenc, source)
 
     length = bytecode_length(bytecode)
@@ -372,9 +368,7 @@ def test_if_arg(mgenc, if_selector, jump_bytecode):
             #start.
             self method IF_SELECTOR [ arg ].
             #end
-        )""".replace(
-            "IF_SELECTOR", if_selector
-        ),
+        )""".replace("IF_SELECTOR", if_selector),
     )
 
     assert len(bytecodes) == 17
@@ -483,9 +477,7 @@ def test_if_return_non_local(mgenc, if_selector, jump_bytecode):
             #start.
             self method IF_SELECTOR [ ^ arg ].
             #end
-        )""".replace(
-            "IF_SELECTOR", if_selector
-        ),
+        )""".replace("IF_SELECTOR", if_selector),
     )
 
     assert len(bytecodes) == 18
@@ -805,11 +797,7 @@ def test_if_true_if_false_return(mgenc, sel1, sel2, jump_bytecode):
         test: arg1 with: arg2 = (
             #start.
             ^ self method SEL1 [ ^ arg1 ] SEL2 [ arg2 ]
-        )""".replace(
-            "SEL1", sel1
-        ).replace(
-            "SEL2", sel2
-        ),
+        )""".replace("SEL1", sel1).replace("SEL2", sel2),
     )
 
     assert len(bytecodes) == 21
@@ -986,9 +974,7 @@ def test_block_if_return_non_local(bgenc, if_selector, jump_bytecode):
             #start.
             self method IF_SELECTOR [ ^ arg ].
             #end
-        ]""".replace(
-            "IF_SELECTOR", if_selector
-        ),
+        ]""".replace("IF_SELECTOR", if_selector),
     )
 
     assert len(bytecodes) == 19
@@ -1019,9 +1005,7 @@ def test_while_inlining(mgenc, selector, jump_bytecode):
             #start.
             [ true ] SELECTOR [ arg ].
             #end
-        )""".replace(
-            "SELECTOR", selector
-        ),
+        )""".replace("SELECTOR", selector),
     )
 
     assert len(bytecodes) == 19
@@ -1153,6 +1137,154 @@ def test_inlining_while_loop_with_contracting_branches(mgenc):
     )
 
 
+@pytest.mark.parametrize(
+    "selector,jump_bytecode,step_bytecode",
+    [
+        ("to:", Bytecodes.jump_if_greater, Bytecodes.inc),
+        ("downTo:", Bytecodes.jump_if_less, Bytecodes.dec),
+    ],
+)
+def test_to_do_inlining(mgenc, selector, jump_bytecode, step_bytecode):
+    bytecodes = method_to_bytecodes(
+        mgenc,
+        """
+        test: arg = (
+            #start.
+            1 SELECTOR arg do: [:i | i println ].
+            #end
+        )""".replace("SELECTOR", selector),
+    )
+
+    assert len(bytecodes) == 30
+    check(
+        bytecodes,
+        [
+            (2, Bytecodes.push_1),
+            Bytecodes.push_argument,
+            Bytecodes.dup_second,
+            BC(jump_bytecode, 17, note="jump to the pops after the loop"),
+            Bytecodes.dup,
+            BC(Bytecodes.pop_local, 0, 0),
+            BC(Bytecodes.push_local, 0, 0),
+            Bytecodes.send_1,
+            Bytecodes.pop,
+            step_bytecode,
+            BC(Bytecodes.jump_backward, 14),
+            Bytecodes.pop,
+            Bytecodes.pop,
+            Bytecodes.pop,
+        ],
+    )
+
+
+def test_to_by_do_inlining_with_literal_step(mgenc):
+    bytecodes = method_to_bytecodes(
+        mgenc,
+        """
+        test: arg = (
+            1 to: arg by: 2 do: [:i | i println ]
+        )""",
+    )
+
+    check(
+        bytecodes,
+        [
+            Bytecodes.push_1,
+            Bytecodes.push_argument,
+            Bytecodes.dup_second,
+            Bytecodes.jump_if_greater,
+            Bytecodes.dup,
+            Bytecodes.pop_local,
+            Bytecodes.push_local,
+            Bytecodes.send_1,
+            Bytecodes.pop,
+            Bytecodes.push_constant_0,
+            Bytecodes.send_2,
+            Bytecodes.jump_backward,
+            Bytecodes.pop,
+            Bytecodes.pop,
+        ],
+    )
+
+
+def test_times_repeat_inlining(mgenc):
+    bytecodes = method_to_bytecodes(
+        mgenc,
+        """
+        test: arg = (
+            arg timesRepeat: [ arg println ]
+        )""",
+    )
+
+    assert len(bytecodes) == 21
+    check(
+        bytecodes,
+        [
+            Bytecodes.push_argument,
+            Bytecodes.dup,
+            Bytecodes.push_1,
+            BC(Bytecodes.jump_if_greater, 13),
+            Bytecodes.push_argument,
+            Bytecodes.send_1,
+            Bytecodes.pop,
+            Bytecodes.inc,
+            BC(Bytecodes.jump_backward, 10),
+            Bytecodes.pop,
+            Bytecodes.pop,
+            Bytecodes.return_self,
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "1 to: arg do: arg",
+        "1 to: arg by: arg do: [:i | i ]",
+        "1 to: arg do: [ 1 ]",
+        "1 to: arg do: [:i | [ i ] ]",
+    ],
+)
+def test_to_do_not_inlined(mgenc, source):
+    bytecodes = method_to_bytecodes(mgenc, "test: arg = ( " + source + " )")
+    assert Bytecodes.jump_backward not in bytecodes
+
+
+def test_to_do_inlined_into_then_branch(mgenc):
+    bytecodes = method_to_bytecodes(
+        mgenc,
+        """
+        test: arg = (
+            arg ifTrue: [ 1 to: arg do: [:i | i println ] ].
+            ^ 1
+        )""",
+    )
+
+    check(
+        bytecodes,
+        [
+            Bytecodes.push_argument,
+            BC(Bytecodes.jump_on_false_top_nil, 27),
+            Bytecodes.push_1,
+            Bytecodes.push_argument,
+            Bytecodes.dup_second,
+            BC(Bytecodes.jump_if_greater, 17),
+            Bytecodes.dup,
+            BC(Bytecodes.pop_local, 0, 0),
+            BC(Bytecodes.push_local, 0, 0),
+            Bytecodes.send_1,
+            Bytecodes.pop,
+            Bytecodes.inc,
+            BC(Bytecodes.jump_backward, 14),
+            Bytecodes.pop,
+            Bytecodes.pop,
+            Bytecodes.pop,
+            Bytecodes.push_1,
+            Bytecodes.return_local,
+        ],
+    )
+
+
 @pytest.mark.parametrize(
     "source,bytecode",
     [
@@ -1383,3 +1515,104 @@ def test_field_read_inlining(cgenc, mgenc):
             Bytecodes.return_self,
         ],
     )
+
+
+def test_literal_array_is_created_at_compile_time(mgenc):
+    bytecodes = method_to_bytecodes(mgenc, "test = ( ^ #(1 2 #foo 'bar') )")
+
+    assert len(bytecodes) == 3
+    check(bytecodes, [Bytecodes.push_literal_array, Bytecodes.return_local])
+
+
+def test_nested_literal_array(mgenc):
+    bytecodes = method_to_bytecodes(mgenc, "test = ( ^ #(1 #(2 3)) )")
+
+    check(
+        bytecodes,
+        [
+            Bytecodes.push_global,
+            Bytecodes.push_constant_1,
+            Bytecodes.send_2,
+            Bytecodes.push_1,
+            Bytecodes.push_1,
+            Bytecodes.send_3,
+            Bytecodes.push_constant,
+            Bytecodes.push_literal_array,
+            Bytecodes.send_3,
+            Bytecodes.return_local,
+        ],
+    )
+
+
+def test_read_only_captured_args_do_not_need_inner(mgenc):
+    method_to_bytecodes(mgenc, "test: a = ( ^ [ a + self ] )")
+    arg_inner_access, size_frame, size_inner = mgenc.prepare_frame()
+
+    assert arg_inner_access == [False]
+    assert size_frame == 3
+    assert size_inner == 0
+
+
+def test_captured_arg_written_needs_inner(mgenc):
+    method_to_bytecodes(mgenc, "test: a = ( a := 1. ^ [ a ] )")
+    arg_inner_access, _, size_inner = mgenc.prepare_frame()
+
+    assert arg_inner_access == [True]
+    assert size_inner == 3
+
+
+def test_captured_local_needs_inner(mgenc):
+    method_to_bytecodes(mgenc, "test: a = ( | l | ^ [ l ] )")
+    _, size_frame, size_inner = mgenc.prepare_frame()
+
+    assert size_frame == 3
+    assert size_inner == 3
+
+
+def test_non_local_return_needs_inner(mgenc):
+    method_to_bytecodes(mgenc, "test: a = ( ^ [ ^ a ] )")
+    _, _, size_inner = mgenc.prepare_frame()
+
+    assert size_inner == 3
+
+
+def test_return_from_inlined_block_does_not_need_catch(mgenc):
+    bytecodes = method_to_bytecodes(mgenc, "test: a = ( a ifTrue: [ ^ 1 ]. ^ 2 )")
+
+    assert Bytecodes.return_non_local not in bytecodes
+    assert not mgenc.needs_to_catch_non_local_returns
+
+
+def test_return_from_block_needs_catch(mgenc):
+    method_to_bytecodes(
+        mgenc, "test: a = ( a ifTrue: [ ^ 1 ]. #(1) do: [:e | ^ e ]. ^ 2 )"
+    )
+
+    assert mgenc.needs_to_catch_non_local_returns
+
+
+def test_self_send_in_tail_position(mgenc):
+    mgenc.signature = symbol_for("test:")
+    bytecodes = method_to_bytecodes(
+        mgenc, "test: a = ( a = 0 ifTrue: [ ^ 0 ]. ^ self test: a - 1 )"
+    )
+
+    assert bytecodes[-3] == Bytecodes.tail_send
+    assert bytecodes[-1] == Bytecodes.return_local
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "test: a = ( ^ self other: a )",
+        "test: a = ( ^ (self test: a) + 1 )",
+        "test: a = ( self test: a )",
+        "test: a = ( ^ super test: a )",
+        "test: a = ( ^ [ self test: a ] )",
+    ],
+)
+def test_send_not_in_tail_position(mgenc, source):
+    mgenc.signature = symbol_for("test:")
+    bytecodes = method_to_bytecodes(mgenc, source)
+
+    assert Bytecodes.tail_send not in bytecodes
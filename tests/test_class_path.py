@@ -0,0 +1,94 @@
+import os
+import zipfile
+
+import pytest
+
+from som.vm.class_path import ClassPathIndex
+
+
+def _touch(directory, file_name):
+    with open(os.path.join(str(directory), file_name), "w") as file:
+        file.write("")
+
+
+def test_only_som_files_are_indexed(tmp_path):
+    _touch(tmp_path, "Foo.som")
+    _touch(tmp_path, "Bar.txt")
+    index = ClassPathIndex()
+
+    assert index.has_class(str(tmp_path), "Foo")
+    assert not index.has_class(str(tmp_path), "Bar")
+    assert not index.has_class(str(tmp_path), "Baz")
+
+
+def test_missing_directory_has_no_classes(tmp_path):
+    index = ClassPathIndex()
+
+    assert not index.has_class(str(tmp_path / "missing"), "Foo")
+
+
+def test_refresh_finds_added_files(tmp_path):
+    index = ClassPathIndex()
+    assert not index.has_class(str(tmp_path), "Foo")
+
+    _touch(tmp_path, "Foo.som")
+    os.utime(str(tmp_path), (0, 0))
+
+    assert not index.has_class(str(tmp_path), "Foo")
+    assert index.refresh()
+    assert index.has_class(str(tmp_path), "Foo")
+
+
+def test_refresh_without_changes(tmp_path):
+    _touch(tmp_path, "Foo.som")
+    index = ClassPathIndex()
+    index.has_class(str(tmp_path), "Foo")
+
+    assert not index.refresh()
+
+
+def test_classes_are_read_from_archive(tmp_path):
+    archive = str(tmp_path / "lib.zip")
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("Foo.som", "Foo = ()")
+        zip_file.writestr("lib/Bar.som", "Bar = ()")
+        zip_file.writestr("README", "")
+    index = ClassPathIndex()
+
+    assert index.has_class(archive, "Foo")
+    assert index.has_class(archive, "Bar")
+    assert not index.has_class(archive, "README")
+    assert index.read_class(archive, "Bar") == "Bar = ()"
+
+
+def test_classes_in_directories_are_read_from_files(tmp_path):
+    _touch(tmp_path, "Foo.som")
+    index = ClassPathIndex()
+
+    assert index.read_class(str(tmp_path), "Foo") is None
+
+
+def test_missing_archive_has_no_classes(tmp_path):
+    index = ClassPathIndex()
+
+    assert not index.has_class(str(tmp_path / "missing.zip"), "Foo")
+
+
+def test_refresh_reopens_changed_archive(tmp_path):
+    archive = str(tmp_path / "lib.zip")
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("Foo.som", "Foo = ()")
+    index = ClassPathIndex()
+    assert index.has_class(archive, "Foo")
+    old_archive = index._get_entry(archive)._archive  # pylint: disable=W
+
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("Bar.som", "Bar = ()")
+    os.utime(archive, (0, 0))
+
+    assert index.refresh()
+    assert index.read_class(archive, "Bar") == "Bar = ()"
+    assert not index.has_class(archive, "Foo")
+    with pytest.raises(ValueError):
+        # the old archive was closed
+        old_archive.read("Foo.som")
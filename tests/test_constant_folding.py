@@ -0,0 +1,151 @@
+# pylint: disable=redefined-outer-name
+import pytest
+
+from rlib.string_stream import StringStream
+from som.compiler.class_generation_context import ClassGenerationContext
+from som.compiler.constant_folding import fold_unary, fold_binary
+from som.interp_type import is_ast_interpreter
+from som.primitives.double_primitives import DoublePrimitives
+from som.primitives.integer_primitives import IntegerPrimitivesBase
+from som.primitives.string_primitives import StringPrimitivesBase
+from som.vm.current import current_universe
+from som.vm.globals import nilObject, trueObject, falseObject
+from som.vm.symbols import symbol_for
+from som.vmobjects.clazz import Class
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+from som.vmobjects.method_trivial import LiteralReturn
+from som.vmobjects.string import String
+
+
+def _class_with_primitives(primitives):
+    clazz = Class(0, Class(0, None))
+    primitives(current_universe).install_primitives_in(clazz)
+    return clazz
+
+
+@pytest.fixture
+def universe():
+    """A universe, in which Integer, Double, and String have primitives,
+    but no methods implemented in SOM."""
+    saved = (
+        current_universe.integer_class,
+        current_universe.double_class,
+        current_universe.string_class,
+    )
+    current_universe.integer_class = _class_with_primitives(IntegerPrimitivesBase)
+    current_universe.double_class = _class_with_primitives(DoublePrimitives)
+    current_universe.string_class = _class_with_primitives(StringPrimitivesBase)
+    yield current_universe
+    (
+        current_universe.integer_class,
+        current_universe.double_class,
+        current_universe.string_class,
+    ) = saved
+
+
+def test_fold_arithmetic(universe):
+    result = fold_binary(universe, Integer(1), "+", Integer(2))
+    assert result.get_embedded_integer() == 3
+
+    result = fold_binary(universe, Integer(3), "*", Double(1.5))
+    assert result.get_embedded_double() == 4.5
+
+    result = fold_unary(universe, Integer(-5), "abs")
+    assert result.get_embedded_integer() == 5
+
+
+def test_fold_comparison(universe):
+    assert fold_binary(universe, Integer(1), "<", Integer(2)) is trueObject
+    assert fold_binary(universe, Double(1.0), ">", Integer(2)) is falseObject
+    assert fold_binary(universe, String("a"), "=", String("a")) is trueObject
+
+
+def test_fold_string_length(universe):
+    assert fold_unary(universe, String("hello"), "length").get_embedded_integer() == 5
+
+
+def test_division_by_zero_is_not_folded(universe):
+    assert fold_binary(universe, Integer(1), "/", Integer(0)) is None
+    assert fold_binary(universe, Integer(1), "%", Integer(0)) is None
+
+
+def test_unknown_selectors_are_not_folded(universe):
+    assert fold_binary(universe, Integer(1), "max:", Integer(2)) is None
+    assert fold_binary(universe, Integer(1), "<<", Integer(2)) is None
+    assert fold_unary(universe, Integer(1), "printString") is None
+
+
+def test_symbols_are_not_folded(universe):
+    assert fold_binary(universe, symbol_for("a"), "=", symbol_for("a")) is None
+
+
+def test_concatenation_implemented_in_som_is_not_folded(universe):
+    # String>>#, is a SOM method, whose body may be anything
+    universe.string_class.add_primitive(
+        LiteralReturn(symbol_for(","), String("overridden")), False
+    )
+    assert fold_binary(universe, String("a"), ",", String("b")) is None
+
+
+def test_overridden_primitive_is_not_folded(universe):
+    universe.integer_class.add_primitive(
+        LiteralReturn(symbol_for("+"), Integer(42)), False
+    )
+    assert fold_binary(universe, Integer(1), "+", Integer(2)) is None
+
+
+def test_nothing_folded_without_class(universe):
+    universe.integer_class = None
+    assert fold_binary(universe, Integer(1), "+", Integer(2)) is None
+
+
+def _parse_method(source):
+    if is_ast_interpreter():
+        from som.compiler.ast.method_generation_context import (
+            MethodGenerationContext,
+        )
+        from som.compiler.ast.parser import Parser
+    else:
+        from som.compiler.bc.method_generation_context import (
+            MethodGenerationContext,
+        )
+        from som.compiler.bc.parser import Parser
+
+    cgenc = ClassGenerationContext(current_universe)
+    cgenc.name = symbol_for("Test")
+    mgenc = MethodGenerationContext(current_universe, cgenc, None)
+    mgenc.add_argument("self", None, None)
+    parser = Parser(StringStream(source), "test", current_universe)
+    return mgenc.assemble(parser.method(mgenc))
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("test = ( ^ 1 + 2 )", 3),
+        ("test = ( ^ 2 * 3 + 4 )", 10),
+        ("test = ( ^ (1 + 2) * 3 )", 9),
+        ("test = ( ^ -5 abs + 1 )", 6),
+        ("test = ( ^ 3 + 1 )", 4),
+    ],
+)
+def test_folded_to_literal_return(universe, source, expected):
+    method = _parse_method(source)
+    assert isinstance(method, LiteralReturn)
+    assert method.invoke_1(nilObject).get_embedded_integer() == expected
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "test = ( ^ (true ifTrue: [ 1 ] ifFalse: [ 2 ]) + 3 )",
+        "test = ( ^ 1 / 0 )",
+        "test = ( ^ 1 max: 2 )",
+        "test = ( ^ 'a' , 'b' )",
+        "test: a = ( ^ a + 1 + 2 )",
+    ],
+)
+def test_not_folded(universe, source):
+    method = _parse_method(source)
+    assert not isinstance(method, LiteralReturn)
@@ -0,0 +1,54 @@
+from som.vmobjects.double import Double
+from som.vmobjects.growable_array import GrowableArray
+from som.vmobjects.integer import Integer
+from som.vmobjects.string import String
+
+
+def test_append_grows_capacity():
+    arr = GrowableArray(2)
+    for i in range(100):
+        arr.append(Integer(i))
+    assert arr.get_size() == 100
+    assert arr.get(99).get_embedded_integer() == 99
+    assert arr.as_array().get_long_storage() == list(range(100))
+
+
+def test_remove_at_both_ends():
+    arr = GrowableArray()
+    for i in range(10):
+        arr.append(Integer(i))
+    assert arr.remove_first().get_embedded_integer() == 0
+    assert arr.remove_last().get_embedded_integer() == 9
+    assert arr.get_size() == 8
+    assert arr.get(0).get_embedded_integer() == 1
+
+
+def test_remove_from_empty():
+    arr = GrowableArray()
+    assert arr.remove_first() is None
+    assert arr.remove_last() is None
+
+
+def test_queue_reuses_storage():
+    arr = GrowableArray(4)
+    for i in range(1000):
+        arr.append(Integer(i))
+        assert arr.remove_first().get_embedded_integer() == i
+    assert arr._capacity == 4  # pylint: disable=protected-access
+
+
+def test_doubles_stay_unboxed():
+    arr = GrowableArray()
+    arr.append(Double(1.5))
+    arr.append(Double(2.5))
+    assert arr.as_array().get_double_storage() == [1.5, 2.5]
+
+
+def test_transition_to_objects():
+    arr = GrowableArray()
+    arr.append(Integer(1))
+    arr.append(String("a"))
+    arr.set(0, Double(0.5))
+    assert arr.get(0).get_embedded_double() == 0.5
+    assert arr.get(1).get_embedded_string() == "a"
+    assert arr.as_array().get_number_of_indexable_fields() == 2
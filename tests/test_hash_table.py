@@ -0,0 +1,70 @@
+import pytest
+
+from som.primitives.hash_table_primitives import _at_if_absent
+from som.vm.current import current_universe
+from som.vmobjects.clazz import Class
+from som.vmobjects.hash_table import HashTable
+from som.vmobjects.integer import Integer
+from som.vmobjects.primitive import UnaryPrimitive
+from som.vmobjects.string import String
+from som.vm.symbols import symbol_for
+
+
+def test_string_and_symbol_keys_are_equal():
+    table = HashTable(False)
+    table.put(String("abc"), Integer(1))
+    table.put(symbol_for("abc"), Integer(2))
+
+    assert table.size() == 1
+    assert table.get(String("abc")).get_embedded_integer() == 2
+
+
+def test_integer_keys():
+    table = HashTable(False)
+    table.put(Integer(42), String("a"))
+
+    assert table.contains_key(Integer(42))
+    assert table.get(Integer(43)) is None
+    assert table.remove(Integer(42)).get_embedded_string() == "a"
+    assert table.size() == 0
+
+
+def test_identity_keys():
+    table = HashTable(True)
+    key = String("abc")
+    table.put(key, Integer(1))
+    table.put(Integer(7), Integer(2))
+
+    assert table.contains_key(key)
+    assert not table.contains_key(String("abc"))
+    assert table.get(Integer(7)).get_embedded_integer() == 2
+
+
+def test_keys_keep_insertion_order():
+    table = HashTable(False)
+    for i in [3, 1, 2]:
+        table.put(Integer(i), Integer(i * 10))
+
+    assert [k.get_embedded_integer() for k in table.get_keys()] == [3, 1, 2]
+    assert [v.get_embedded_integer() for v in table.get_values()] == [30, 10, 20]
+
+
+@pytest.fixture
+def integer_class():
+    """Integer with #value, which core-lib's Object has."""
+    saved = (current_universe.integer_class, current_universe.integer_layout)
+    clazz = Class(0, Class(0, None))
+    clazz.add_primitive(UnaryPrimitive("value", lambda rcvr: rcvr), False)
+    current_universe.integer_class = clazz
+    current_universe.integer_layout = clazz.get_layout_for_instances()
+    yield clazz
+    current_universe.integer_class, current_universe.integer_layout = saved
+
+
+@pytest.mark.usefixtures("integer_class")
+def test_at_if_absent_sends_value_to_an_argument_that_is_not_a_block():
+    table = HashTable(False)
+    table.put(Integer(1), Integer(10))
+
+    assert _at_if_absent(table, Integer(1), Integer(7)).get_embedded_integer() == 10
+    assert _at_if_absent(table, Integer(2), Integer(7)).get_embedded_integer() == 7
@@ -0,0 +1,76 @@
+import pytest
+
+from som.vm.globals import nilObject, trueObject
+from som.vm.json_codec import parse, serialize, JsonError
+from som.vmobjects.array import Array
+from som.vmobjects.hash_table import HashTable
+from som.vmobjects.integer import Integer
+from som.vmobjects.string import String
+
+
+def test_parse_object():
+    result = parse('{"a": 1, "b": [true, null], "c": "x\\ty"}')
+    assert isinstance(result, HashTable)
+    assert result.get(String("a")).get_embedded_integer() == 1
+    assert result.get(String("b")).get_indexable_field(0) is trueObject
+    assert result.get(String("b")).get_indexable_field(1) is nilObject
+    assert result.get(String("c")).get_embedded_string() == "x\ty"
+
+
+def test_parse_uses_typed_strategies():
+    ints = parse("[1, 2, 3]")
+    assert ints.get_long_storage() == [1, 2, 3]
+
+    doubles = parse("[1.5, -2e3]")
+    assert doubles.get_double_storage() == [1.5, -2000.0]
+
+
+def test_parse_unicode_escape():
+    assert parse('"\\u0041\\u00e9"').get_embedded_string() == "A\xc3\xa9"
+
+
+@pytest.mark.parametrize(
+    "text", ["", "[1,", "{1: 2}", "[1] 2", '"abc', "01", "-", "tru", "[1.]"]
+)
+def test_parse_errors(text):
+    with pytest.raises(JsonError):
+        parse(text)
+
+
+def test_serialize():
+    table = HashTable(False)
+    table.put(String("k"), Array.from_values([Integer(1), String('a"b')]))
+    assert serialize(table) == '{"k":[1,"a\\"b"]}'
+
+
+def test_serialize_control_character():
+    assert serialize(String("a" + chr(0x1F) + chr(0x01))) == '"a\\u001f\\u0001"'
+
+
+def test_serialize_cyclic_array():
+    arr = Array.from_size(1)
+    arr.set_indexable_field(0, arr)
+    with pytest.raises(JsonError):
+        serialize(arr)
+
+
+def test_round_trip():
+    text = '{"a":[1,2.5,"x\\ny",false,null],"b":{}}'
+    assert serialize(parse(text)) == text
+
+
+def test_parse_array_with_null():
+    result = parse("[1, null]")
+    assert result.get_indexable_field(0).get_embedded_integer() == 1
+    assert result.get_indexable_field(1) is nilObject
+
+
+def test_primitives_reject_arguments_that_are_not_strings():
+    from som.primitives.json_primitives import (  # pylint: disable=W
+        _parse,
+        _parse_file,
+    )
+
+    for prim in [_parse, _parse_file]:
+        result = prim(nilObject, Integer(3))
+        assert result.get_embedded_string() == "Error - argument is not a String"
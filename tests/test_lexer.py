@@ -0,0 +1,96 @@
+import pytest
+from rlib.string_stream import StringStream
+
+from som.compiler.lexer import Lexer
+from som.compiler.symbol import Symbol
+
+
+def _tokens(source):
+    lexer = Lexer(StringStream(source))
+    tokens = []
+    while True:
+        sym = lexer.get_sym()
+        if sym == Symbol.NONE:
+            return tokens
+        tokens.append((sym, lexer.text))
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("foo", [(Symbol.Identifier, "foo")]),
+        ("a_b1", [(Symbol.Identifier, "a_b1")]),
+        ("at:", [(Symbol.Keyword, "at:")]),
+        ("at:put:", [(Symbol.KeywordSequence, "at:put:")]),
+        ("42", [(Symbol.Integer, "42")]),
+        ("4.2", [(Symbol.Double, "4.2")]),
+        ("4.", [(Symbol.Integer, "4"), (Symbol.Period, ".")]),
+        ("~=", [(Symbol.OperatorSequence, "~=")]),
+        ("-", [(Symbol.Minus, "-")]),
+        ("------", [(Symbol.Separator, "------")]),
+        ("primitive", [(Symbol.Primitive, "primitive")]),
+        ("primitives", [(Symbol.Identifier, "primitives")]),
+        (":=", [(Symbol.Assign, ":=")]),
+        ("'abc'", [(Symbol.STString, "abc")]),
+        ("''", [(Symbol.STString, "")]),
+    ],
+)
+def test_token(source, expected):
+    assert _tokens(source) == expected
+
+
+def test_string_with_escapes():
+    assert _tokens("'a\\tb\\'c\\\\d\\ne'") == [(Symbol.STString, "a\tb'c\\d\ne")]
+
+
+def test_comments_are_skipped():
+    assert _tokens('a "comment" b') == [
+        (Symbol.Identifier, "a"),
+        (Symbol.Identifier, "b"),
+    ]
+
+
+def test_line_numbers_advance_in_multi_line_strings_and_comments():
+    lexer = Lexer(StringStream("'a\nb'\n\"c\nd\" e := 1"))
+
+    assert lexer.get_sym() == Symbol.STString
+    assert lexer.text == "a\nb"
+    assert lexer.line_number == 2
+
+    assert lexer.get_sym() == Symbol.Identifier
+    assert lexer.line_number == 4
+    assert lexer.get_current_column() == 5
+    assert lexer.get_raw_buffer() == 'd" e := 1'
+
+
+def test_source_coordinate():
+    lexer = Lexer(StringStream("foo\n  bar baz"))
+    lexer.get_sym()
+    lexer.get_sym()
+
+    coord = lexer.get_source_coordinate()
+    assert coord.start_line == 2
+    assert coord.start_column == 6
+    assert coord.char_idx == 9
+    assert lexer.get_number_of_characters_read() == 9
+
+
+def test_peek():
+    lexer = Lexer(StringStream("a b"))
+    assert lexer.get_sym() == Symbol.Identifier
+
+    assert lexer.peek() == Symbol.Identifier
+    assert lexer.text == "a"
+
+    assert lexer.get_sym() == Symbol.Identifier
+    assert lexer.text == "b"
+
+
+class _FailingStream(object):
+    def read(self, _size):
+        raise OSError("read failed")
+
+
+def test_read_error():
+    with pytest.raises(ValueError):
+        Lexer(_FailingStream())
@@ -0,0 +1,57 @@
+from som.vmobjects.double import Double
+from som.vmobjects.integer import Integer
+from som.vmobjects.mapped_byte_array import MappedByteArray
+from som.vmobjects.string import String
+
+
+def _map(tmp_path, content):
+    file_name = tmp_path / "data.txt"
+    file_name.write_bytes(content)
+    return MappedByteArray.map_file(str(file_name))
+
+
+def test_map_file(tmp_path):
+    arr = _map(tmp_path, b"hello world")
+    assert arr.get_size() == 11
+    assert arr.get_byte(0) == ord("h")
+    assert arr.get_string(6, 11) == "world"
+    arr.close()
+
+
+def test_index_of(tmp_path):
+    arr = _map(tmp_path, b"abc,def,ghi")
+    assert arr.index_of(",", 0) == 3
+    assert arr.index_of(",", 4) == 7
+    assert arr.index_of("xyz", 0) == -1
+    arr.close()
+
+
+def test_empty_file(tmp_path):
+    arr = _map(tmp_path, b"")
+    assert arr.get_size() == 0
+    assert arr.is_valid_range(0, 0)
+    assert not arr.is_valid_range(0, 1)
+
+
+def test_closed_mapping_has_no_valid_range(tmp_path):
+    arr = _map(tmp_path, b"abc")
+    arr.close()
+    assert not arr.is_valid_range(0, 1)
+
+
+def test_missing_file():
+    assert MappedByteArray.map_file("/does/not/exist") is None
+
+
+def test_index_of_primitive(tmp_path):
+    from som.primitives.mapped_byte_array_primitives import (  # pylint: disable=W
+        _index_of_from,
+    )
+
+    arr = _map(tmp_path, b"abc,def")
+    assert _index_of_from(arr, String(","), Integer(1)).get_embedded_integer() == 4
+    assert (
+        _index_of_from(arr, Integer(ord("d")), Integer(1)).get_embedded_integer() == 5
+    )
+    assert isinstance(_index_of_from(arr, Double(1.0), Integer(1)), String)
+    arr.close()
@@ -0,0 +1,153 @@
+import pytest
+from rlib.string_stream import StringStream
+
+from som.compiler.bc.method_generation_context import MethodGenerationContext
+from som.compiler.bc.parser import Parser
+from som.compiler.class_generation_context import ClassGenerationContext
+from som.interp_type import is_ast_interpreter
+from som.interpreter.ast.nodes.dispatch import CachedDispatchNode, InlinedSendGuard
+from som.interpreter.bc.bytecodes import Bytecodes, bytecode_length
+from som.interpreter.bc.send_inlining import create_version_with_inlined_sends
+from som.interpreter.objectstorage.object_layout import ObjectLayout
+from som.vm.current import current_universe
+from som.vm.symbols import symbol_for
+
+pytestmark = pytest.mark.skipif(  # pylint: disable=invalid-name
+    is_ast_interpreter(), reason="Tests are specific to bytecode interpreter"
+)
+
+
+def _compile(source, fields=None):
+    cgenc = ClassGenerationContext(current_universe)
+    cgenc.name = symbol_for("Test")
+    for field in fields or []:
+        cgenc.add_instance_field(symbol_for(field))
+
+    mgenc = MethodGenerationContext(current_universe, cgenc, None)
+    mgenc.add_argument("self", None, None)
+    parser = Parser(StringStream(source.strip()), "test", current_universe)
+    parser.method(mgenc)
+    return mgenc.assemble(None)
+
+
+def _index_of(method, bytecode):
+    i = 0
+    while i < method.get_number_of_bytecodes():
+        if method.get_bytecode(i) == bytecode:
+            return i
+        i += bytecode_length(method.get_bytecode(i))
+    return -1
+
+
+def _warm_up(caller, send_bytecode, callee, layout):
+    send_idx = _index_of(caller, send_bytecode)
+    assert send_idx >= 0
+    caller.set_inline_cache(send_idx, CachedDispatchNode(layout, callee, None))
+    return send_idx
+
+
+CALLEE = "add: a to: b = ( | t | t := a + b. ^ t )"
+
+
+def test_monomorphic_send_is_inlined():
+    callee = _compile(CALLEE)
+    caller = _compile("run = ( ^ (self add: 1 to: 2) + 1 )")
+    layout = ObjectLayout(0)
+    _warm_up(caller, Bytecodes.send_3, callee, layout)
+
+    version = create_version_with_inlined_sends(caller)
+    assert version is not None
+    assert version.get_size_frame() == (
+        caller.get_size_frame() + callee.get_size_frame() - 1
+    )
+
+    guard_idx = _index_of(version, Bytecodes.q_inlined_send_guard)
+    guard = version.get_inline_cache(guard_idx)
+    assert isinstance(guard, InlinedSendGuard)
+    assert guard.expected_layout is layout
+    assert guard.number_of_arguments == 3
+
+    # the guard jumps to the original send as fallback
+    offset = version.get_bytecode(guard_idx + 1) + (
+        version.get_bytecode(guard_idx + 2) << 8
+    )
+    assert version.get_bytecode(guard_idx + offset) == Bytecodes.send_3
+    assert version.get_constant(guard_idx + offset) is symbol_for("add:to:")
+
+
+def test_inlined_return_self_pushes_the_receiver():
+    callee = _compile("reset = ( 1 + 2 )")
+    caller = _compile("run = ( ^ self reset )")
+    _warm_up(caller, Bytecodes.send_1, callee, ObjectLayout(0))
+
+    version = create_version_with_inlined_sends(caller)
+    assert version is not None
+    assert _index_of(version, Bytecodes.return_self) == -1
+    assert _index_of(version, Bytecodes.return_local) > _index_of(
+        version, Bytecodes.send_1
+    )
+
+
+def test_polymorphic_send_is_not_inlined():
+    callee = _compile(CALLEE)
+    caller = _compile("run = ( ^ (self add: 1 to: 2) + 1 )")
+    send_idx = _index_of(caller, Bytecodes.send_3)
+    first = CachedDispatchNode(ObjectLayout(0), callee, None)
+    caller.set_inline_cache(
+        send_idx, CachedDispatchNode(ObjectLayout(0), callee, first)
+    )
+
+    assert create_version_with_inlined_sends(caller) is None
+
+
+def test_outdated_layout_is_not_inlined():
+    callee = _compile(CALLEE)
+    caller = _compile("run = ( ^ (self add: 1 to: 2) + 1 )")
+    layout = ObjectLayout(0)
+    layout.is_latest = False
+    _warm_up(caller, Bytecodes.send_3, callee, layout)
+
+    assert create_version_with_inlined_sends(caller) is None
+
+
+@pytest.mark.parametrize(
+    "callee_source",
+    [
+        "foo = ( ^ field + 1 )",
+        "foo = ( ^ [ 1 ] value + 1 )",
+        "foo = ( ^ Object new + 1 )",
+        "foo: a = ( a ifTrue: [ ^ 1 ]. ^ 2 )",
+    ],
+)
+def test_methods_depending_on_their_context_are_not_inlined(callee_source):
+    callee = _compile(callee_source, ["field"])
+    num_args = callee.get_number_of_signature_arguments()
+    if num_args == 1:
+        caller = _compile("run = ( ^ self foo + 1 )")
+        send = Bytecodes.send_1
+    else:
+        caller = _compile("run = ( ^ (self foo: true) + 1 )")
+        send = Bytecodes.send_2
+    _warm_up(caller, send, callee, ObjectLayout(0))
+
+    assert create_version_with_inlined_sends(caller) is None
+
+
+def test_jumps_are_relocated():
+    callee = _compile(CALLEE)
+    caller = _compile(
+        "run: c = ( ^ (c ifTrue: [ self add: 1 to: 2 ] ifFalse: [ 3 ]) + 1 )"
+    )
+    _warm_up(caller, Bytecodes.send_3, callee, ObjectLayout(0))
+
+    version = create_version_with_inlined_sends(caller)
+    assert version is not None
+
+    # the jump over the else branch still lands on the push of 3
+    i = 0
+    while i < version.get_number_of_bytecodes():
+        bytecode = version.get_bytecode(i)
+        if bytecode == Bytecodes.jump_on_false_pop:
+            target = i + version.get_bytecode(i + 1)
+            assert version.get_bytecode(target - 3) == Bytecodes.jump
+        i += bytecode_length(bytecode)
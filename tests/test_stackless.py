@@ -0,0 +1,69 @@
+import sys
+
+import pytest
+from rlib.string_stream import StringStream
+
+from som.compiler.bc.method_generation_context import MethodGenerationContext
+from som.compiler.bc.parser import Parser
+from som.compiler.class_generation_context import ClassGenerationContext
+from som.interp_type import is_ast_interpreter
+from som.interpreter.bc import stackless
+from som.vm.current import current_universe
+from som.vm.symbols import symbol_for
+from som.vmobjects.clazz import Class
+from som.vmobjects.object_with_layout import Object
+
+pytestmark = pytest.mark.skipif(  # pylint: disable=invalid-name
+    is_ast_interpreter(), reason="Tests are specific to bytecode interpreter"
+)
+
+
+def _compile(source):
+    cgenc = ClassGenerationContext(current_universe)
+    cgenc.name = symbol_for("Link")
+    cgenc.add_instance_field(symbol_for("next"))
+
+    mgenc = MethodGenerationContext(current_universe, cgenc, None)
+    mgenc.add_argument("self", None, None)
+    parser = Parser(StringStream(source.strip()), "test", current_universe)
+    parser.method(mgenc)
+    return mgenc.assemble(None)
+
+
+def _linked_list(length, source):
+    method = _compile(source)
+    clazz = Class(1)
+    clazz.set_instance_invokables({method.get_signature(): method}, False)
+
+    last = Object(clazz.get_layout_for_instances())
+    first = last
+    for _ in range(length - 1):
+        link = Object(clazz.get_layout_for_instances())
+        link.set_field(0, first)
+        first = link
+    return method, first, last
+
+
+@pytest.fixture(autouse=True)
+def stackless_mode(monkeypatch):
+    monkeypatch.setattr(
+        stackless._config, "enabled", True  # pylint: disable=protected-access
+    )
+
+
+def test_recursion_deeper_than_host_stack():
+    # not a tail call, because the result is stored in a local first
+    method, first, last = _linked_list(
+        sys.getrecursionlimit() * 2,
+        "last = ( | r | next ifNil: [ ^ self ]. r := next last. ^ r )",
+    )
+
+    assert method.invoke_1(first) is last
+
+
+def test_caller_continues_after_the_send():
+    method, first, _ = _linked_list(
+        10, "first = ( | r | next ifNil: [ ^ self ]. r := next first. ^ self )"
+    )
+
+    assert method.invoke_1(first) is first
@@ -0,0 +1,46 @@
+from rlib.objectmodel import compute_hash
+from som.primitives.string_primitives import _index_of, _split, _trim
+from som.vm import strings
+from som.vm.strings import char_for, string_for, MAX_INTERNED_LENGTH
+from som.vmobjects.string import String
+
+
+def test_hash_is_cached():
+    string = String("hello")
+    assert string.get_hash() == compute_hash("hello")
+    assert string.get_hash() == string.get_hash()
+
+
+def test_no_interning_by_default():
+    assert string_for("abc") is not string_for("abc")
+
+
+def test_interning_short_strings(monkeypatch):
+    monkeypatch.setattr(strings, "_string_table", strings._StringTable())
+    strings.enable_string_interning()
+
+    assert string_for("abc") is string_for("abc")
+    assert string_for("abc").get_embedded_string() == "abc"
+
+    long_string = "x" * (MAX_INTERNED_LENGTH + 1)
+    assert string_for(long_string) is not string_for(long_string)
+
+
+def test_single_characters_are_shared():
+    assert string_for("a") is string_for("a")
+    assert char_for("a").get_embedded_string() == "a"
+    assert char_for(chr(255)) is string_for(chr(255))
+
+
+def test_split():
+    parts = _split(String("a,bb,,c"), String(","))
+    assert parts.get_number_of_indexable_fields() == 4
+    assert parts.get_indexable_field(1).get_embedded_string() == "bb"
+    assert parts.get_indexable_field(2).get_embedded_string() == ""
+
+
+def test_index_of_and_trim():
+    assert _index_of(String("hello"), String("ll")).get_embedded_integer() == 3
+    assert _index_of(String("hello"), String("x")).get_embedded_integer() == 0
+    assert _trim(String(" \thi \n")).get_embedded_string() == "hi"
+    assert _trim(String("   ")).get_embedded_string() == ""
@@ -0,0 +1,95 @@
+import pytest
+from rlib.string_stream import StringStream
+
+from som.compiler.bc.method_generation_context import MethodGenerationContext
+from som.compiler.bc.parser import Parser
+from som.compiler.class_generation_context import ClassGenerationContext
+from som.interp_type import is_ast_interpreter
+from som.interpreter.bc import stackless
+from som.interpreter.bc.bytecodes import Bytecodes
+from som.vm.current import current_universe
+from som.vm.globals import trueObject
+from som.vm.symbols import symbol_for
+from som.vmobjects.clazz import Class
+from som.vmobjects.integer import Integer
+from som.vmobjects.object_with_layout import Object
+from som.vmobjects.primitive import BinaryPrimitive, UnaryPrimitive
+
+pytestmark = pytest.mark.skipif(  # pylint: disable=invalid-name
+    is_ast_interpreter(), reason="Tests are specific to bytecode interpreter"
+)
+
+
+def _compile(source):
+    cgenc = ClassGenerationContext(current_universe)
+    cgenc.name = symbol_for("Delegator")
+    cgenc.add_instance_field(symbol_for("delegate"))
+
+    mgenc = MethodGenerationContext(current_universe, cgenc, None)
+    mgenc.add_argument("self", None, None)
+    parser = Parser(StringStream(source.strip()), "test", current_universe)
+    parser.method(mgenc)
+    return mgenc.assemble(None)
+
+
+def _object_with(invokable, field=None):
+    clazz = Class(1)
+    clazz.set_instance_invokables({invokable.get_signature(): invokable}, False)
+    obj = Object(clazz.get_layout_for_instances())
+    if field is not None:
+        obj.set_field(0, field)
+    return obj
+
+
+@pytest.fixture(params=[False, True], ids=["stack", "stackless"])
+def stackless_mode(request, monkeypatch):
+    monkeypatch.setattr(
+        stackless._config, "enabled", request.param  # pylint: disable=protected-access
+    )
+
+
+def _answer(_rcvr):
+    return Integer(42)
+
+
+def _equals(_rcvr, _arg):
+    return trueObject
+
+
+@pytest.mark.usefixtures("stackless_mode")
+def test_tail_send_to_unary_primitive():
+    method = _compile("answer = ( ^ delegate answer )")
+    assert Bytecodes.tail_send in method.get_bytecodes()
+
+    delegate = _object_with(UnaryPrimitive("answer", _answer))
+    delegator = _object_with(method, delegate)
+
+    assert method.invoke_1(delegator).get_embedded_integer() == 42
+
+
+@pytest.mark.usefixtures("stackless_mode")
+def test_tail_send_to_binary_primitive():
+    method = _compile("= other = ( ^ delegate = other )")
+    assert Bytecodes.tail_send in method.get_bytecodes()
+
+    delegate = _object_with(BinaryPrimitive("=", _equals))
+    delegator = _object_with(method, delegate)
+
+    assert method.invoke_2(delegator, Integer(1)) is trueObject
+
+
+def _is_elidable(func):
+    # RPython's elidable_promote() wraps the elidable function in one that
+    # promotes the arguments, and names it after the function
+    return getattr(func, "_elidable_function_", False) or func.__name__.endswith(
+        "_promote"
+    )
+
+
+def test_inline_cache_lookup_is_elidable():
+    from som.interpreter.bc import interpreter
+
+    assert _is_elidable(interpreter._lookup)  # pylint: disable=protected-access
+    assert not _is_elidable(
+        interpreter._dispatch_tail_send  # pylint: disable=protected-access
+    )